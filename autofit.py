@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Auto-Fit
+Picks the largest body font size at which the whole text fits the
+template's body box, so short texts fill the frame and long ones shrink
+instead of being cut off.
+
+The search is a bisection over sizes against one shared measurement table:
+glyph advances are measured once at a large reference size and scaled, so
+each probe is a line count with no font calls. The estimate is then checked
+with a real layout at the chosen size (and its neighbour), which also leaves
+that size's wrapped paragraphs in the layout cache for the render.
+
+Usage:
+    from autofit import fit_template
+    fit = fit_template(text, "standard")
+    img = create_image(text, style, fit.template)   # e.g. "standard@48"
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from fonts import get_font
+from layout import advance_table, ink_height, layout_text, measure_calls, wrap_paragraph
+from templates import get_plan, sized_template, FRAME_WIDTH, FRAME_HEIGHT, DEFAULT_TEMPLATE
+
+MIN_FIT_SIZE = 14
+MAX_FIT_SIZE = 120
+REFERENCE_SIZE = 256
+
+FitResult = namedtuple("FitResult", "template size fits probes measure_calls")
+
+
+class _Estimator:
+    """Line counts at any size from advances measured once at REFERENCE_SIZE"""
+
+    def __init__(self, text, plan, width, height):
+        self.paragraphs = [p if p.strip() else "" for p in text.split("\n")]
+        self.plan = plan
+        self.box = plan.body_box(width, height)
+        font = get_font(plan.face, REFERENCE_SIZE)
+        self.table = advance_table(font)
+        self.ink = ink_height(font)
+
+    def fits(self, size):
+        left, top, right, bottom = self.box
+        scale = REFERENCE_SIZE / size
+        line_height = round(size * self.plan.line_spacing)
+        ink = self.ink / scale
+        # Lines that fit: top + (n - 1) * line_height + ink <= bottom
+        capacity = int((bottom - top - ink) // line_height) + 1
+        max_width = (right - left) * scale
+        count = 0
+        for paragraph in self.paragraphs:
+            count += len(wrap_paragraph(paragraph, max_width, self.table)) if paragraph else 1
+            if count > capacity:
+                return False
+        return True
+
+
+def _fits_exactly(text, template, width, height):
+    plan = get_plan(template)
+    layout = layout_text(text, plan.body_font, plan.body_box(width, height), plan.line_height)
+    return not layout.truncated
+
+
+def _search(text, template, width, height, min_size, max_size):
+    """Return (size, fits, probes) for the largest size that fits"""
+    estimator = _Estimator(text, get_plan(template), width, height)
+    probes = 0
+    low, high = min_size, max_size
+    # Invariant: every size below low fits (by the estimate), high + 1 does not
+    while low <= high:
+        mid = (low + high) // 2
+        probes += 1
+        if estimator.fits(mid):
+            low = mid + 1
+        else:
+            high = mid - 1
+    size = max(high, min_size)
+
+    # Hinting makes real advances differ slightly from scaled ones, so settle
+    # the last pixel or two with real layouts
+    probes += 1
+    if _fits_exactly(text, sized_template(template, size), width, height):
+        while size < max_size:
+            probes += 1
+            if not _fits_exactly(text, sized_template(template, size + 1), width, height):
+                break
+            size += 1
+        return size, True, probes
+    while size > min_size:
+        size -= 1
+        probes += 1
+        if _fits_exactly(text, sized_template(template, size), width, height):
+            return size, True, probes
+    return min_size, False, probes
+
+
+class FitCache:
+    """LRU of fitted sizes keyed by (text, template, frame size, size range)"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._fits = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.probes = 0
+        self.measure_calls = 0
+
+    def get(self, text, template, width, height, min_size, max_size):
+        key = (text, get_plan(template).base, width, height, min_size, max_size)
+        with self._lock:
+            fit = self._fits.get(key)
+            if fit is not None:
+                self._fits.move_to_end(key)
+                self.hits += 1
+                return fit._replace(probes=0, measure_calls=0)
+            self.misses += 1
+
+        before = measure_calls()
+        size, fits, probes = _search(text, key[1], width, height, min_size, max_size)
+        fit = FitResult(sized_template(key[1], size), size, fits, probes, measure_calls() - before)
+
+        with self._lock:
+            self.probes += probes
+            self.measure_calls += fit.measure_calls
+            self._fits[key] = fit
+            while len(self._fits) > self.maxsize:
+                self._fits.popitem(last=False)
+        return fit
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": len(self._fits),
+                "probes": self.probes,
+                "measure_calls": self.measure_calls,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._fits.clear()
+            self.hits = 0
+            self.misses = 0
+            self.probes = 0
+            self.measure_calls = 0
+
+
+fit_cache = FitCache()
+
+
+def fit_template(text, template=DEFAULT_TEMPLATE, width=FRAME_WIDTH, height=FRAME_HEIGHT,
+                 min_size=MIN_FIT_SIZE, max_size=MAX_FIT_SIZE):
+    """Return a FitResult whose template renders text at the largest size that fits
+
+    fits is False when the text overflows even at min_size; it is then
+    rendered at min_size and flows onto further pages as usual. probes is
+    the number of layout passes and measure_calls the number of font
+    measurements the fit needed (both 0 when it came from the cache).
+    """
+    return fit_cache.get(text, template, width, height, min_size, max_size)
+
+
+def fit_stats():
+    return fit_cache.stats()
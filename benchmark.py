@@ -0,0 +1,802 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Benchmarks
+Times the rendering pipeline against the code paths it replaced.
+
+Usage: python3 benchmark.py [name ...]
+Example: python3 benchmark.py atlas
+"""
+
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from PIL import Image, ImageDraw
+
+from fonts import get_font, DEFAULT_FACE
+from glyph_atlas import atlas_for, draw_text
+from chrome import STYLE_NAMES
+from frame_mask import (
+    build_mask, colorize, mask_cache, mask_from_layout, render_styles, render_pages, body_box, layout_body
+)
+import layout
+from layout import AdvanceTable, advance_table, layout_text, wrap_paragraph, wrap_text, paragraph_cache, measure_calls
+from convert import get_colors, create_image, read_file
+from encoders import encode, encode_pages, compare_presets, PRESETS
+from canvas_pool import memory_usage, pool_stats, tune_allocator
+from vector_pdf import write_pdf
+from strip_render import render_scroll, write_scroll
+from variants import parse_sizes, render_variants
+from templates import get_plan, sized_template
+from autofit import fit_template, fit_cache, MIN_FIT_SIZE, MAX_FIT_SIZE
+from html_frame import HEAD_TEMPLATE, TAIL, head_cache, iter_html
+from preview import encode_preview, PREVIEW_WIDTH
+from text_budget import page_budget
+from pdf_extract import extract_pdf_text, iter_pdf_pages
+from docx_extract import extract_docx_text
+from html_extract import extract_html_text, TextCollector, _StdlibParser, etree
+from extract_cache import ExtractCache, extract_cache, content_hash
+
+# The reader benchmarks time extraction; repeats must not be served from disk
+extract_cache.limit = 0
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or "
+    "his from at which but have an they you were her she there been one all "
+    "document frame render style modern classic layout paragraph extraction "
+    "performance 2024 report summary quarterly results, analysis; (draft)"
+).split()
+
+
+def sample_text(chars=2000, seed=1):
+    """Return deterministic prose of roughly `chars` characters"""
+    rng = random.Random(seed)
+    paragraphs = []
+    total = 0
+    while total < chars:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(20, 60))]
+        paragraph = " ".join(words).capitalize() + "."
+        paragraphs.append(paragraph)
+        total += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:chars]
+
+
+def timeit(func, repeat=20):
+    """Return the median time per call in milliseconds"""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def report(rows):
+    width = max(len(name) for name, _ in rows)
+    baseline = rows[0][1]
+    for name, ms in rows:
+        speedup = baseline / ms if ms else float("inf")
+        print(f"  {name.ljust(width)}  {ms:9.2f} ms   x{speedup:.2f}")
+
+
+def bench_atlas():
+    """Glyph atlas blitting vs ImageDraw.text on a 2000-character body"""
+    font = get_font(DEFAULT_FACE, 32)
+    lines = []
+    for line in sample_text(2000).split('\n'):
+        lines.extend(textwrap.wrap(line, width=40) if line.strip() else [''])
+
+    img = Image.new('RGB', (1200, 45 * len(lines) + 300), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+
+    def with_draw_text():
+        y = 240
+        for line in lines:
+            draw.text((80, y), line, fill=(0, 0, 0), font=font)
+            y += 45
+
+    def with_atlas():
+        y = 240
+        for line in lines:
+            draw_text(draw, (80, y), line, fill=(0, 0, 0), font=font)
+            y += 45
+
+    print(f"\n🔠 Glyph atlas ({len(lines)} lines, {sum(map(len, lines))} glyphs)")
+    report([
+        ("ImageDraw.text", timeit(with_draw_text)),
+        ("glyph atlas", timeit(with_atlas)),
+    ])
+    stats = atlas_for(font).stats() if atlas_for(font) else {}
+    print(f"  atlas: {stats}")
+
+
+def bench_styles():
+    """All four styles: layout per style vs one mask recolored four times"""
+    text = sample_text(2000)
+
+    # Both variants keep all four images alive, as a multi-style export would
+    def layout_per_style():
+        return [colorize(build_mask(text), style, get_colors(style)) for style in STYLE_NAMES]
+
+    def mask_once():
+        mask_cache.clear()
+        return render_styles(text, STYLE_NAMES, get_colors)
+
+    print(f"\n🎨 Render all {len(STYLE_NAMES)} styles (2000 chars)")
+    report([
+        ("layout per style", timeit(layout_per_style, repeat=5)),
+        ("mask once, recolor", timeit(mask_once, repeat=5)),
+    ])
+
+
+def bench_layout():
+    """Pixel-width layout with memoized advances vs textwrap and getlength"""
+    text = sample_text(2000)
+    font = get_font(DEFAULT_FACE, 32)
+    box = body_box()
+    max_width = box[2] - box[0]
+
+    def with_textwrap():
+        lines = []
+        for line in text.split('\n'):
+            lines.extend(textwrap.wrap(line, width=40) if line.strip() else [''])
+        return lines
+
+    def with_getlength():
+        # Pixel-accurate, but measures every candidate line with FreeType
+        lines = []
+        for paragraph in text.split('\n'):
+            current = ""
+            for word in paragraph.split():
+                candidate = f"{current} {word}" if current else word
+                if current and font.getlength(candidate) > max_width:
+                    lines.append(current)
+                    current = word
+                else:
+                    current = candidate
+            lines.append(current)
+        return lines
+
+    def with_cold_table():
+        table = AdvanceTable(font)
+        return [wrap_paragraph(p, max_width, table) for p in text.split('\n')]
+
+    def with_layout():
+        return layout_text(text, font, box)
+
+    result = with_layout()
+    print(f"\n📐 Line layout (2000 chars, {len(result.lines)} lines placed)")
+    report([
+        ("textwrap (chars)", timeit(with_textwrap, repeat=50)),
+        ("getlength per line", timeit(with_getlength, repeat=50)),
+        ("advance table, cold", timeit(with_cold_table, repeat=50)),
+        ("advance table, warm", timeit(with_layout, repeat=50)),
+    ])
+
+
+def bench_paragraphs():
+    """Re-layout after editing one paragraph: full re-wrap vs paragraph cache"""
+    text = sample_text(20000)
+    font = get_font(DEFAULT_FACE, 32)
+    box = body_box()
+    max_width = box[2] - box[0]
+    paragraphs = text.split('\n\n')
+    edits = iter(range(10 ** 9))
+
+    def edited():
+        # Change the last paragraph, as if the user kept typing
+        return '\n\n'.join(paragraphs[:-1] + [paragraphs[-1] + f" edit{next(edits)}"])
+
+    def full_rewrap():
+        table = advance_table(font)
+        return [wrap_paragraph(p, max_width, table) for p in edited().split('\n')]
+
+    def cached():
+        return wrap_text(edited(), font, max_width)
+
+    paragraph_cache.clear()
+    print(f"\n🧩 Paragraph cache (20000 chars, {len(paragraphs)} paragraphs, 1 edited)")
+    report([
+        ("re-wrap everything", timeit(full_rewrap)),
+        ("paragraph cache", timeit(cached)),
+    ])
+    print(f"  cache: {paragraph_cache.stats()}")
+
+
+def bench_encode():
+    """Output size and encode time per preset vs the old default saves"""
+    img = create_image(sample_text(2000), "modern")
+
+    def default_save(fmt, **params):
+        def run():
+            buffer = io.BytesIO()
+            img.save(buffer, fmt, **params)
+            return buffer.tell()
+        return run
+
+    rows = [
+        ("png", "old default", default_save("PNG")),
+        ("jpeg", "old quality=95", default_save("JPEG", quality=95)),
+    ]
+    for fmt in ("png", "jpeg"):
+        for preset in PRESETS:
+            rows.append((fmt, preset, lambda fmt=fmt, preset=preset: encode(img, fmt, preset).size))
+
+    print("\n📦 Encoder presets (1200x1600 modern frame)")
+    for fmt, name, run in sorted(rows, key=lambda row: row[0]):
+        ms = timeit(run, repeat=5)
+        print(f"  {fmt:5s} {name:15s} {run() / 1024:9.1f} KB  {ms:8.1f} ms")
+
+
+def bench_formats():
+    """PNG / JPEG / WebP / AVIF size and encode latency for typical frames"""
+    for style, chars in (("modern", 2000), ("minimalist", 400)):
+        img = create_image(sample_text(chars), style)
+        print(f"\n🖼️  Output formats ({style}, {chars} chars)")
+        for result in compare_presets(img):
+            print(f"  {result.format:8s} {result.preset:9s} {result.size / 1024:9.1f} KB  {result.seconds * 1000:8.1f} ms")
+
+
+def _generate_load(threads=8, requests=12):
+    """POST to /generate from several threads; prints a JSON summary"""
+    from webapp import app
+
+    if os.environ.get("INFOFRAME_MMAP_THRESHOLD") != "0":
+        tune_allocator()
+    texts = [sample_text(2000, seed) for seed in range(threads * requests)]
+    client = app.test_client()
+    start_rss = memory_usage()["rss_bytes"]
+
+    def worker(offset):
+        for i in range(requests):
+            text = texts[offset * requests + i]
+            client.post('/generate', data={'text': text, 'style': 'modern', 'preset': 'fastest'})
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    print(json.dumps(dict(memory_usage(), start_rss_bytes=start_rss, seconds=seconds,
+                          requests=threads * requests, pool=pool_stats())))
+
+
+def bench_pool():
+    """RSS and throughput under concurrent /generate, with and without the canvas pool"""
+    print("\n🧱 Canvas pool (8 threads x 12 /generate requests, fresh process each)")
+    configs = (
+        ("fresh Image.new", "0", "0"),
+        ("canvas pool", "1", "0"),
+        ("pool + mmap", "1", ""),
+    )
+    for label, enabled, threshold in configs:
+        env = dict(os.environ, INFOFRAME_POOL=enabled, INFOFRAME_MMAP_THRESHOLD=threshold)
+        output = subprocess.run(
+            [sys.executable, "-c", "import benchmark; benchmark._generate_load()"],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        mb = 1024 * 1024
+        print(f"  {label:16s} steady {result['rss_bytes'] / mb:7.1f} MB  "
+              f"peak {result['peak_rss_bytes'] / mb:7.1f} MB  "
+              f"{result['requests'] / result['seconds']:6.1f} req/s  "
+              f"(reused {result['pool']['reused']}, allocated {result['pool']['allocated']})")
+
+
+def _pages_load(mode, chars=60000):
+    """Write a long document to PDF lazily or all at once; prints JSON"""
+    text = sample_text(chars)
+    colors = get_colors("modern")
+    start = time.perf_counter()
+    if mode == "lazy":
+        result = encode_pages(render_pages(text, "modern", colors), "pdf", "balanced")
+        pages, size = result.pages, result.size
+    else:
+        images = [page.copy() for page in render_pages(text, "modern", colors)]
+        buffer = io.BytesIO()
+        images[0].save(buffer, "PDF", save_all=True, append_images=images[1:], resolution=100.0)
+        pages, size = len(images), buffer.tell()
+    seconds = time.perf_counter() - start
+    print(json.dumps(dict(memory_usage(), pages=pages, size=size, seconds=seconds)))
+
+
+def bench_pages():
+    """Peak RSS writing a long multi-page PDF lazily vs materializing every page"""
+    print("\n📑 Multi-page PDF (60,000 chars, fresh process each)")
+    for label, mode in (("all pages in memory", "eager"), ("lazy page stream", "lazy")):
+        output = subprocess.run(
+            [sys.executable, "-c", f"import benchmark; benchmark._pages_load({mode!r})"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {label:20s} {result['pages']:3d} pages  peak {result['peak_rss_bytes'] / 1024 / 1024:7.1f} MB  "
+              f"{result['seconds'] * 1000:8.1f} ms  {result['size'] / 1024:8.1f} KB")
+
+
+def _scroll_load(mode, chars=400000):
+    """Encode one tall scroll PNG from strips or from a full canvas; prints JSON"""
+    text = sample_text(chars)
+    colors = get_colors("modern")
+    start = time.perf_counter()
+    if mode == "strips":
+        result = write_scroll(text, "modern", colors, io.BytesIO(), "png", "fastest")
+        size = result.size
+        height = None
+    else:
+        img = render_scroll(text, "modern", colors)
+        buffer = io.BytesIO()
+        img.save(buffer, "PNG", compress_level=1)
+        size, height = buffer.tell(), img.height
+    seconds = time.perf_counter() - start
+    print(json.dumps(dict(memory_usage(), size=size, seconds=seconds, height=height)))
+
+
+def bench_scroll():
+    """Peak RSS of a ~400,000-row scroll PNG: streamed strips vs one canvas"""
+    print("\n📜 Scroll PNG (400,000 chars, fastest preset, fresh process each)")
+    for label, mode in (("full canvas", "canvas"), ("streamed strips", "strips")):
+        output = subprocess.run(
+            [sys.executable, "-c", f"import benchmark; benchmark._scroll_load({mode!r})"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {label:16s} peak {result['peak_rss_bytes'] / 1024 / 1024:8.1f} MB  "
+              f"{result['seconds'] * 1000:9.1f} ms  {result['size'] / 1024:9.1f} KB")
+
+
+def bench_pdf():
+    """Vector-text PDF vs JPEG page images, size and write time"""
+    colors = get_colors("modern")
+    for chars in (2000, 60000):
+        text = sample_text(chars)
+        rows = (
+            ("raster (JPEG pages)", lambda: encode_pages(render_pages(text, "modern", colors), "pdf")),
+            ("vector text", lambda: write_pdf(text, "modern", colors)),
+        )
+        print(f"\n📄 PDF output ({chars} chars)")
+        for label, run in rows:
+            ms = timeit(run, repeat=3)
+            result = run()
+            print(f"  {label:20s} {result.pages:3d} pages  {result.size / 1024:9.1f} KB  {ms:8.1f} ms")
+
+
+def bench_variants():
+    """1x / 2x / thumb set: native rendering from one layout vs resizing a 2x render"""
+    text = sample_text(2000)
+    colors = get_colors("modern")
+    sizes = parse_sizes("1x,2x,thumb")
+
+    def resized():
+        mask_cache.clear()
+        plan = get_plan()
+        img = colorize(mask_from_layout(layout_body(text), plan.body_font_at(2.0), 1200, 1600, 2.0),
+                       "modern", colors)
+        return [img.resize((round(1200 * scale), round(1600 * scale)), Image.LANCZOS) for _, scale in sizes]
+
+    def one_layout():
+        return [img.size for _, img in render_variants(text, "modern", colors, sizes)]
+
+    print("\n📐 Resolution set 1x, 2x, thumb (2000 chars)")
+    report([
+        ("render 2x + LANCZOS", timeit(resized, repeat=5)),
+        ("one layout, native", timeit(one_layout, repeat=5)),
+    ])
+
+
+def bench_export():
+    """PNG + JPEG + PDF: three convert.py runs vs one --formats run"""
+    base = Path(__file__).parent
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "bench_export.txt"
+        source.write_text(sample_text(6000))
+
+        def convert(*args):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(base / "convert.py"), str(source), *args],
+                           capture_output=True, check=True)
+            return (time.perf_counter() - start) * 1000
+
+        print("\n📦 PNG + JPEG + PDF export (6000 chars, 2 pages)")
+        try:
+            separate = statistics.median(sum(convert(fmt) for fmt in ("png", "jpg", "pdf")) for _ in range(3))
+            combined = statistics.median(convert("--formats", "png,jpg,pdf") for _ in range(3))
+        finally:
+            for output in base.glob("bench_export_*"):
+                output.unlink()
+        report([("three runs", separate), ("one --formats run", combined)])
+
+
+def bench_fanout():
+    """Every style of one PDF upload: four /generate calls vs one style=all call"""
+    from webapp import app
+
+    client = app.test_client()
+    document = write_pdf(sample_text(6000), "modern", get_colors("modern")).data
+
+    def post(style, **fields):
+        response = client.post('/generate', data=dict(
+            fields, style=style, preset='fastest', file=(io.BytesIO(document), 'report.pdf')))
+        assert response.status_code == 200, response.data
+        return response.data
+
+    def separate():
+        mask_cache.clear()
+        return [post(style) for style in STYLE_NAMES]
+
+    def fanout():
+        mask_cache.clear()
+        return post('all')
+
+    def sheet():
+        mask_cache.clear()
+        return post('all', sheet='1')
+
+    print("\n🗂️  All four styles of a 2-page PDF upload via /generate")
+    report([
+        ("four requests", timeit(separate, repeat=5)),
+        ("style=all zip", timeit(fanout, repeat=5)),
+        ("style=all sheet", timeit(sheet, repeat=5)),
+    ])
+
+
+def bench_html():
+    """HTML output on megabyte inputs: per-call head + string += vs cached head + chunk stream"""
+    colors = get_colors("modern")
+
+    def concatenated(text):
+        # The replaced create_html: head formatted per call, body built with +=
+        head = HEAD_TEMPLATE.substitute(title="Modern", bg="#1a1a2e", accent="#e94560",
+                                        text="#eeeeee", secondary="#4ecca3")
+        content_html = ""
+        for line in text.split("\n"):
+            if line.strip():
+                content_html += f"<p>{line}</p>\n"
+            else:
+                content_html += "<br>\n"
+        return len(head + content_html + TAIL)
+
+    def streamed(text):
+        return sum(len(chunk) for chunk in iter_html(text, "modern", colors))
+
+    for megabytes in (1, 8):
+        prose = sample_text(megabytes * 1_000_000)
+        # Extracted PDF text is mostly short lines
+        short_lines = "\n".join(prose[i:i + 80] for i in range(0, len(prose), 80))
+        for label, text in (("paragraphs", prose), ("80-char lines", short_lines)):
+            head_cache.clear()
+            print(f"\n🌐 HTML output ({megabytes} MB of text, {label})")
+            report([
+                ("head per call, +=", timeit(lambda: concatenated(text), repeat=3)),
+                ("cached head, streamed", timeit(lambda: streamed(text), repeat=3)),
+            ])
+            for name, run in (("head per call, +=", concatenated), ("cached head, streamed", streamed)):
+                tracemalloc.start()
+                run(text)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"  {name:22s} peak {peak / 1024 / 1024:7.1f} MB allocated")
+
+
+def bench_fit():
+    """Auto-fit: render every size from the top down vs bisection on a shared measurement table"""
+    colors = get_colors("modern")
+
+    def cold():
+        # Every run starts with no measured glyphs and no wrapped paragraphs
+        layout._tables.clear()
+        paragraph_cache.clear()
+        mask_cache.clear()
+        fit_cache.clear()
+
+    def render_down(text):
+        for size in range(MAX_FIT_SIZE, MIN_FIT_SIZE - 1, -1):
+            template = sized_template("standard", size)
+            body = layout_body(text, template=template)
+            img = colorize(mask_from_layout(body, get_plan(template).body_font, template=template), "modern", colors)
+            img.close()
+            if not body.truncated:
+                break
+        return size
+
+    def bisect_layouts(text):
+        # Bisection where every probe is a real layout at that size
+        low, high = MIN_FIT_SIZE, MAX_FIT_SIZE
+        while low <= high:
+            mid = (low + high) // 2
+            if layout_body(text, template=sized_template("standard", mid)).truncated:
+                high = mid - 1
+            else:
+                low = mid + 1
+        return max(high, MIN_FIT_SIZE)
+
+    def fit(text):
+        return fit_template(text).size
+
+    runs = (("render each size", render_down), ("bisect, layout per probe", bisect_layouts),
+            ("bisect, shared table", fit))
+    for chars in (300, 2000, 5000):
+        text = sample_text(chars)
+        print(f"\n🔤 Auto-fit ({chars} chars, sizes {MIN_FIT_SIZE}-{MAX_FIT_SIZE}px)")
+        report([(name, timeit(lambda: (cold(), run(text)), repeat=3)) for name, run in runs])
+        for name, run in runs:
+            cold()
+            before = measure_calls()
+            size = run(text)
+            print(f"  {name:26s} {size:4d}px  {measure_calls() - before:6d} measure calls")
+
+
+def bench_preview():
+    """Preview latency: full render + LANCZOS thumbnail vs native preview-size drafts"""
+    colors = get_colors("modern")
+
+    def thumbnail(text):
+        # The old desktop path; the web UIs encoded the full frame instead
+        mask_cache.clear()
+        img = create_image(text, "modern")
+        small = img.copy()
+        small.thumbnail((PREVIEW_WIDTH, 533), Image.LANCZOS)
+        return encode(small, "png", "fastest").size
+
+    def full_frame(text):
+        mask_cache.clear()
+        return encode(create_image(text, "modern"), "png").size
+
+    for chars in (500, 2000):
+        text = sample_text(chars)
+        print(f"\n👁️  Preview at {PREVIEW_WIDTH}px ({chars} chars, PNG)")
+        report([
+            ("full frame, encoded", timeit(lambda: full_frame(text), repeat=10)),
+            ("full frame + thumbnail", timeit(lambda: thumbnail(text), repeat=10)),
+            ("native preview", timeit(lambda: encode_preview(text, "modern", colors), repeat=10)),
+            ("native draft (1-bit)", timeit(lambda: encode_preview(text, "modern", colors, draft=True), repeat=10)),
+        ])
+
+
+def _sample_documents(directory, pages=300):
+    """Write a ~pages-page PDF and TXT/HTML/DOCX files with the same text"""
+    text = sample_text(pages * 1230)
+    paths = {}
+    paths["pdf"] = Path(directory) / "sample.pdf"
+    write_pdf(text, "modern", get_colors("modern"), paths["pdf"])
+    paths["txt"] = Path(directory) / "sample.txt"
+    paths["txt"].write_text(text * 20)
+    paths["html"] = Path(directory) / "sample.html"
+    body = "".join(f"<p>{paragraph}</p>\n" for paragraph in text.split("\n") if paragraph)
+    paths["html"].write_text(f"<html><head><title>Sample</title></head><body>{body}</body></html>")
+    try:
+        import docx
+    except ImportError:
+        return paths
+    document = docx.Document()
+    for paragraph in text.split("\n"):
+        if paragraph:
+            document.add_paragraph(paragraph)
+    paths["docx"] = Path(directory) / "sample.docx"
+    document.save(paths["docx"])
+    return paths
+
+
+def bench_readers():
+    """Reading large inputs: whole document vs stopping at a one-page budget"""
+    budget = page_budget(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _sample_documents(tmp)
+        for kind, path in paths.items():
+            size = path.stat().st_size / 1024 / 1024
+            repeat = 1 if kind in ("pdf", "docx") else 3
+            print(f"\n📚 Reading {kind.upper()} ({size:.1f} MB), one page of output ({budget:,} chars)")
+            report([
+                ("whole document", timeit(lambda: read_file(path), repeat=repeat)),
+                ("page budget", timeit(lambda: read_file(path, budget), repeat=repeat)),
+            ])
+
+
+def bench_pdfpool():
+    """Full-text extraction of a 300-page PDF on 1, 2, 4 and 8 worker processes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sample.pdf"
+        write_pdf(sample_text(300 * 1230), "modern", get_colors("modern"), path)
+
+        def first_page(workers):
+            start = time.perf_counter()
+            next(iter(iter_pdf_pages(path, workers)))
+            return (time.perf_counter() - start) * 1000
+
+        print(f"\n🧵 PDF extraction, 300 pages ({os.cpu_count()} CPUs)")
+        report([(f"{workers} worker{'s' if workers > 1 else ''}",
+                 timeit(lambda: extract_pdf_text(path, workers=workers), repeat=1))
+                for workers in (1, 2, 4, 8)])
+        for workers in (1, 4):
+            print(f"  streamed, {workers} worker(s): first page after {first_page(workers):.0f} ms")
+
+
+def _python_docx_text(path):
+    import docx
+    return "\n".join(p.text for p in docx.Document(path).paragraphs if p.text.strip())
+
+
+def bench_docx():
+    """DOCX reading: python-docx object model vs streaming word/document.xml"""
+    try:
+        import docx
+    except ImportError:
+        print("\n⚠️  python-docx not installed, skipping")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        document = docx.Document()
+        for index, paragraph in enumerate(sample_text(300 * 1230).split("\n")):
+            if index % 40 == 0:
+                document.add_heading(f"Section {index // 40 + 1}", 1)
+            if paragraph:
+                document.add_paragraph(paragraph)
+        for _ in range(8):
+            image = io.BytesIO()
+            Image.effect_noise((1000, 1000), 64).convert("RGB").save(image, "PNG")
+            image.seek(0)
+            document.add_picture(image)
+        path = Path(tmp) / "sample.docx"
+        document.save(path)
+        size = path.stat().st_size / 1024 / 1024
+
+        print("\n📝 DOCX import time (fresh process)")
+        for name, module in (("python-docx", "docx"), ("docx_extract", "docx_extract")):
+            seconds = float(subprocess.run(
+                [sys.executable, "-c",
+                 f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"],
+                cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+            ).stdout)
+            print(f"  {name:14s} {seconds * 1000:8.1f} ms")
+
+        print(f"\n📝 DOCX parse, 300 pages + 8 images ({size:.1f} MB)")
+        readers = (("python-docx", lambda: _python_docx_text(path)),
+                   ("streaming", lambda: extract_docx_text(path)),
+                   ("streaming, page budget", lambda: extract_docx_text(path, page_budget(1))))
+        report([(name, timeit(run, repeat=3)) for name, run in readers])
+        for name, run in readers:
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {name:24s} peak {peak / 1024 / 1024:7.1f} MB allocated")
+
+
+def _exported_page(megabytes):
+    """An exported-page-like HTML document: markup, scripts and styles around prose"""
+    paragraphs = sample_text(4000).split("\n")
+    sections = []
+    for index in range(megabytes * 1024 * 1024 // 6000):
+        body = "".join(f'<p class="body">{p} <a href="#s{index}">link</a> <span>{p[:40]}</span></p>\n'
+                       for p in paragraphs if p)
+        sections.append(f'<div class="section" id="s{index}"><nav><ul><li><a href="/">Home</a></li>'
+                        f'<li><a href="/docs">Docs</a></li></ul></nav>\n'
+                        f'<style>.section-{index} {{ margin: 0 auto; color: #333; }}</style>\n'
+                        f'<h2>Section {index}</h2>\n{body}'
+                        f'<script>window.track && window.track("view", {index}, "<p>not text</p>");</script></div>\n')
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>Exported Page</title></head><body>'
+            + "".join(sections) + "</body></html>")
+
+
+def _whole_string_html(path):
+    """The old reader: whole file decoded at once into HTMLParser"""
+    collector = TextCollector()
+    parser = _StdlibParser(collector)
+    parser.feed(Path(path).read_bytes().decode("utf-8"))
+    parser.close()
+    collector.close()
+    return collector.text()
+
+
+def bench_htmlread():
+    """HTML text extraction on multi-megabyte pages: whole-string HTMLParser vs chunked, vs lxml"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in (2, 8):
+            path = Path(tmp) / "page.html"
+            path.write_text(_exported_page(megabytes), encoding="utf-8")
+            size = path.stat().st_size / 1024 / 1024
+            readers = [("whole string, HTMLParser", lambda: _whole_string_html(path)),
+                       ("chunked, HTMLParser", lambda: extract_html_text(path, backend="html.parser"))]
+            if etree is not None:
+                readers.append(("chunked, lxml", lambda: extract_html_text(path, backend="lxml")))
+            readers.append(("chunked, page budget", lambda: extract_html_text(path, page_budget(1))))
+            print(f"\n🧾 HTML extraction ({size:.1f} MB page)")
+            rows = [(name, timeit(run, repeat=3)) for name, run in readers]
+            report(rows)
+            for (name, run), (_, ms) in zip(readers, rows):
+                tracemalloc.start()
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"  {name:26s} {size / ms * 1000:6.1f} MB/s  peak {peak / 1024 / 1024:7.1f} MB allocated")
+
+
+def bench_extractcache():
+    """Re-reading the same documents: full extraction vs the SQLite extraction cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _sample_documents(tmp)
+        cache = ExtractCache(Path(tmp) / "extract_cache.sqlite", limit=256 * 1024 * 1024)
+        budget = page_budget(1)
+        extractors = {
+            "pdf": ("pdf", lambda path, chars: extract_pdf_text(path, chars)),
+            "docx": ("docx", lambda path, chars: extract_docx_text(path, chars)),
+            "html": ("html", lambda path, chars: extract_html_text(path, chars)),
+        }
+        for kind, (version, extract) in extractors.items():
+            path = paths.get(kind)
+            if path is None:
+                continue
+            size = path.stat().st_size / 1024 / 1024
+            for label, chars in (("whole document", None), ("page budget", budget)):
+                def cached():
+                    return cache.text(path, version, lambda: extract(path, chars), chars)
+
+                print(f"\n🗃️  {kind.upper()} ({size:.1f} MB), {label}")
+                uncached = timeit(lambda: extract(path, chars), repeat=1)
+                cache.clear()
+                start = time.perf_counter()
+                cached()
+                cold = (time.perf_counter() - start) * 1000
+                report([
+                    ("extract", uncached),
+                    ("cache miss + store", cold),
+                    ("cache hit", timeit(cached, repeat=5)),
+                    ("content hash alone", timeit(lambda: content_hash(path), repeat=5)),
+                ])
+                stats = cache.stats()
+                print(f"  {stats['hits']} hits, {stats['misses']} miss, {stats['bytes'] / 1024:.0f} KB stored")
+
+
+BENCHMARKS = {
+    "atlas": bench_atlas,
+    "styles": bench_styles,
+    "layout": bench_layout,
+    "paragraphs": bench_paragraphs,
+    "encode": bench_encode,
+    "formats": bench_formats,
+    "pool": bench_pool,
+    "pages": bench_pages,
+    "pdf": bench_pdf,
+    "scroll": bench_scroll,
+    "variants": bench_variants,
+    "export": bench_export,
+    "fanout": bench_fanout,
+    "html": bench_html,
+    "fit": bench_fit,
+    "preview": bench_preview,
+    "readers": bench_readers,
+    "pdfpool": bench_pdfpool,
+    "docx": bench_docx,
+    "htmlread": bench_htmlread,
+    "extractcache": bench_extractcache,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmark: {', '.join(unknown)}")
+        print(f"   Available: {', '.join(BENCHMARKS)}\n")
+        return
+
+    print("\n⏱️  INFO-FRAME BENCHMARKS")
+    print("=" * 50)
+    for name in names:
+        BENCHMARKS[name]()
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Info-Frame cache directory
+All on-disk caches live under one directory so they can be moved or wiped together.
+Set INFOFRAME_CACHE_DIR to override the default (~/.cache/infoframe).
+The directory is only created when a cache is first written, so a read-only
+home never stops the tools from starting; they just run without the caches.
+"""
+
+import os
+from pathlib import Path
+
+
+def cache_dir():
+    """Return the cache directory (it may not exist yet)"""
+    root = os.environ.get("INFOFRAME_CACHE_DIR")
+    if root:
+        path = Path(root).expanduser()
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+        path = base / "infoframe"
+    return path
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Canvas Pool
+A 1200x1600 RGB frame is about 5.7 MB. Allocating a fresh one per render
+means fresh pages from the OS on every request, so under concurrency RSS
+churns. Renderers check canvases out of this pool instead and hand them
+back once the image has been encoded.
+
+The pool is process-wide behind a lock rather than thread-local: Flask's
+built-in server starts a new thread per request, so per-thread pools
+would never be reused.
+
+The per-request temporaries (color bands, palette images) are what keep
+RSS high after a burst: glibc serves them from per-thread heaps it rarely
+gives back. tune_allocator() lowers the mmap threshold so anything over
+1 MB is returned to the OS as soon as it is freed.
+
+Usage:
+    from canvas_pool import acquire_canvas, release_canvas, tune_allocator
+    tune_allocator()
+    img = acquire_canvas('RGB', (1200, 1600))
+    ...
+    release_canvas(img)
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+from collections import defaultdict
+
+BYTES_PER_PIXEL = {"1": 1, "L": 1, "P": 1, "RGB": 4, "RGBA": 4}
+
+M_MMAP_THRESHOLD = -3           # glibc mallopt() parameter
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def image_bytes(mode, size):
+    """Approximate memory held by an image (Pillow pads RGB to 4 bytes)"""
+    return size[0] * size[1] * BYTES_PER_PIXEL.get(mode, 4)
+
+
+class CanvasPool:
+    """Bounded free lists of blank canvases keyed by (mode, size)"""
+
+    def __init__(self, max_per_key=4, max_idle_bytes=64 * 1024 * 1024):
+        self.max_per_key = max_per_key
+        self.max_idle_bytes = max_idle_bytes
+        self.enabled = os.environ.get("INFOFRAME_POOL", "1") != "0"
+        self._free = defaultdict(list)
+        self._lock = threading.Lock()
+        self.idle_bytes = 0
+        self.checked_out_bytes = 0
+        self.peak_checked_out_bytes = 0
+        self.reused = 0
+        self.allocated = 0
+        self.dropped = 0
+
+    def acquire(self, mode, size):
+        """Return a canvas of this mode and size; contents are undefined"""
+        from PIL import Image
+
+        key = (mode, tuple(size))
+        nbytes = image_bytes(mode, size)
+        img = None
+        with self._lock:
+            if self.enabled and self._free[key]:
+                img = self._free[key].pop()
+                self.idle_bytes -= nbytes
+                self.reused += 1
+            else:
+                self.allocated += 1
+            self.checked_out_bytes += nbytes
+            self.peak_checked_out_bytes = max(self.peak_checked_out_bytes, self.checked_out_bytes)
+
+        if img is None:
+            img = Image.new(mode, size)
+        return img
+
+    def release(self, img):
+        """Return a canvas to the pool once nothing references its pixels"""
+        key = (img.mode, img.size)
+        nbytes = image_bytes(img.mode, img.size)
+        with self._lock:
+            self.checked_out_bytes = max(0, self.checked_out_bytes - nbytes)
+            if (not self.enabled
+                    or len(self._free[key]) >= self.max_per_key
+                    or self.idle_bytes + nbytes > self.max_idle_bytes):
+                self.dropped += 1
+                return
+            img.info = {}
+            self._free[key].append(img)
+            self.idle_bytes += nbytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "idle": sum(len(v) for v in self._free.values()),
+                "idle_bytes": self.idle_bytes,
+                "checked_out_bytes": self.checked_out_bytes,
+                "peak_checked_out_bytes": self.peak_checked_out_bytes,
+                "reused": self.reused,
+                "allocated": self.allocated,
+                "dropped": self.dropped,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+            self.idle_bytes = 0
+
+
+canvas_pool = CanvasPool()
+
+
+def acquire_canvas(mode, size):
+    return canvas_pool.acquire(mode, size)
+
+
+def release_canvas(img):
+    canvas_pool.release(img)
+
+
+def pool_stats():
+    return canvas_pool.stats()
+
+
+def tune_allocator(threshold=None):
+    """Serve large allocations with mmap so freed temporaries leave RSS
+
+    Only glibc has mallopt(); elsewhere this is a no-op. Set
+    INFOFRAME_MMAP_THRESHOLD=0 to leave the allocator alone.
+    Returns True if the threshold was changed.
+    """
+    if threshold is None:
+        threshold = int(os.environ.get("INFOFRAME_MMAP_THRESHOLD") or MMAP_THRESHOLD)
+    if threshold <= 0 or not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+        return bool(libc.mallopt(M_MMAP_THRESHOLD, threshold))
+    except (OSError, AttributeError):
+        return False
+
+
+def memory_usage():
+    """Return current and peak resident set size in bytes"""
+    current = peak = None
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if peak is None:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # Linux reports KiB, macOS reports bytes
+            if sys.platform != "darwin":
+                peak *= 1024
+        except ImportError:
+            peak = 0
+    return {"rss_bytes": current if current is not None else peak, "peak_rss_bytes": peak}
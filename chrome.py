@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Chrome Cache
+The background, header, title, accent line and footer depend only on the
+style, layout template and canvas size, so they are drawn once and every
+render starts from a copy of the cached base canvas (or pastes it into a
+pooled canvas).
+
+Usage:
+    from chrome import base_canvas
+    img = base_canvas("modern", get_colors("modern"))
+"""
+
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+from templates import get_plan, FRAME_WIDTH, FRAME_HEIGHT, DEFAULT_TEMPLATE
+
+STYLE_NAMES = ("modern", "classic", "minimalist", "bold")
+
+
+def chrome_geometry(width, height, scale=1.0, template=DEFAULT_TEMPLATE):
+    """Return the template's style-independent bars as (color role, box) pairs
+
+    Offsets are in 1x pixels and multiplied by scale for other resolutions.
+    """
+    return get_plan(template).bars(width, height, scale)
+
+
+def draw_chrome(img, colors, title=None, scale=1.0, template=DEFAULT_TEMPLATE):
+    """Draw the header, title, accent line and footer onto img"""
+    plan = get_plan(template)
+    width, height = img.size
+    draw = ImageDraw.Draw(img)
+
+    for role, box in plan.bars(width, height, scale):
+        draw.rectangle(box, fill=colors[role])
+    title = plan.title if title is None else title
+    if title:
+        draw.text((width // 2, round(plan.title_y * scale)), title, fill=colors[plan.title_color],
+                  font=plan.title_font_at(scale), anchor="mm")
+
+
+class ChromeCache:
+    """Bounded LRU of pre-rendered base canvases"""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._canvases = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, style, colors, width, height, title, scale=1.0, template=DEFAULT_TEMPLATE):
+        # Sized variants of a template (auto-fit) have the same chrome
+        return (style, tuple(sorted(colors.items())), width, height, title, scale, get_plan(template).base)
+
+    def get(self, style, colors, width=FRAME_WIDTH, height=FRAME_HEIGHT, title=None, into=None, scale=1.0,
+            template=DEFAULT_TEMPLATE):
+        """Return a fresh copy of the base canvas for this style and size
+
+        If into is an RGB canvas of the same size, the base is pasted over it
+        and into is returned, so no new image is allocated. scale draws the
+        bars and title natively for a 2x or thumbnail canvas.
+        """
+        base = self._base(style, colors, width, height, title, scale, template)
+        if into is None:
+            return base.copy()
+        into.paste(base)
+        return into
+
+    def _base(self, style, colors, width, height, title, scale=1.0, template=DEFAULT_TEMPLATE):
+        """Return the shared cached canvas; callers must not draw on it"""
+        key = self._key(style, colors, width, height, title, scale, template)
+        with self._lock:
+            base = self._canvases.get(key)
+            if base is not None:
+                self._canvases.move_to_end(key)
+                self.hits += 1
+                return base
+            self.misses += 1
+
+        base = Image.new('RGB', (width, height), color=colors["bg"])
+        draw_chrome(base, colors, title, scale, template)
+
+        with self._lock:
+            self._canvases[key] = base
+            self._canvases.move_to_end(key)
+            while len(self._canvases) > self.maxsize:
+                self._canvases.popitem(last=False)
+        return base
+
+    def warm(self, colors_for, styles=STYLE_NAMES, sizes=((FRAME_WIDTH, FRAME_HEIGHT),), title=None,
+             templates=(DEFAULT_TEMPLATE,)):
+        """Pre-render every style/size/template so the first request is not slower"""
+        for template in templates:
+            for style in styles:
+                colors = colors_for(style)
+                for width, height in sizes:
+                    key = self._key(style, colors, width, height, title, 1.0, template)
+                    if key not in self._canvases:
+                        self._base(style, colors, width, height, title, 1.0, template)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": len(self._canvases),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._canvases.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+chrome_cache = ChromeCache()
+
+
+def base_canvas(style, colors, width=FRAME_WIDTH, height=FRAME_HEIGHT, title=None, into=None, scale=1.0,
+                template=DEFAULT_TEMPLATE):
+    """Return a copy of the cached base canvas from the shared cache"""
+    return chrome_cache.get(style, colors, width, height, title, into, scale, template)
+
+
+def chrome_rows(style, colors, top, bottom, width=FRAME_WIDTH, title=None, template=DEFAULT_TEMPLATE):
+    """Return rows top..bottom of the standard-size base canvas as a new image
+
+    Tall scroll frames reuse the header rows and the footer rows as-is.
+    """
+    base = chrome_cache._base(style, colors, width, FRAME_HEIGHT, title, 1.0, template)
+    return base.crop((0, top, width, bottom))
+
+
+def warm_up(colors_for, styles=STYLE_NAMES, templates=(DEFAULT_TEMPLATE,)):
+    """Build the base canvases for every style (and template) at startup"""
+    chrome_cache.warm(colors_for, styles, templates=templates)
+
+
+def chrome_stats():
+    return chrome_cache.stats()
@@ -1,28 +1,37 @@
 #!/usr/bin/env python3
 """
 Universal Info-Frame Converter
-Converts: TXT, HTML, PDF, DOCX → PNG, JPG, JPEG, PDF
+Converts: TXT, HTML, PDF, DOCX → PNG, JPG, JPEG, WEBP, AVIF, PDF
 
 Usage: python3 convert.py <input_file> [output_format] [style]
 Example: python3 convert.py document.pdf png modern
 """
 
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
 import sys
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def read_docx(file_path):
-    """Read text from DOCX file"""
+from frame_mask import render_mask, colorize, render_pages, count_pages
+from encoders import (
+    encode, encode_formats, parse_formats, extension_for, EncodeResult, DEFAULT_PRESET, PRESETS
+)
+from vector_pdf import write_pdf
+from strip_render import write_scroll
+from variants import parse_sizes, render_variants, render_style_set, contact_sheet, ALL_STYLES
+from chrome import STYLE_NAMES
+from templates import user_plan, template_names, DEFAULT_TEMPLATE
+from autofit import fit_template, MIN_FIT_SIZE, MAX_FIT_SIZE
+from text_budget import page_budget, read_text_file
+from extract_cache import extract_cache
+
+def read_docx(file_path, max_chars=None):
+    """Read text from DOCX file, stopping after max_chars characters"""
     try:
-        import docx
-        doc = docx.Document(file_path)
-        text = []
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text.append(para.text)
-        return '\n'.join(text)
+        from docx_extract import extract_docx_text, EXTRACTOR_VERSION
+        return extract_cache.text(file_path, EXTRACTOR_VERSION,
+                                  lambda: extract_docx_text(file_path, max_chars), max_chars)
     except ImportError:
         print("⚠️  DOCX support requires python-docx: pip3 install python-docx")
         return None
@@ -30,16 +39,13 @@ def read_docx(file_path):
         print(f"⚠️  Could not read DOCX: {e}")
         return None
 
-def read_pdf(file_path):
-    """Read text from PDF file"""
+def read_pdf(file_path, max_chars=None):
+    """Read text from PDF file, stopping at the page that meets max_chars"""
     try:
-        import PyPDF2
-        with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            text = []
-            for page in reader.pages:
-                text.append(page.extract_text())
-            return '\n'.join(text)
+        # Large documents are extracted across a process pool
+        from pdf_extract import extract_pdf_text, EXTRACTOR_VERSION
+        return extract_cache.text(file_path, EXTRACTOR_VERSION,
+                                  lambda: extract_pdf_text(file_path, max_chars), max_chars)
     except ImportError:
         print("⚠️  PDF support requires PyPDF2: pip3 install PyPDF2")
         return None
@@ -47,83 +53,34 @@ def read_pdf(file_path):
         print(f"⚠️  Could not read PDF: {e}")
         return None
 
-def read_html(file_path):
+def read_html(file_path, max_chars=None):
     """Read text from HTML file with better formatting"""
     try:
-        from html.parser import HTMLParser
-
-        class TextExtractor(HTMLParser):
-            def __init__(self):
-                super().__init__()
-                self.text = []
-                self.in_title = False
-                self.in_heading = False
-
-            def handle_starttag(self, tag, attrs):
-                if tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                    self.in_heading = True
-                    self.text.append('')  # Add blank line before heading
-                elif tag == 'title':
-                    self.in_title = True
-                elif tag in ['p', 'div', 'section', 'li']:
-                    pass
-                elif tag == 'br':
-                    self.text.append('')
-
-            def handle_endtag(self, tag):
-                if tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                    self.in_heading = False
-                    self.text.append('')  # Add blank line after heading
-                elif tag == 'title':
-                    self.in_title = False
-                    self.text.append('')
-                elif tag in ['p', 'li']:
-                    self.text.append('')
-
-            def handle_data(self, data):
-                cleaned = data.strip()
-                if cleaned:
-                    if self.in_heading:
-                        self.text.append('=== ' + cleaned.upper() + ' ===')
-                    elif self.in_title:
-                        self.text.append('*** ' + cleaned + ' ***')
-                    else:
-                        self.text.append(cleaned)
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            parser = TextExtractor()
-            parser.feed(content)
-            # Clean up multiple blank lines
-            result = []
-            prev_blank = False
-            for line in parser.text:
-                if not line:
-                    if not prev_blank:
-                        result.append(line)
-                    prev_blank = True
-                else:
-                    result.append(line)
-                    prev_blank = False
-            return '\n'.join(result)
+        # Decoded and parsed a chunk at a time; stops once the budget is met
+        from html_extract import extract_html_text, extractor_version
+        return extract_cache.text(file_path, extractor_version(),
+                                  lambda: extract_html_text(file_path, max_chars), max_chars)
     except Exception as e:
         print(f"⚠️  Could not read HTML: {e}")
         return None
 
-def read_file(file_path):
-    """Read any supported file type"""
+def read_file(file_path, max_chars=None):
+    """Read any supported file type
+
+    max_chars is a budget (see text_budget.page_budget): readers stop once
+    they have that much text. None reads the whole document.
+    """
     ext = Path(file_path).suffix.lower()
 
     if ext == '.pdf':
-        return read_pdf(file_path)
+        return read_pdf(file_path, max_chars)
     elif ext in ['.html', '.htm']:
-        return read_html(file_path)
+        return read_html(file_path, max_chars)
     elif ext in ['.docx', '.doc']:
-        return read_docx(file_path)
+        return read_docx(file_path, max_chars)
     else:  # TXT or plain text
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return read_text_file(file_path, max_chars)
         except Exception as e:
             print(f"❌ Could not read file: {e}")
             return None
@@ -191,71 +148,181 @@ def get_colors(style):
     }
     return styles.get(style.lower(), styles["modern"])
 
-def create_image(text, style):
+def create_image(text, style, template=DEFAULT_TEMPLATE):
     """Create info-frame image"""
     colors = get_colors(style)
 
-    width, height = 1200, 1600
-    img = Image.new('RGB', (width, height), color=colors["bg"])
-    draw = ImageDraw.Draw(img)
-
-    # Load fonts
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32)
-    except:
-        title_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-
-    # Header
-    draw.rectangle([0, 0, width, 150], fill=colors["accent"])
-    draw.text((width//2, 75), "INFO FRAME", fill=colors["bg"], font=title_font, anchor="mm")
-
-    # Accent line
-    draw.rectangle([50, 180, width-50, 185], fill=colors["secondary"])
-
-    # Content
-    lines = []
-    for line in text.split('\n'):
-        if line.strip():
-            lines.extend(textwrap.wrap(line, width=40))
-        else:
-            lines.append('')
+    # Layout is style-independent; only the colorize step depends on style
+    mask = render_mask(text, template=template)
+    img = colorize(mask, style, colors)
 
-    y = 240
-    for line in lines[:25]:
-        if y > height - 100:
-            break
-        draw.text((80, y), line, fill=colors["text"], font=body_font)
-        y += 45
+    return img
 
-    # Footer
-    draw.rectangle([50, height-50, width-50, height-45], fill=colors["secondary"])
+def write_formats(text, style, formats, output_path, preset=DEFAULT_PRESET, max_pages=None,
+                  lossless=False, effort=None, template=DEFAULT_TEMPLATE):
+    """Render text once and write it in every format
 
-    return img
+    Each page is rasterized once and its encoders run concurrently; the
+    vector PDF is drawn from the layout alongside them. Returns a list of
+    (EncodeResult, file names) in the order of formats.
+    """
+    colors = get_colors(style)
+    image_formats = [fmt for fmt in formats if fmt != "pdf"]
+    results = {fmt: [0, 0.0, []] for fmt in image_formats}
+
+    with ThreadPoolExecutor(max_workers=len(formats)) as pool:
+        pdf = None
+        if "pdf" in formats:
+            pdf_path = output_path.with_suffix(".pdf")
+            pdf = pool.submit(write_pdf, text, style, colors, pdf_path, max_pages, preset=preset, template=template)
+        if image_formats:
+            for number, img in enumerate(render_pages(text, style, colors, max_pages, template=template), 1):
+                suffix = "" if number == 1 else f"_p{number}"
+                names = [f"{output_path.stem}{suffix}.{extension_for(fmt)}" for fmt in image_formats]
+                targets = [(fmt, output_path.with_name(name)) for fmt, name in zip(image_formats, names)]
+                for (fmt, _), name, result in zip(targets, names,
+                                                   encode_formats(img, targets, preset, lossless, effort, pool)):
+                    results[fmt][0] += result.size
+                    results[fmt][1] += result.seconds
+                    results[fmt][2].append(name)
+        if pdf is not None:
+            results["pdf"] = pdf.result()
+
+    written = []
+    for fmt in formats:
+        if fmt == "pdf":
+            written.append((results[fmt], [pdf_path.name]))
+        else:
+            size, seconds, names = results[fmt]
+            written.append((EncodeResult(fmt, preset, size, seconds, pages=len(names)), names))
+    return written
+
+def parse_options(argv, defaults):
+    """Split --name value / --name=value options from positional arguments"""
+    options = dict(defaults)
+    args = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name, _, value = arg.partition("=")
+        if name in defaults and isinstance(defaults[name], bool):
+            options[name] = True
+        elif name in defaults:
+            if not value and i + 1 < len(argv):
+                i += 1
+                value = argv[i]
+            options[name] = value
+        else:
+            args.append(arg)
+        i += 1
+    return args, options
 
 def main():
     print("\n🎨 UNIVERSAL CONVERTER")
     print("=" * 50)
 
-    if len(sys.argv) < 2:
-        print("\nUsage: python3 convert.py <file> [format] [style]")
+    args, options = parse_options(sys.argv[1:], {
+        "--preset": DEFAULT_PRESET,
+        "--effort": None,
+        "--lossless": False,
+        "--pages": "1",
+        "--scroll": False,
+        "--sizes": None,
+        "--formats": None,
+        "--style": None,
+        "--sheet": False,
+        "--template": DEFAULT_TEMPLATE,
+        "--fit": False,
+    })
+
+    if len(args) < 1:
+        print("\nUsage: python3 convert.py <file> [format] [style] [options]")
+        print("\nOptions:")
+        print("  --preset fastest|balanced|smallest   Encoder preset (default: balanced)")
+        print("  --effort 0-10                        WebP/AVIF effort, 0 = fastest")
+        print("  --lossless                           Lossless WebP")
+        print("  --pages N|all                        Render up to N pages, or all (default: 1)")
+        print("  --scroll                             One tall PNG/JPG instead of pages")
+        print("  --sizes 1x,2x,thumb                  First page at several resolutions (or 600w)")
+        print("  --formats png,jpg,pdf                Render once, write every format")
+        print("  --style all                          Every style from one layout pass")
+        print("  --sheet                              With --style all, one contact sheet")
+        print(f"  --template NAME                      Layout: {', '.join(template_names())}")
+        print(f"  --fit                                Largest body font that fits ({MIN_FIT_SIZE}-{MAX_FIT_SIZE}px)")
         print("\nInput:  TXT, HTML, PDF, DOCX")
-        print("Output: PNG, JPG, JPEG, PDF")
-        print("Styles: modern, classic, minimalist, bold")
+        print("Output: PNG, JPG, JPEG, WEBP, AVIF, PDF")
+        print("Styles: modern, classic, minimalist, bold, all")
         print("\nExamples:")
         print("  python3 convert.py document.pdf png modern")
         print("  python3 convert.py notes.txt jpg")
-        print("  python3 convert.py page.html png classic\n")
+        print("  python3 convert.py page.html png classic")
+        print("  python3 convert.py report.pdf png bold --preset smallest")
+        print("  python3 convert.py notes.txt webp --lossless --effort 8")
+        print("  python3 convert.py book.pdf pdf classic --pages 10")
+        print("  python3 convert.py notes.txt png --sizes 1x,2x,thumb")
+        print("  python3 convert.py report.docx modern --formats png,jpg,pdf")
+        print("  python3 convert.py report.pdf png --style all --sheet")
+        print("  python3 convert.py notes.txt png --fit\n")
+        return
+
+    preset = options["--preset"].lower()
+    if preset not in PRESETS:
+        print(f"❌ Unknown preset: {preset}")
+        print(f"   Supported presets: {', '.join(PRESETS)}\n")
+        return
+
+    effort = options["--effort"]
+    if effort is not None:
+        if not effort.isdigit() or int(effort) > 10:
+            print(f"❌ Invalid effort: {effort} (use 0-10)\n")
+            return
+        effort = int(effort)
+
+    # First page only unless more are asked for, like the web apps' images
+    max_pages = options["--pages"]
+    if max_pages.lower() == "all":
+        max_pages = None
+    elif not max_pages.isdigit() or int(max_pages) < 1:
+        print(f"❌ Invalid page count: {max_pages} (use 1 or more, or all)\n")
         return
+    else:
+        max_pages = int(max_pages)
 
-    input_file = sys.argv[1]
-    output_format = sys.argv[2].lower() if len(sys.argv) > 2 else "png"
-    style = sys.argv[3].lower() if len(sys.argv) > 3 else "modern"
+    sizes = options["--sizes"]
+    if sizes is not None:
+        try:
+            sizes = parse_sizes(sizes)
+        except ValueError as e:
+            print(f"❌ {e}\n")
+            return
+
+    template = options["--template"].lower()
+    try:
+        user_plan(template)
+    except ValueError as e:
+        print(f"❌ {e}\n")
+        return
+
+    formats = options["--formats"]
+    if formats is not None:
+        if sizes is not None or options["--scroll"]:
+            print("❌ --formats cannot be combined with --sizes or --scroll\n")
+            return
+        try:
+            formats = parse_formats(formats)
+        except ValueError as e:
+            print(f"❌ {e}\n")
+            return
+
+    input_file = args[0]
+    output_format = args[1].lower() if len(args) > 1 else "png"
+    style = args[2].lower() if len(args) > 2 else "modern"
+    if options["--style"]:
+        style = options["--style"].lower()
     style_arg_raw = style
     input_path = Path(input_file)
 
-    valid_formats = {"png", "jpg", "jpeg", "pdf"}
+    valid_formats = {"png", "jpg", "jpeg", "webp", "avif", "pdf"}
     style_aliases = {
         "minimal": "minimalist",
         "minimalistic": "minimalist",
@@ -265,7 +332,7 @@ def main():
         "modern": "modern",
         "minimalist": "minimalist"
     }
-    valid_styles = {"modern", "classic", "minimalist", "bold"}
+    valid_styles = {"modern", "classic", "minimalist", "bold", ALL_STYLES}
 
     def normalize_style(value):
         return style_aliases.get(value, value)
@@ -276,7 +343,7 @@ def main():
     format_as_style = normalize_style(output_format)
     style_arg_is_format = style_arg_raw in valid_formats
     style_arg_is_style = style in valid_styles
-    style_arg_provided = len(sys.argv) > 3
+    style_arg_provided = len(args) > 2
 
     if output_format not in valid_formats:
         if format_as_style in valid_styles and style_arg_is_format:
@@ -291,7 +358,7 @@ def main():
             swap_message = f"🔄 Detected style only. Using format 'png' and style '{style}'."
         else:
             print(f"❌ Unknown format: {output_format}")
-            print("   Supported formats: png, jpg, jpeg, pdf\n")
+            print("   Supported formats: png, jpg, jpeg, webp, avif, pdf\n")
             return
     else:
         if style_arg_is_format and format_as_style in valid_styles:
@@ -302,7 +369,19 @@ def main():
 
     if style not in valid_styles:
         print(f"❌ Unknown style: {style}")
-        print("   Supported styles: modern, classic, minimalist, bold\n")
+        print("   Supported styles: modern, classic, minimalist, bold, all\n")
+        return
+
+    if style == ALL_STYLES:
+        if sizes is not None or formats is not None or options["--scroll"]:
+            print("❌ --style all cannot be combined with --sizes, --formats or --scroll\n")
+            return
+        if output_format == "pdf" and not options["--sheet"]:
+            print("❌ --style all needs an image format, or pdf with --sheet\n")
+            return
+
+    if sizes is not None and output_format == "pdf":
+        print("❌ --sizes needs an image format (png, jpg, webp, avif)\n")
         return
 
     if not input_path.exists():
@@ -316,10 +395,13 @@ def main():
     print(f"\n📄 Reading: {input_path.name}")
     if swap_message:
         print(swap_message)
+    if template != DEFAULT_TEMPLATE:
+        print(f"📐 Layout: {template}")
 
     image_formats = {"png", "jpg", "jpeg"}
 
-    if input_ext in ['.html', '.htm'] and output_format in image_formats:
+    if (input_ext in ['.html', '.htm'] and output_format in image_formats
+            and formats is None and style != ALL_STYLES):
         print(f"📦 Format: {output_format}")
         print(f"🎨 Style: {style} (ignored for HTML screenshot)")
         print("📸 Rendering HTML with snap.js...")
@@ -329,31 +411,163 @@ def main():
             return
         print("⚠️  snap.js rendering failed; falling back to styled text rendering.")
 
-    text = read_file(input_file)
+    # Only read as much as the pages being written can show
+    if options["--scroll"]:
+        budget_pages = None
+    elif sizes is not None or style == ALL_STYLES:
+        budget_pages = 1
+    else:
+        budget_pages = max_pages
+    max_chars = page_budget(budget_pages, template, options["--fit"])
+    hits = extract_cache.hits
+    text = read_file(input_file, max_chars)
 
     if not text:
         print("❌ Could not read file\n")
         return
+    if extract_cache.hits > hits:
+        print("🗃️  Text from the extraction cache (python3 extract_cache.py clear to drop it)")
+
+    if options["--fit"]:
+        # Every output below then renders through the fitted template
+        fit = fit_template(text, template)
+        template = fit.template
+        overflow = "" if fit.fits else f", still overflows at {MIN_FIT_SIZE}px"
+        print(f"🔤 Fit: {fit.size}px body ({fit.probes} layout passes, {fit.measure_calls} measure calls{overflow})")
+
+    if style == ALL_STYLES:
+        # Extracted and laid out once, then colored in every style
+        print(f"🎨 Styles: {', '.join(STYLE_NAMES)}")
+        print(f"📦 Format: {output_format}")
+        saved = []
+        try:
+            if options["--sheet"]:
+                img = contact_sheet(text, STYLE_NAMES, get_colors, template=template)
+                result = encode(img, output_format, preset, output_path,
+                                lossless=options["--lossless"], effort=effort)
+                saved.append(f"{output_name} ({img.width}x{img.height})")
+            else:
+                size = seconds = 0
+                for name, img in render_style_set(text, STYLE_NAMES, get_colors, template):
+                    style_name = f"{input_path.stem}_{name}.{output_format}"
+                    styled = encode(img, output_format, preset, output_path.with_name(style_name),
+                                    lossless=options["--lossless"], effort=effort)
+                    size += styled.size
+                    seconds += styled.seconds
+                    saved.append(style_name)
+                result = EncodeResult(styled.format, preset, size, seconds)
+        except ValueError as e:
+            print(f"❌ {e}\n")
+            return
+        print("\n✅ Saved:")
+        for name in saved:
+            print(f"   {name}")
+        print(f"⚡ Encoded: {result.summary()}")
+        print(f"📁 Location: {output_path.parent}\n")
+        return
+
+    if formats is not None:
+        # Extracted and rendered once; the encoders share a thread pool
+        print(f"🎨 Style: {style}")
+        print(f"📦 Formats: {', '.join(formats)}")
+        start = time.perf_counter()
+        try:
+            written = write_formats(text, style, formats, output_path, preset, max_pages,
+                                    options["--lossless"], effort, template)
+        except ValueError as e:
+            print(f"❌ {e}\n")
+            return
+        wall = time.perf_counter() - start
+        print("\n✅ Saved:")
+        for result, names in written:
+            shown = names[0] if len(names) == 1 else f"{names[0]} … {names[-1]}"
+            print(f"   {shown:32s} {result.summary()}")
+        print(f"⏱️  Total: {wall * 1000:.1f} ms wall for {len(formats)} formats "
+              f"({sum(result.seconds for result, _ in written) * 1000:.1f} ms of encoding)")
+        print(f"📁 Location: {output_path.parent}\n")
+        return
 
-    # Trim if too long
-    if len(text) > 2000:
-        text = text[:2000] + "..."
-        print("✂️  Content trimmed to 2000 chars")
+    if sizes is not None:
+        # One layout pass, each size rasterized natively
+        print(f"🎨 Style: {style}")
+        print(f"📦 Format: {output_format}")
+        print(f"📐 Sizes: {', '.join(label for label, _ in sizes)}")
+        saved = []
+        size = seconds = 0
+        try:
+            for label, img in render_variants(text, style, get_colors(style), sizes, template):
+                name = f"{input_path.stem}_{style}_{label}.{output_format}"
+                variant = encode(img, output_format, preset, output_path.with_name(name),
+                                 lossless=options["--lossless"], effort=effort)
+                size += variant.size
+                seconds += variant.seconds
+                saved.append(f"{name} ({img.width}x{img.height})")
+        except ValueError as e:
+            print(f"❌ {e}\n")
+            return
+        result = EncodeResult(variant.format, preset, size, seconds)
+        print("\n✅ Saved:")
+        for name in saved:
+            print(f"   {name}")
+        print(f"⚡ Encoded: {result.summary()}")
+        print(f"📁 Location: {output_path.parent}\n")
+        return
 
-    # Generate image
+    if options["--scroll"]:
+        # One tall image, encoded and written strip by strip
+        print(f"🎨 Style: {style}")
+        print(f"📦 Format: {output_format} (scroll)")
+        try:
+            result = write_scroll(text, style, get_colors(style), output_path, output_format, preset,
+                                  template=template)
+        except ValueError as e:
+            print(f"❌ {e}\n")
+            return
+        print(f"\n✅ Saved: {output_name}")
+        print(f"⚡ Encoded: {result.summary()}")
+        print(f"📁 Location: {output_path.parent}\n")
+        return
+
+    # Long documents flow onto further pages instead of being trimmed
+    total_pages = count_pages(text, template=template)
+    page_count = total_pages if max_pages is None else min(max_pages, total_pages)
     print(f"🎨 Style: {style}")
     print(f"📦 Format: {output_format}")
+    if max_chars is not None and len(text) >= max_chars:
+        print(f"📑 Pages: {page_count} (stopped reading after {len(text):,} characters)")
+    elif page_count < total_pages:
+        print(f"📑 Pages: {page_count} of {total_pages} (--pages N or --pages all for more)")
+    else:
+        print(f"📑 Pages: {page_count}")
 
-    img = create_image(text, style)
+    saved = []
+    try:
+        if output_format == "pdf":
+            # Vector bars and embedded-font text; nothing is rasterized
+            result = write_pdf(text, style, get_colors(style), output_path, max_pages, preset=preset,
+                               template=template)
+            saved.append(output_name)
+        else:
+            # Pages are rasterized one at a time as they are written
+            pages = render_pages(text, style, get_colors(style), max_pages, template=template)
+            size = seconds = 0
+            for number, img in enumerate(pages, 1):
+                name = output_name if number == 1 else f"{input_path.stem}_{style}_p{number}.{output_format}"
+                page_result = encode(img, output_format, preset, output_path.with_name(name),
+                                     lossless=options["--lossless"], effort=effort)
+                size += page_result.size
+                seconds += page_result.seconds
+                saved.append(name)
+            result = EncodeResult(page_result.format, preset, size, seconds, pages=len(saved))
+    except ValueError as e:
+        print(f"❌ {e}\n")
+        return
 
-    if output_format in ['jpg', 'jpeg']:
-        img.convert('RGB').save(output_path, 'JPEG', quality=95)
-    elif output_format == 'pdf':
-        img.convert('RGB').save(output_path, 'PDF', resolution=100.0)
+    if len(saved) > 1:
+        print(f"\n✅ Saved: {saved[0]} … {saved[-1]} ({len(saved)} files)")
     else:
-        img.save(output_path, 'PNG')
-
-    print(f"\n✅ Saved: {output_name}")
+        print(f"\n✅ Saved: {output_name}")
+    print(f"⚡ Encoded: {result.summary()}")
     print(f"📁 Location: {output_path.parent}\n")
 
 if __name__ == "__main__":
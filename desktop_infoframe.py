@@ -6,11 +6,24 @@ Run with: python3 desktop_infoframe.py
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from PIL import Image, ImageDraw, ImageFont, ImageTk
-import textwrap
+from PIL import ImageTk
 from pathlib import Path
-import PyPDF2
 import io
+import time
+
+from chrome import warm_up
+from frame_mask import render_mask, colorize, count_pages
+from encoders import encode, DEFAULT_PRESET, PRESETS, MAX_PAGES
+from vector_pdf import write_pdf
+from templates import template_names, warm_up_templates, DEFAULT_TEMPLATE
+from autofit import fit_template
+from html_frame import iter_html
+from preview import preview_mask, PREVIEW_WIDTH
+from canvas_pool import release_canvas
+from text_budget import page_budget, read_text_file
+from pdf_extract import extract_pdf_text, EXTRACTOR_VERSION as PDF_EXTRACTOR
+from html_extract import extract_html_text, extractor_version
+from extract_cache import extract_cache
 
 class InfoFrameApp:
     def __init__(self, root):
@@ -20,10 +33,17 @@ class InfoFrameApp:
         self.root.configure(bg='#f0f0f0')
 
         self.selected_style = tk.StringVar(value="modern")
-        self.current_image = None
+        self.selected_preset = tk.StringVar(value=DEFAULT_PRESET)
+        self.selected_template = tk.StringVar(value=DEFAULT_TEMPLATE)
+        self.fit_text = tk.BooleanVar(value=False)
+        self.lossless = tk.BooleanVar(value=False)
+        self.current_mask = None      # First page at preview size
+        self.last_fit = None
         self.content_text = ""
 
         self.setup_ui()
+        warm_up_templates()
+        warm_up(self.get_style_colors, templates=template_names())
 
     def setup_ui(self):
         # Header
@@ -127,10 +147,33 @@ class InfoFrameApp:
                 fg=color,
                 selectcolor='#e8e8e8',
                 activebackground='#f0f0f0',
-                cursor='hand2'
+                cursor='hand2',
+                command=self.restyle
             )
             rb.grid(row=0, column=i, padx=15, pady=5)
 
+        # Layout template; a change needs a new layout, so it regenerates
+        template_row = tk.Frame(style_frame, bg='#f0f0f0')
+        template_row.pack(pady=(0, 10))
+        tk.Label(
+            template_row,
+            text="Layout:",
+            font=('Helvetica', 11),
+            bg='#f0f0f0',
+            fg='#666'
+        ).pack(side='left', padx=(0, 5))
+        tk.OptionMenu(template_row, self.selected_template, *template_names(),
+                      command=lambda _: self.relayout()).pack(side='left')
+        tk.Checkbutton(
+            template_row,
+            text="Fit text to frame",
+            variable=self.fit_text,
+            command=self.relayout,
+            font=('Helvetica', 11),
+            bg='#f0f0f0',
+            activebackground='#f0f0f0'
+        ).pack(side='left', padx=(10, 0))
+
         # Generate button
         generate_btn = tk.Button(
             main,
@@ -164,9 +207,12 @@ class InfoFrameApp:
         )
         self.preview_label.pack(fill='both', expand=True, padx=10, pady=10)
 
-        # Save button
+        # Save button and encoder preset
+        save_frame = tk.Frame(main, bg='#f0f0f0')
+        save_frame.pack(pady=(0, 10))
+
         self.save_btn = tk.Button(
-            main,
+            save_frame,
             text="💾 Save Image",
             command=self.save_image,
             font=('Helvetica', 12),
@@ -177,7 +223,26 @@ class InfoFrameApp:
             cursor='hand2',
             state='disabled'
         )
-        self.save_btn.pack(pady=(0, 10))
+        self.save_btn.pack(side='left', padx=5)
+
+        tk.Label(
+            save_frame,
+            text="Preset:",
+            font=('Helvetica', 11),
+            bg='#f0f0f0',
+            fg='#666'
+        ).pack(side='left', padx=(10, 5))
+
+        tk.OptionMenu(save_frame, self.selected_preset, *PRESETS).pack(side='left')
+
+        tk.Checkbutton(
+            save_frame,
+            text="Lossless WebP",
+            variable=self.lossless,
+            font=('Helvetica', 11),
+            bg='#f0f0f0',
+            activebackground='#f0f0f0'
+        ).pack(side='left', padx=(10, 0))
 
     def upload_file(self):
         file_path = filedialog.askopenfilename(
@@ -194,16 +259,20 @@ class InfoFrameApp:
         if not file_path:
             return
 
+        # Read at most what MAX_PAGES pages can show at the smallest fitted
+        # size; a huge document would only slow the editor down
+        max_chars = page_budget(MAX_PAGES, self.selected_template.get(), fit=True)
         try:
             if file_path.endswith('.pdf'):
-                self.content_text = self.extract_text_from_pdf(file_path)
+                self.content_text = self.extract_text_from_pdf(file_path, max_chars)
             elif file_path.endswith(('.html', '.htm')):
-                self.content_text = self.extract_text_from_html(file_path)
+                self.content_text = self.extract_text_from_html(file_path, max_chars)
             else:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.content_text = f.read()
+                self.content_text = read_text_file(file_path, max_chars)
 
             filename = Path(file_path).name
+            if len(self.content_text) >= max_chars:
+                filename += f" (first {len(self.content_text):,} characters)"
             self.file_label.config(text=f"✓ {filename}", fg='#4caf50')
             self.text_area.delete('1.0', tk.END)
             self.text_area.insert('1.0', self.content_text)
@@ -211,38 +280,19 @@ class InfoFrameApp:
         except Exception as e:
             messagebox.showerror("Error", f"Could not read file:\n{str(e)}")
 
-    def extract_text_from_pdf(self, pdf_path):
-        """Extract text from PDF file"""
+    def extract_text_from_pdf(self, pdf_path, max_chars=None):
+        """Extract text from PDF file, stopping once max_chars are read"""
         try:
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
+            return extract_cache.text(pdf_path, PDF_EXTRACTOR,
+                                      lambda: extract_pdf_text(pdf_path, max_chars), max_chars)
         except Exception as e:
             raise Exception(f"PDF reading error: {str(e)}")
 
-    def extract_text_from_html(self, html_path):
-        """Extract text content from HTML file"""
+    def extract_text_from_html(self, html_path, max_chars=None):
+        """Extract text content from HTML file, stopping once max_chars are read"""
         try:
-            from html.parser import HTMLParser
-
-            class HTMLTextExtractor(HTMLParser):
-                def __init__(self):
-                    super().__init__()
-                    self.text = []
-
-                def handle_data(self, data):
-                    if data.strip():
-                        self.text.append(data.strip())
-
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-
-            parser = HTMLTextExtractor()
-            parser.feed(html_content)
-            return '\n'.join(parser.text)
+            return extract_cache.text(html_path, extractor_version(),
+                                      lambda: extract_html_text(html_path, max_chars), max_chars)
         except Exception as e:
             raise Exception(f"HTML reading error: {str(e)}")
 
@@ -275,63 +325,47 @@ class InfoFrameApp:
         }
         return styles.get(style, styles["modern"])
 
-    def create_infoframe(self, text, style):
+    def create_infoframe(self, text, style, template=DEFAULT_TEMPLATE):
         """Create info-frame image"""
         colors = self.get_style_colors(style)
 
-        width, height = 1200, 1600
-        img = Image.new('RGB', (width, height), color=colors["bg"])
-        draw = ImageDraw.Draw(img)
+        # Layout is style-independent; only the colorize step depends on style
+        mask = render_mask(text, template=template)
+        img = colorize(mask, style, colors)
 
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-            body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32)
-        except:
-            title_font = ImageFont.load_default()
-            body_font = ImageFont.load_default()
-
-        # Header
-        draw.rectangle([0, 0, width, 150], fill=colors["accent"])
-        draw.text(
-            (width // 2, 75),
-            "INFO FRAME",
-            fill=colors["bg"],
-            font=title_font,
-            anchor="mm"
-        )
+        return img
 
-        # Accent line
-        draw.rectangle([50, 180, width - 50, 185], fill=colors["secondary"])
-
-        # Content
-        margin = 80
-        lines = text.split('\n')
-        wrapped_lines = []
-        for line in lines:
-            if line.strip():
-                wrapped = textwrap.wrap(line, width=40)
-                wrapped_lines.extend(wrapped)
-            else:
-                wrapped_lines.append('')
-
-        y_position = 240
-        line_height = 45
-
-        for line in wrapped_lines[:25]:
-            if y_position > height - 100:
-                break
-            draw.text(
-                (margin, y_position),
-                line,
-                fill=colors["text"],
-                font=body_font
-            )
-            y_position += line_height
+    def show_preview(self):
+        """Display the preview mask in the selected style"""
+        style = self.selected_style.get()
+        preview_img = colorize(self.current_mask, style, self.get_style_colors(style))
 
-        # Footer decoration
-        draw.rectangle([50, height - 50, width - 50, height - 45], fill=colors["secondary"])
+        photo = ImageTk.PhotoImage(preview_img)
+        release_canvas(preview_img)
+        self.preview_label.config(image=photo, text="")
+        self.preview_label.image = photo  # Keep reference
 
-        return img
+    def restyle(self):
+        """Recolor the last generated frame when the style changes"""
+        if self.current_mask is None:
+            return
+        self.show_preview()
+
+    def layout_template(self, text):
+        """Return the selected template, sized to fit text when fitting is on"""
+        self.last_fit = None
+        if not self.fit_text.get():
+            return self.selected_template.get()
+        self.last_fit = fit_template(text, self.selected_template.get())
+        return self.last_fit.template
+
+    def relayout(self):
+        """Lay the last generated frame out again in the selected template"""
+        if self.current_mask is None:
+            return
+        text = self.text_area.get('1.0', tk.END).strip()
+        self.current_mask = preview_mask(text, PREVIEW_WIDTH, self.layout_template(text))
+        self.show_preview()
 
     def generate(self):
         # Get text from text area
@@ -342,140 +376,65 @@ class InfoFrameApp:
             return
 
         try:
-            # Limit text length
-            if len(text) > 2000:
-                text = text[:2000] + "..."
-
-            style = self.selected_style.get()
-
-            # Generate image
-            self.current_image = self.create_infoframe(text, style)
+            template = self.layout_template(text)
 
-            # Create thumbnail for preview
-            preview_img = self.current_image.copy()
-            preview_img.thumbnail((400, 533), Image.Resampling.LANCZOS)
-
-            # Display preview
-            photo = ImageTk.PhotoImage(preview_img)
-            self.preview_label.config(image=photo, text="")
-            self.preview_label.image = photo  # Keep reference
+            # Draw the preview at display size; the full frame is rendered
+            # on save. The mask is kept so style changes only recolor.
+            start = time.perf_counter()
+            self.current_mask = preview_mask(text, PREVIEW_WIDTH, template)
+            self.show_preview()
+            preview_ms = (time.perf_counter() - start) * 1000
 
             # Enable save button
             self.save_btn.config(state='normal')
 
-            messagebox.showinfo("Success", "Info-frame generated successfully!")
+            message = f"Info-frame generated successfully!\n\nPreview drawn in {preview_ms:.0f} ms."
+            fit = self.last_fit
+            if fit is not None:
+                message += (f"\n\nBody text set at {fit.size}px "
+                            f"({fit.probes} layout passes, {fit.measure_calls} measure calls).")
+            pages = count_pages(text, template=template)
+            if pages > 1:
+                message += f"\n\nThe text fills {pages} pages; the preview shows the first."
+            messagebox.showinfo("Success", message)
 
         except Exception as e:
             messagebox.showerror("Error", f"Generation failed:\n{str(e)}")
 
-    def create_html(self, text, style):
-        """Create HTML version of info-frame"""
-        colors = self.get_style_colors(style)
-
-        # Convert RGB tuples to hex
-        bg_hex = '#{:02x}{:02x}{:02x}'.format(*colors["bg"])
-        accent_hex = '#{:02x}{:02x}{:02x}'.format(*colors["accent"])
-        text_hex = '#{:02x}{:02x}{:02x}'.format(*colors["text"])
-        secondary_hex = '#{:02x}{:02x}{:02x}'.format(*colors["secondary"])
-
-        # Process text
-        lines = text.split('\n')
-        content_html = ""
-        for line in lines:
-            if line.strip():
-                content_html += f"<p>{line}</p>\n"
-            else:
-                content_html += "<br>\n"
-
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Info Frame - {style.capitalize()}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Helvetica', Arial, sans-serif;
-            background: {bg_hex};
-            color: {text_hex};
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        .container {{
-            max-width: 1200px;
-            width: 100%;
-            background: {bg_hex};
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-        }}
-        .header {{
-            background: {accent_hex};
-            padding: 50px;
-            text-align: center;
-        }}
-        .header h1 {{
-            color: {bg_hex};
-            font-size: 3.5em;
-            font-weight: bold;
-            letter-spacing: 2px;
-        }}
-        .accent-line {{
-            height: 5px;
-            background: {secondary_hex};
-            margin: 30px 50px;
-        }}
-        .content {{
-            padding: 40px 80px;
-            font-size: 1.3em;
-            line-height: 1.8;
-        }}
-        .content p {{
-            margin-bottom: 15px;
-        }}
-        .footer-line {{
-            height: 5px;
-            background: {secondary_hex};
-            margin: 30px 50px 50px 50px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>INFO FRAME</h1>
-        </div>
-        <div class="accent-line"></div>
-        <div class="content">
-{content_html}
-        </div>
-        <div class="footer-line"></div>
-    </div>
-</body>
-</html>"""
-        return html
+    def save_frame(self, img, file_path):
+        """Encode a full-size frame by file extension (PNG by default)"""
+        preset = self.selected_preset.get()
+        if file_path.endswith(('.jpg', '.jpeg')):
+            result = encode(img, 'jpeg', preset, file_path)
+            messagebox.showinfo("Success", f"JPEG saved to:\n{file_path}\n\n{result.summary()}")
+        elif file_path.endswith('.webp'):
+            result = encode(img, 'webp', preset, file_path, lossless=self.lossless.get())
+            messagebox.showinfo("Success", f"WebP saved to:\n{file_path}\n\n{result.summary()}")
+        elif file_path.endswith('.avif'):
+            result = encode(img, 'avif', preset, file_path)
+            messagebox.showinfo("Success", f"AVIF saved to:\n{file_path}\n\n{result.summary()}")
+        else:
+            # Default to PNG
+            if not file_path.endswith('.png'):
+                file_path += '.png'
+            result = encode(img, 'png', preset, file_path)
+            messagebox.showinfo("Success", f"PNG saved to:\n{file_path}\n\n{result.summary()}")
 
     def save_image(self):
-        if not self.current_image:
+        if self.current_mask is None:
             messagebox.showwarning("Warning", "Please generate an image first")
             return
 
-        # Get text content for HTML export
+        # Get text content for HTML and multi-page export
         text = self.text_area.get('1.0', tk.END).strip()
-        if len(text) > 2000:
-            text = text[:2000] + "..."
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".png",
             filetypes=[
                 ("PNG files", "*.png"),
                 ("JPEG files", "*.jpg"),
+                ("WebP files", "*.webp"),
+                ("AVIF files", "*.avif"),
                 ("PDF files", "*.pdf"),
                 ("HTML files", "*.html"),
                 ("All files", "*.*")
@@ -486,25 +445,25 @@ class InfoFrameApp:
         if file_path:
             try:
                 if file_path.endswith('.html'):
-                    # Save as HTML
-                    html_content = self.create_html(text, self.selected_style.get())
+                    # Save as HTML, written chunk by chunk
+                    style = self.selected_style.get()
                     with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(html_content)
+                        f.writelines(iter_html(text, style, self.get_style_colors(style)))
                     messagebox.showinfo("Success", f"HTML file saved to:\n{file_path}")
                 elif file_path.endswith('.pdf'):
-                    img_rgb = self.current_image.convert('RGB')
-                    img_rgb.save(file_path, "PDF", resolution=100.0)
-                    messagebox.showinfo("Success", f"PDF saved to:\n{file_path}")
-                elif file_path.endswith(('.jpg', '.jpeg')):
-                    img_rgb = self.current_image.convert('RGB')
-                    img_rgb.save(file_path, "JPEG", quality=95)
-                    messagebox.showinfo("Success", f"JPEG saved to:\n{file_path}")
+                    # Every page, as vector bars and searchable text
+                    style = self.selected_style.get()
+                    result = write_pdf(text, style, self.get_style_colors(style), file_path,
+                                       preset=self.selected_preset.get(), template=self.layout_template(text))
+                    messagebox.showinfo("Success", f"PDF saved to:\n{file_path}\n\n{result.summary()}")
                 else:
-                    # Default to PNG
-                    if not file_path.endswith('.png'):
-                        file_path += '.png'
-                    self.current_image.save(file_path, "PNG")
-                    messagebox.showinfo("Success", f"PNG saved to:\n{file_path}")
+                    # The preview is only display-sized; render the full frame now
+                    style = self.selected_style.get()
+                    img = self.create_infoframe(text, style, self.layout_template(text))
+                    try:
+                        self.save_frame(img, file_path)
+                    finally:
+                        release_canvas(img)
 
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save file:\n{str(e)}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Info-Frame DOCX Text Extraction
+Streams paragraphs out of a .docx without building python-docx's object
+model. Only word/document.xml is read from the zip, decompressed and parsed
+incrementally, and each paragraph is dropped once its text is yielded, so
+embedded images and other media are never loaded and memory stays flat.
+
+Paragraphs come with a heading level: 1-9 for Title/Heading styles (or an
+explicit outline level), 0 for body text. Paragraphs in tables and text
+boxes are included. python-docx is only used as a fallback when the stream
+cannot be parsed.
+
+Usage:
+    from docx_extract import extract_docx_text, iter_docx_paragraphs
+    text = extract_docx_text("report.docx", max_chars=5000)
+    for text, level in iter_docx_paragraphs("report.docx"):
+        ...
+"""
+
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse, ParseError
+
+from text_budget import TextBudget
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCUMENT_XML = "word/document.xml"
+# Part of the extraction cache key: bump when the extracted text changes
+EXTRACTOR_VERSION = "docx-1"
+
+_heading_style = re.compile(r"heading\s*(\d)$", re.IGNORECASE)
+
+
+def _level(paragraph):
+    """Heading level of a w:p element (0 for body text)"""
+    properties = paragraph.find(W + "pPr")
+    if properties is None:
+        return 0
+    outline = properties.find(W + "outlineLvl")
+    if outline is not None:
+        # Outline levels run 0-8; 9 marks body text
+        level = int(outline.get(W + "val", "0")) + 1
+        return level if level <= 9 else 0
+    style = properties.find(W + "pStyle")
+    if style is None:
+        return 0
+    name = style.get(W + "val", "")
+    if name.lower() == "title":
+        return 1
+    match = _heading_style.match(name)
+    return int(match.group(1)) if match else 0
+
+
+def _text(paragraph):
+    parts = []
+    for node in paragraph.iter():
+        tag = node.tag
+        if tag == W + "t":
+            parts.append(node.text or "")
+        elif tag == W + "tab":
+            parts.append("\t")
+        elif tag in (W + "br", W + "cr"):
+            parts.append("\n")
+    return "".join(parts)
+
+
+def iter_docx_paragraphs(docx_file):
+    """Yield (text, heading level) for every paragraph, in document order
+
+    docx_file is a path or a binary file object. Raises zipfile.BadZipFile,
+    KeyError or ParseError if it is not a readable .docx.
+    """
+    body = None
+    depth = body_depth = 0
+    with zipfile.ZipFile(docx_file) as archive:
+        with archive.open(DOCUMENT_XML) as document:
+            for event, element in iterparse(document, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if element.tag == W + "body":
+                        body, body_depth = element, depth
+                    continue
+                depth -= 1
+                if element.tag == W + "p":
+                    yield _text(element), _level(element)
+                    # Also empties text-box paragraphs nested in a run, so
+                    # the enclosing paragraph does not repeat them
+                    element.clear()
+                elif element.tag in (W + "tbl", W + "sdt"):
+                    element.clear()
+                if depth == body_depth and body is not None:
+                    # Finished top-level blocks are detached from w:body, so
+                    # the tree only holds what the parser has read ahead
+                    body.remove(element)
+
+
+def _python_docx_paragraphs(docx_file):
+    import docx
+    if hasattr(docx_file, "seek"):
+        docx_file.seek(0)
+    for paragraph in docx.Document(docx_file).paragraphs:
+        yield paragraph.text, 0
+
+
+def extract_docx_text(docx_file, max_chars=None):
+    """Return the non-blank paragraphs of a .docx, one per line
+
+    Stops once max_chars characters are collected. Falls back to python-docx
+    if the document cannot be streamed.
+    """
+    try:
+        return _collect(iter_docx_paragraphs(docx_file), max_chars)
+    except (zipfile.BadZipFile, KeyError, ParseError):
+        return _collect(_python_docx_paragraphs(docx_file), max_chars)
+
+
+def _collect(paragraphs, max_chars):
+    budget = TextBudget(max_chars)
+    for text, _ in paragraphs:
+        if text.strip() and budget.add(text):
+            break
+    return budget.text()
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Output Encoders
+One place that turns a rendered frame into PNG / JPEG / WebP / AVIF / PDF
+bytes, with named presets that trade encode time against file size.
+
+An info-frame is a handful of flat colors plus anti-aliasing ramps, so an
+adaptive palette (P mode) PNG is both much smaller and faster to compress
+than the full-RGB default.
+
+Usage:
+    from encoders import encode
+    result = encode(img, "png", "balanced", "frame.png")
+    print(result.size, result.seconds)
+
+    # WebP/AVIF take an effort override (0 = fastest, 10 = smallest)
+    encode(img, "webp", "balanced", "frame.webp", lossless=True, effort=8)
+
+    # Multi-page PDF, written as each page is produced
+    encode_pages(render_pages(text, style, colors), "pdf", "balanced", "doc.pdf")
+
+    # One frame to several formats at once, on a thread pool
+    encode_formats(img, [("png", "frame.png"), ("jpeg", "frame.jpg")])
+
+    python3 encoders.py frame.png   # Compare every preset on an image
+"""
+
+import io
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageChops, features
+
+from pdf_writer import PdfWriter
+
+DEFAULT_PRESET = "balanced"
+
+PRESETS = {
+    "fastest": {
+        "palette": 64,
+        "png": {"compress_level": 1},
+        "jpeg": {"quality": 90, "subsampling": 2},
+        "webp": {"quality": 80, "method": 0},
+        "webp_lossless": {"quality": 10, "method": 1},
+        "avif": {"quality": 60, "speed": 9},
+        "pdf": {"quality": 75},
+    },
+    "balanced": {
+        "palette": 64,
+        "png": {"compress_level": 6},
+        "jpeg": {"quality": 95, "subsampling": 2, "optimize": True},
+        "webp": {"quality": 85, "method": 4},
+        "webp_lossless": {"quality": 80, "method": 4},
+        "avif": {"quality": 65, "speed": 7},
+        "pdf": {"quality": 85, "optimize": True},
+    },
+    "smallest": {
+        "palette": 64,
+        "png": {"compress_level": 9, "optimize": True},
+        "jpeg": {"quality": 85, "subsampling": 2, "optimize": True, "progressive": True},
+        "webp": {"quality": 80, "method": 6},
+        "webp_lossless": {"quality": 100, "method": 6},
+        "avif": {"quality": 60, "speed": 4},
+        "pdf": {"quality": 75, "optimize": True},
+    },
+}
+
+FORMAT_ALIASES = {"jpg": "jpeg"}
+
+MIMETYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "pdf": "application/pdf",
+    "zip": "application/zip",
+}
+
+EXTENSIONS = {"jpeg": "jpg"}
+
+IMAGE_FORMATS = {"png", "jpeg", "webp", "avif"}
+LOSSLESS_FORMATS = ("png", "webp")
+
+# Upper bound on pages per web request; PDF output defaults to it
+MAX_PAGES = 50
+
+# Dominant colors are pinned exactly in the palette so flat areas never shift
+PINNED_COLORS = 8
+
+# libavif speeds below this take minutes per frame; effort 7-10 all map here
+MIN_AVIF_SPEED = 3
+# Web requests stop at AVIF speed 6: slower speeds cost 5-25 s of CPU per page
+WEB_MAX_AVIF_EFFORT = 4
+
+
+class EncodeResult:
+    """What an encode produced and how long it took"""
+
+    def __init__(self, fmt, preset, size, seconds, data=None, pages=1):
+        self.format = fmt
+        self.preset = preset
+        self.size = size
+        self.seconds = seconds
+        self.data = data
+        self.pages = pages
+
+    @property
+    def mimetype(self):
+        return MIMETYPES.get(self.format, "application/octet-stream")
+
+    def summary(self):
+        pages = f", {self.pages} pages" if self.pages > 1 else ""
+        return f"{self.format} [{self.preset}] {self.size / 1024:.1f} KB{pages} in {self.seconds * 1000:.1f} ms"
+
+
+def normalize_format(fmt):
+    fmt = fmt.lower().lstrip(".")
+    return FORMAT_ALIASES.get(fmt, fmt)
+
+
+def extension_for(fmt):
+    """Return the file extension to use for an output format"""
+    fmt = normalize_format(fmt)
+    return EXTENSIONS.get(fmt, fmt)
+
+
+def format_available(fmt):
+    """Return True if this Pillow build can write fmt"""
+    fmt = normalize_format(fmt)
+    if fmt in ("webp", "avif"):
+        return features.check(fmt)
+    return fmt in MIMETYPES
+
+
+def get_preset(name):
+    """Return the settings for a preset, raising ValueError if unknown"""
+    try:
+        return PRESETS[(name or DEFAULT_PRESET).lower()]
+    except KeyError:
+        raise ValueError(f"Unknown preset: {name} (use {', '.join(PRESETS)})")
+
+
+def quantize(img, colors):
+    """Reduce img to an adaptive palette, keeping its dominant colors exact"""
+    quantized = img.quantize(colors=colors, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+
+    dominant = img.getcolors(1 << 16)
+    if dominant is None:
+        # Photographic content; the octree palette is the best we can do cheaply
+        return quantized
+
+    palette = quantized.getpalette()[:colors * 3]
+    entries = [tuple(palette[i:i + 3]) for i in range(0, len(palette), 3)]
+    octree = list(entries)
+    free = set(range(len(entries)))
+    bands = None
+    for _, rgb in sorted(dominant, reverse=True)[:PINNED_COLORS]:
+        if not free:
+            break
+        # The octree put this color's pixels on its nearest entry; if a more
+        # dominant color already pinned that entry, take the nearest free one
+        # and move the pixels there
+        home = _nearest(octree, range(len(octree)), rgb)
+        index = home if home in free else _nearest(entries, free, rgb)
+        entries[index] = rgb
+        free.discard(index)
+        if index != home:
+            bands = bands or img.split()
+            quantized.paste(index, mask=_color_mask(bands, rgb))
+    quantized.putpalette([value for rgb in entries for value in rgb])
+    return quantized
+
+
+def _nearest(entries, indices, rgb):
+    return min(indices, key=lambda i: sum((a - b) ** 2 for a, b in zip(entries[i], rgb)))
+
+
+def _color_mask(bands, rgb):
+    """L mask of the pixels that are exactly rgb"""
+    r, g, b = (band.point(lambda v, c=c: 255 if v == c else 0) for band, c in zip(bands, rgb))
+    return ImageChops.darker(ImageChops.darker(r, g), b)
+
+
+def _stripped(img):
+    """Return img without ancillary metadata (ICC, EXIF, text chunks)"""
+    if not img.info:
+        return img
+    img = img.copy()
+    img.info = {}
+    return img
+
+
+def _webp_params(settings, lossless, effort):
+    if lossless:
+        params = dict(settings["webp_lossless"], lossless=True)
+        if effort is not None:
+            params["quality"] = effort * 10
+    else:
+        params = dict(settings["webp"])
+    if effort is not None:
+        params["method"] = round(effort * 6 / 10)
+    return params
+
+
+def _avif_params(settings, effort):
+    """AVIF speed is 10 - effort, but never below MIN_AVIF_SPEED"""
+    params = dict(settings["avif"])
+    if effort is not None:
+        params["speed"] = max(10 - effort, MIN_AVIF_SPEED)
+    return params
+
+
+def _save(img, fp, fmt, settings, lossless=False, effort=None):
+    if fmt == "png":
+        if settings.get("palette") and img.mode == "RGB" and not lossless:
+            img = quantize(img, settings["palette"])
+        img.save(fp, "PNG", **settings["png"])
+    elif fmt == "jpeg":
+        img.convert("RGB").save(fp, "JPEG", **settings["jpeg"])
+    elif fmt == "webp":
+        img.convert("RGB").save(fp, "WEBP", **_webp_params(settings, lossless, effort))
+    elif fmt == "avif":
+        if lossless:
+            raise ValueError("Lossless output is supported for png and webp, not avif")
+        img.convert("RGB").save(fp, "AVIF", **_avif_params(settings, effort))
+    elif fmt == "pdf":
+        with PdfWriter(fp, jpeg=settings["pdf"]) as pdf:
+            pdf.add_image_page(img)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def encode(img, fmt, preset=DEFAULT_PRESET, fp=None, lossless=False, effort=None):
+    """Encode img to fp (path or file object), or to bytes if fp is None
+
+    lossless skips PNG palette quantization and selects lossless WebP;
+    effort (0 = fastest .. 10 = smallest) tunes WebP/AVIF encoder speed.
+    """
+    fmt = normalize_format(fmt)
+    settings = get_preset(preset)
+    if not format_available(fmt):
+        raise ValueError(f"This Pillow build cannot write {fmt.upper()} (pip3 install -U Pillow)")
+    if effort is not None and not 0 <= effort <= 10:
+        raise ValueError("Effort must be between 0 and 10")
+    img = _stripped(img)
+
+    buffer = io.BytesIO() if fp is None else None
+    start = time.perf_counter()
+    _save(img, buffer if fp is None else fp, fmt, settings, lossless, effort)
+    seconds = time.perf_counter() - start
+
+    if buffer is not None:
+        data = buffer.getvalue()
+        return EncodeResult(fmt, preset, len(data), seconds, data)
+
+    size = fp.tell() if hasattr(fp, "tell") else os.path.getsize(fp)
+    return EncodeResult(fmt, preset, size, seconds)
+
+
+def parse_formats(spec):
+    """Parse "png,jpg,pdf" into a list of formats, raising ValueError"""
+    formats = []
+    for token in (spec or "").split(","):
+        fmt = normalize_format(token.strip())
+        if not fmt:
+            continue
+        if fmt not in MIMETYPES or fmt == "zip":
+            raise ValueError(f"Unknown format: {token.strip()} (use png, jpg, webp, avif, pdf)")
+        if not format_available(fmt):
+            raise ValueError(f"This Pillow build cannot write {fmt.upper()} (pip3 install -U Pillow)")
+        if fmt not in formats:
+            formats.append(fmt)
+    if not formats:
+        raise ValueError("No formats given (use e.g. png,jpg,pdf)")
+    return formats
+
+
+def encode_formats(img, targets, preset=DEFAULT_PRESET, lossless=False, effort=None, executor=None):
+    """Encode img once per (fmt, fp) target, concurrently
+
+    Pillow releases the GIL inside its encoders, so the formats overlap on a
+    thread pool. img is only read, and lossless applies to the targets that
+    support it (PNG, WebP). Returns the EncodeResults in target order.
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(targets) or 1) as pool:
+            return encode_formats(img, targets, preset, lossless, effort, pool)
+    futures = [
+        executor.submit(encode, img, fmt, preset, fp, lossless and fmt in LOSSLESS_FORMATS, effort)
+        for fmt, fp in targets
+    ]
+    return [future.result() for future in futures]
+
+
+def encode_pages(pages, fmt, preset=DEFAULT_PRESET, fp=None):
+    """Encode an iterable of page images into one multi-page PDF
+
+    Pages are consumed one at a time and written immediately, so pages can
+    come from a generator that reuses a single canvas.
+    """
+    fmt = normalize_format(fmt)
+    if fmt != "pdf":
+        raise ValueError(f"Multi-page output is only supported for PDF, not {fmt}")
+    settings = get_preset(preset)
+
+    buffer = io.BytesIO() if fp is None else None
+    start = time.perf_counter()
+    with PdfWriter(buffer if fp is None else fp, jpeg=settings["pdf"]) as pdf:
+        for page in pages:
+            pdf.add_image_page(page)
+    seconds = time.perf_counter() - start
+
+    data = buffer.getvalue() if buffer is not None else None
+    return EncodeResult(fmt, preset, pdf.size, seconds, data, pdf.page_count)
+
+
+def encode_zip(named_images, fmt, preset=DEFAULT_PRESET, fp=None, lossless=False, effort=None):
+    """Encode (name, image) pairs into a zip archive, one entry at a time
+
+    Images are already compressed, so entries are stored rather than deflated.
+    """
+    buffer = io.BytesIO() if fp is None else None
+    size = seconds = count = 0
+    with zipfile.ZipFile(buffer if fp is None else fp, "w", zipfile.ZIP_STORED) as archive:
+        for name, img in named_images:
+            result = encode(img, fmt, preset, lossless=lossless, effort=effort)
+            archive.writestr(f"{name}.{extension_for(fmt)}", result.data)
+            size += result.size
+            seconds += result.seconds
+            count += 1
+    data = buffer.getvalue() if buffer is not None else None
+    return EncodeResult(normalize_format(fmt), preset, size, seconds, data, count)
+
+
+COMPARE_FORMATS = (
+    ("png", False),
+    ("jpeg", False),
+    ("webp", False),
+    ("webp", True),
+    ("avif", False),
+)
+
+
+def options_from_form(form, fmt=None):
+    """Read preset/lossless/effort from a request form, raising ValueError
+
+    lossless is only accepted for LOSSLESS_FORMATS, and for AVIF (fmt)
+    effort is capped at WEB_MAX_AVIF_EFFORT.
+    """
+    preset = form.get('preset', DEFAULT_PRESET)
+    get_preset(preset)
+    lossless = form.get('lossless', '').lower() in ('1', 'true', 'yes', 'on')
+    effort = form.get('effort')
+    if effort in (None, ''):
+        effort = None
+    elif effort.isdigit() and int(effort) <= 10:
+        effort = int(effort)
+    else:
+        raise ValueError(f"Invalid effort: {effort} (use 0-10)")
+    if lossless and fmt is not None and normalize_format(fmt) not in LOSSLESS_FORMATS:
+        raise ValueError(f"Lossless output is supported for png and webp, not {normalize_format(fmt)}")
+    if effort is not None and fmt is not None and normalize_format(fmt) == "avif":
+        effort = min(effort, WEB_MAX_AVIF_EFFORT)
+    return preset, lossless, effort
+
+
+def max_pages_from_form(form, fmt):
+    """Read max_pages from a request form, raising ValueError
+
+    PDF defaults to every page (up to MAX_PAGES); image formats default to
+    the first page, and ask for more with max_pages to get a zip of pages.
+    """
+    value = form.get('max_pages') or form.get('pages')
+    if value in (None, ''):
+        return MAX_PAGES if normalize_format(fmt) == 'pdf' else 1
+    if not value.isdigit() or not 1 <= int(value) <= MAX_PAGES:
+        raise ValueError(f"Invalid max_pages: {value} (use 1-{MAX_PAGES})")
+    return int(value)
+
+
+def compare_presets(img, formats=COMPARE_FORMATS, presets=None):
+    """Encode img with every preset/format pair this build supports"""
+    results = []
+    for fmt, lossless in formats:
+        if not format_available(fmt):
+            continue
+        for preset in presets or PRESETS:
+            result = encode(img, fmt, preset, lossless=lossless)
+            result.data = None
+            if lossless and fmt != "png":
+                result.format = f"{fmt}-ll"
+            results.append(result)
+    return results
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("\nUsage: python3 encoders.py <image>\n")
+        return
+
+    img = Image.open(sys.argv[1])
+    img.load()
+    print(f"\n📦 ENCODER PRESETS — {sys.argv[1]} ({img.width}x{img.height})")
+    print("=" * 50)
+    for result in compare_presets(img.convert("RGB")):
+        print(f"  {result.format:8s} {result.preset:9s} {result.size / 1024:9.1f} KB  {result.seconds * 1000:8.1f} ms")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Extraction Cache
+Remembers the text extracted from PDF, DOCX and HTML inputs, so converting
+the same document again (another style, format or template) skips the
+parse. Entries live in one SQLite file under the cache directory and are
+keyed by a SHA-256 of the input bytes plus the extractor's version string,
+so an edited file or an upgraded extractor never gets stale text.
+
+A budgeted read (see text_budget) stores the text it got and how far it
+went; later reads with the same or a smaller budget are served from it,
+and a bigger budget or a whole-document read extracts again and replaces
+it. The file is bounded by INFOFRAME_EXTRACT_CACHE_MB (default 256; 0
+turns the cache off), evicting the least recently used entries first.
+The CLI, both web apps and the desktop app share the same file.
+
+Usage:
+    from extract_cache import extract_cache
+    text = extract_cache.text(path, EXTRACTOR_VERSION,
+                              lambda: extract_pdf_text(path, max_chars), max_chars)
+
+    python3 extract_cache.py stats
+    python3 extract_cache.py clear
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from contextlib import closing
+from pathlib import Path
+
+from cache_paths import cache_dir
+from text_budget import clip_text
+
+DEFAULT_LIMIT_MB = 256
+HASH_CHUNK = 1 << 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extracts (
+    key TEXT PRIMARY KEY,
+    chars INTEGER,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL,
+    text BLOB NOT NULL
+)
+"""
+
+
+def _limit_bytes():
+    try:
+        megabytes = float(os.environ.get("INFOFRAME_EXTRACT_CACHE_MB", DEFAULT_LIMIT_MB))
+    except ValueError:
+        megabytes = DEFAULT_LIMIT_MB
+    return int(megabytes * 1024 * 1024)
+
+
+def content_hash(source):
+    """SHA-256 of a path, bytes or binary file object (rewound afterwards)"""
+    digest = hashlib.sha256()
+    if isinstance(source, bytes):
+        digest.update(source)
+    elif hasattr(source, "read"):
+        source.seek(0)
+        for chunk in iter(lambda: source.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+        source.seek(0)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractCache:
+    """SQLite store of extracted text, LRU-bounded by compressed size"""
+
+    def __init__(self, path=None, limit=None):
+        self._path = Path(path) if path else None
+        self.limit = _limit_bytes() if limit is None else limit
+        self._ready = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = cache_dir() / "extract_cache.sqlite"
+        return self._path
+
+    @property
+    def enabled(self):
+        return self.limit > 0
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            connection.execute(SCHEMA)
+            connection.commit()
+            self._ready = True
+        return connection
+
+    def get(self, key, max_chars=None):
+        """Cached text covering max_chars characters (None = whole document), or None"""
+        with closing(self._connect()) as db:
+            row = db.execute("SELECT chars, text FROM extracts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            chars, blob = row
+            if chars is not None and (max_chars is None or max_chars > chars):
+                return None
+            with db:
+                db.execute("UPDATE extracts SET used = ? WHERE key = ?", (time.time(), key))
+        text = zlib.decompress(blob).decode("utf-8")
+        return clip_text(text, max_chars)
+
+    def put(self, key, text, max_chars=None):
+        """Store text read with budget max_chars, evicting old entries past the limit"""
+        blob = zlib.compress(text.encode("utf-8"), 1)
+        if len(blob) > self.limit:
+            return
+        with closing(self._connect()) as db, db:
+            db.execute("INSERT OR REPLACE INTO extracts VALUES (?, ?, ?, ?, ?)",
+                       (key, max_chars, len(blob), time.time(), blob))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM extracts").fetchone()[0]
+            evicted = 0
+            if total > self.limit:
+                for old_key, size in db.execute("SELECT key, size FROM extracts ORDER BY used").fetchall():
+                    if total <= self.limit:
+                        break
+                    db.execute("DELETE FROM extracts WHERE key = ?", (old_key,))
+                    total -= size
+                    evicted += 1
+        with self._lock:
+            self.stores += 1
+            self.evictions += evicted
+
+    def text(self, source, version, extract, max_chars=None):
+        """Return extract()'s text for source, from the cache when possible
+
+        extract() must read source with budget max_chars. A cache that
+        cannot be opened or written is skipped, never an error.
+        """
+        if not self.enabled:
+            return extract()
+        try:
+            key = f"{content_hash(source)}:{version}"
+            text = self.get(key, max_chars)
+        except (OSError, sqlite3.Error):
+            with self._lock:
+                self.errors += 1
+            return extract()
+
+        with self._lock:
+            if text is not None:
+                self.hits += 1
+                return text
+            self.misses += 1
+
+        text = extract()
+        if text is not None:
+            try:
+                self.put(key, text, max_chars)
+            except (OSError, sqlite3.Error):
+                with self._lock:
+                    self.errors += 1
+        return text
+
+    def stats(self):
+        entries = size = 0
+        if self.enabled:
+            try:
+                with closing(self._connect()) as db:
+                    entries, size = db.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extracts").fetchone()
+            except (OSError, sqlite3.Error):
+                pass
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "entries": entries,
+                "bytes": size,
+                "limit_bytes": self.limit,
+            }
+
+    def clear(self):
+        """Delete every entry and reset the counters"""
+        with closing(self._connect()) as db:
+            with db:
+                db.execute("DELETE FROM extracts")
+            db.execute("VACUUM")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.stores = 0
+            self.evictions = 0
+            self.errors = 0
+
+
+extract_cache = ExtractCache()
+
+
+def extract_stats():
+    return extract_cache.stats()
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command not in ("stats", "clear"):
+        print("\nUsage: python3 extract_cache.py stats|clear\n")
+        return
+
+    print("\n🗃️  EXTRACTION CACHE")
+    print("=" * 50)
+    print(f"  {extract_cache.path}")
+    if command == "clear":
+        extract_cache.clear()
+        print("  ✅ Cleared\n")
+        return
+    stats = extract_stats()
+    print(f"  {stats['entries']} entries, {stats['bytes'] / 1024 / 1024:.1f} MB "
+          f"of {stats['limit_bytes'] / 1024 / 1024:.0f} MB\n")
+
+
+if __name__ == "__main__":
+    main()
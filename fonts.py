@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Font Registry
+Loads each (face, size) once per process and shares it between renders;
+the MAX_FONTS most recently used stay loaded.
+
+Faces are resolved through a persistent index of the system font directories,
+so the renderers get a real scalable font on macOS, Linux and Windows.
+The index is rebuilt only when a font directory changes, or when the font
+file about to be used was replaced in place.
+
+Usage:
+    from fonts import get_font, DEFAULT_FACE
+    title_font = get_font(DEFAULT_FACE, 60)
+
+    python3 fonts.py            # Show the resolved default font
+    python3 fonts.py --rebuild  # Force a rescan of the font directories
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from PIL import ImageFont
+
+from cache_paths import cache_dir
+
+# None resolves through FALLBACK_CHAIN
+DEFAULT_FACE = None
+
+# Override with INFOFRAME_FONTS="Inter,Arial,DejaVu Sans"
+FALLBACK_CHAIN = [
+    "Helvetica",
+    "Helvetica Neue",
+    "Arial",
+    "Liberation Sans",
+    "DejaVu Sans",
+    "Noto Sans",
+    "FreeSans",
+]
+
+FONT_DIRS = [
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    "~/Library/Fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/.fonts",
+    "~/.local/share/fonts",
+]
+if os.name == "nt" and os.environ.get("WINDIR"):
+    FONT_DIRS.append(os.path.join(os.environ["WINDIR"], "Fonts"))
+
+FONT_EXTENSIONS = {".ttf", ".otf", ".ttc", ".otc"}
+REGULAR_STYLES = {"regular", "book", "roman", "normal", "medium"}
+INDEX_VERSION = 1
+MAX_FONTS = 128
+MAX_COLLECTION_FACES = 32
+
+
+def fallback_chain():
+    """Return the configured family fallback chain"""
+    configured = os.environ.get("INFOFRAME_FONTS")
+    if configured:
+        return [name.strip() for name in configured.split(",") if name.strip()]
+    return list(FALLBACK_CHAIN)
+
+
+def _font_dirs():
+    return [Path(d).expanduser() for d in FONT_DIRS]
+
+
+def _scan_dirs():
+    """Return {directory: mtime} for every font directory and subdirectory"""
+    dirs = {}
+    for root in _font_dirs():
+        if not root.is_dir():
+            continue
+        for current, subdirs, _ in os.walk(root):
+            try:
+                dirs[current] = os.stat(current).st_mtime
+            except OSError:
+                continue
+    return dirs
+
+
+def _read_faces(path):
+    """Return one entry per face in a font file (collections hold several)"""
+    faces = []
+    mtime = os.stat(path).st_mtime
+    for index in range(MAX_COLLECTION_FACES):
+        try:
+            font = ImageFont.truetype(path, 12, index=index)
+        except (OSError, ValueError):
+            break
+        family, style = font.getname()
+        faces.append({
+            "family": family or Path(path).stem,
+            "style": style or "Regular",
+            "path": path,
+            "index": index,
+            "mtime": mtime,
+        })
+        if Path(path).suffix.lower() not in (".ttc", ".otc"):
+            break
+    return faces
+
+
+def _is_current(entry):
+    """True if the indexed font file is unchanged since it was read"""
+    try:
+        return os.stat(entry["path"]).st_mtime == entry["mtime"]
+    except OSError:
+        return False
+
+
+class FontIndex:
+    """On-disk index of installed fonts: family, style, path and mtime"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else cache_dir() / "font_index.json"
+        self.fonts = []
+        self.dirs = {}
+        self._families = {}
+        self._resolved = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self):
+        """Load the saved index, rebuilding it if a font directory changed"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if not self._load_saved():
+                self._build()
+                self._save()
+            self._loaded = True
+
+    def _load_saved(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("version") != INDEX_VERSION:
+            return False
+        if data.get("dirs") != _scan_dirs():
+            return False
+
+        self.dirs = data["dirs"]
+        self._set_fonts(data.get("fonts", []))
+        return True
+
+    def _build(self):
+        self.dirs = _scan_dirs()
+        fonts = []
+        for directory in sorted(self.dirs):
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            for name in names:
+                if Path(name).suffix.lower() not in FONT_EXTENSIONS:
+                    continue
+                try:
+                    fonts.extend(_read_faces(os.path.join(directory, name)))
+                except OSError:
+                    continue
+        self._set_fonts(fonts)
+
+    def _save(self):
+        data = {"version": INDEX_VERSION, "dirs": self.dirs, "fonts": self.fonts}
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # An unwritable cache dir only costs a rescan next time
+            pass
+
+    def _set_fonts(self, fonts):
+        self.fonts = fonts
+        self._families = {}
+        for entry in fonts:
+            styles = self._families.setdefault(entry["family"].lower(), {})
+            styles.setdefault(entry["style"].lower(), entry)
+        self._resolved = {}
+
+    def rebuild(self):
+        """Rescan the font directories and save a fresh index"""
+        with self._lock:
+            self._build()
+            self._save()
+            self._loaded = True
+
+    def find(self, family, style="Regular"):
+        """Return the entry for a family/style, or None if not installed"""
+        self.ensure_loaded()
+        styles = self._families.get(family.lower())
+        if not styles:
+            return None
+        style = style.lower()
+        if style in styles:
+            return styles[style]
+        if style in REGULAR_STYLES:
+            for name in REGULAR_STYLES:
+                if name in styles:
+                    return styles[name]
+        return None
+
+    def resolve(self, family=None, style="Regular", _rescanned=False):
+        """Return (path, index) for the first installed family in the chain
+
+        A font file replaced in place (its mtime no longer matches the index)
+        triggers one rescan before it is used.
+        """
+        key = (family, style)
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            return resolved
+
+        chain = fallback_chain()
+        if family:
+            chain.insert(0, family)
+        entry = None
+        for name in chain:
+            entry = self.find(name, style)
+            if entry:
+                break
+        if entry is None:
+            entry = self._any_regular()
+        if entry is not None and not _rescanned and not _is_current(entry):
+            self.rebuild()
+            return self.resolve(family, style, _rescanned=True)
+
+        resolved = (entry["path"], entry["index"]) if entry else (None, 0)
+        self._resolved[key] = resolved
+        return resolved
+
+    def _any_regular(self):
+        self.ensure_loaded()
+        for entry in self.fonts:
+            if entry["style"].lower() in REGULAR_STYLES:
+                return entry
+        return self.fonts[0] if self.fonts else None
+
+
+font_index = FontIndex()
+
+
+class FontRegistry:
+    """Thread-safe LRU of loaded fonts keyed by (face, size)"""
+
+    def __init__(self, index=None, maxsize=MAX_FONTS):
+        self.index = index or font_index
+        self.maxsize = maxsize
+        self._fonts = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, face, size):
+        """Return the font for (face, size), loading it on first use"""
+        key = (face, size)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+            font = self._load(face, size)
+            self._fonts[key] = font
+            while len(self._fonts) > self.maxsize:
+                self._fonts.popitem(last=False)
+            return font
+
+    def _load(self, face, size):
+        path, index = self._locate(face)
+        if path:
+            try:
+                return ImageFont.truetype(path, size, index=index)
+            except (OSError, ValueError):
+                pass
+        return self._load_default(size)
+
+    def _locate(self, face):
+        """Map a face (None, family name or file path) to (path, index)"""
+        if face and (os.sep in face or Path(face).suffix.lower() in FONT_EXTENSIONS):
+            if os.path.exists(face):
+                return face, 0
+            # A missing hard-coded path falls back to the default chain
+            return self.index.resolve()
+        return self.index.resolve(face)
+
+    def _load_default(self, size):
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:
+            # Pillow < 10.1 has no sized default font
+            return ImageFont.load_default()
+
+    def stats(self):
+        """Return hit/miss counters and the number of loaded fonts"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "loaded": len(self._fonts),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def clear(self):
+        """Drop every loaded font and reset the counters"""
+        with self._lock:
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+registry = FontRegistry()
+
+
+def get_font(face, size):
+    """Return a shared font from the process-wide registry"""
+    return registry.get(face, size)
+
+
+def font_stats():
+    """Return the process-wide registry counters"""
+    return registry.stats()
+
+
+def main():
+    print("\n🔤 FONT INDEX")
+    print("=" * 50)
+
+    if "--rebuild" in sys.argv:
+        font_index.rebuild()
+        print("🔄 Index rebuilt")
+    else:
+        font_index.ensure_loaded()
+
+    path, index = font_index.resolve()
+    print(f"📁 Index: {font_index.path}")
+    print(f"📦 Fonts: {len(font_index.fonts)} faces in {len(font_index.dirs)} directories")
+    print(f"🔗 Chain: {', '.join(fallback_chain())}")
+    if path:
+        print(f"✅ Default: {path} (face {index})\n")
+    else:
+        print("⚠️  No scalable fonts found; using Pillow's built-in font\n")
+
+
+if __name__ == "__main__":
+    main()
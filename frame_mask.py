@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Mask Renderer
+Styles differ only in color, so the body text is laid out and rasterized
+once into a style-independent coverage mask (L mode) and each style is a
+single paste of the text color through that mask onto the cached chrome.
+
+Full-size canvases come from the canvas pool; callers that are done with a
+frame (after encoding it) hand it back with release_canvas().
+
+render_pages() turns a whole document into pages lazily: each page is laid
+out, rasterized and colorized only when the consumer asks for it.
+
+Every function takes a layout template name (see templates.py); the body
+box, font and line spacing come from its compiled plan.
+
+Usage:
+    from frame_mask import render_mask, colorize, render_pages
+    mask = render_mask(text)
+    img = colorize(mask, "modern", get_colors("modern"))
+
+    for page in render_pages(text, "modern", get_colors("modern"), template="compact"):
+        page.save(...)
+"""
+
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+from glyph_atlas import draw_text
+from layout import layout_text, paginate
+from chrome import base_canvas, chrome_geometry, FRAME_WIDTH, FRAME_HEIGHT
+from templates import get_plan, DEFAULT_TEMPLATE
+from canvas_pool import acquire_canvas, release_canvas
+
+
+class FrameMask:
+    """Style-independent coverage of one info-frame"""
+
+    def __init__(self, size, text_mask, origin, geometry, scale=1.0, template=DEFAULT_TEMPLATE):
+        self.size = size
+        self.text_mask = text_mask    # L-mode glyph coverage, or None if blank
+        self.origin = origin          # Top-left of text_mask on the canvas
+        self.geometry = geometry      # [(color role, box)] for the bars
+        self.scale = scale            # Resolution relative to the 1x layout
+        self.template = template      # Layout template the chrome comes from
+
+
+def body_box(width=FRAME_WIDTH, height=FRAME_HEIGHT, template=DEFAULT_TEMPLATE):
+    """Return the (left, top, right, bottom) box the body text flows into"""
+    return get_plan(template).body_box(width, height)
+
+
+def layout_body(text, width=FRAME_WIDTH, height=FRAME_HEIGHT, template=DEFAULT_TEMPLATE):
+    """Lay out text into the template's body box"""
+    plan = get_plan(template)
+    return layout_text(text, plan.body_font, plan.body_box(width, height), plan.line_height)
+
+
+def build_mask(text, width=FRAME_WIDTH, height=FRAME_HEIGHT, template=DEFAULT_TEMPLATE):
+    """Lay out and rasterize the body text into a coverage mask"""
+    plan = get_plan(template)
+    layout = layout_body(text, width, height, template)
+    return mask_from_layout(layout, plan.body_font, width, height, template=template)
+
+
+def mask_from_layout(layout, body_font, width=FRAME_WIDTH, height=FRAME_HEIGHT, scale=1.0,
+                     template=DEFAULT_TEMPLATE, antialias=True):
+    """Rasterize already placed lines into a coverage mask
+
+    layout is in 1x pixels of a width x height frame. With scale != 1 the
+    lines are drawn natively with body_font (which should be the body font
+    at the scaled size) onto a proportionally larger or smaller canvas.
+    antialias=False draws 1-bit glyphs, for drafts.
+    """
+    width, height = round(width * scale), round(height * scale)
+    top = round(get_plan(template).body_top * scale)
+    mask = acquire_canvas('L', (width, height - top))
+    mask.paste(0, (0, 0) + mask.size)
+    draw = ImageDraw.Draw(mask)
+
+    for line in layout.lines:
+        if line.text:
+            xy = (line.x * scale, round(line.y * scale) - top)
+            draw_text(draw, xy, line.text, fill=255, font=body_font, antialias=antialias)
+
+    # Keep only the inked area so colorizing touches as few pixels as possible
+    bbox = mask.getbbox()
+    text_mask = mask.crop(bbox) if bbox is not None else None
+    release_canvas(mask)
+    geometry = chrome_geometry(width, height, scale, template)
+    if text_mask is None:
+        return FrameMask((width, height), None, (0, top), geometry, scale, template)
+    origin = (bbox[0], bbox[1] + top)
+    return FrameMask((width, height), text_mask, origin, geometry, scale, template)
+
+
+class MaskCache:
+    """Small LRU of recent masks so restyling the same text skips layout"""
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self._masks = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, width=FRAME_WIDTH, height=FRAME_HEIGHT, template=DEFAULT_TEMPLATE):
+        key = (text, width, height, template)
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                self.hits += 1
+                return mask
+            self.misses += 1
+
+        mask = build_mask(text, width, height, template)
+
+        with self._lock:
+            self._masks[key] = mask
+            while len(self._masks) > self.maxsize:
+                self._masks.popitem(last=False)
+        return mask
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cached": len(self._masks)}
+
+    def clear(self):
+        with self._lock:
+            self._masks.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+mask_cache = MaskCache()
+
+
+def render_mask(text, width=FRAME_WIDTH, height=FRAME_HEIGHT, template=DEFAULT_TEMPLATE):
+    """Return the (cached) coverage mask for text"""
+    return mask_cache.get(text, width, height, template)
+
+
+_luts = {}
+
+
+def blend_luts(bg, fg):
+    """Per-channel lookup tables mapping coverage 0..255 to bg..fg"""
+    key = (bg, fg)
+    luts = _luts.get(key)
+    if luts is None:
+        luts = [[b + ((f - b) * v + 127) // 255 for v in range(256)] for b, f in zip(bg, fg)]
+        _luts[key] = luts
+    return luts
+
+
+def colorize(frame_mask, style, colors):
+    """Composite a mask onto the style's chrome and return a pooled RGB image"""
+    width, height = frame_mask.size
+    img = base_canvas(style, colors, width, height, into=acquire_canvas('RGB', (width, height)),
+                      scale=frame_mask.scale, template=frame_mask.template)
+    if frame_mask.text_mask is not None:
+        # The body sits on plain background, so blending is a per-channel
+        # lookup, which is much cheaper than a masked paste
+        luts = blend_luts(tuple(colors["bg"]), tuple(colors["text"]))
+        bands = [frame_mask.text_mask.point(lut) for lut in luts]
+        img.paste(Image.merge('RGB', bands), frame_mask.origin)
+    return img
+
+
+def paginate_body(text, width=FRAME_WIDTH, height=FRAME_HEIGHT, template=DEFAULT_TEMPLATE):
+    """Yield the layout of each page of text in the template's body box"""
+    plan = get_plan(template)
+    return paginate(text, plan.body_font, plan.body_box(width, height), plan.line_height)
+
+
+def page_masks(text, width=FRAME_WIDTH, height=FRAME_HEIGHT, max_pages=None, template=DEFAULT_TEMPLATE):
+    """Yield the coverage mask of each page, laying out one page at a time"""
+    body_font = get_plan(template).body_font
+    for number, page in enumerate(paginate_body(text, width, height, template), 1):
+        yield mask_from_layout(page, body_font, width, height, template=template)
+        if max_pages is not None and number >= max_pages:
+            return
+
+
+def count_pages(text, width=FRAME_WIDTH, height=FRAME_HEIGHT, template=DEFAULT_TEMPLATE):
+    """Return how many pages text needs, without rasterizing any of them"""
+    return sum(1 for _ in paginate_body(text, width, height, template))
+
+
+def render_pages(text, style, colors, max_pages=None, width=FRAME_WIDTH, height=FRAME_HEIGHT,
+                 template=DEFAULT_TEMPLATE):
+    """Yield one colorized page image at a time
+
+    Each page is a pooled canvas that is recycled for the next page, so it
+    is only valid until the next one is requested; copy() it to keep it.
+    """
+    for frame_mask in page_masks(text, width, height, max_pages, template):
+        img = colorize(frame_mask, style, colors)
+        yield img
+        release_canvas(img)
+
+
+def render_styles(text, styles, colors_for, template=DEFAULT_TEMPLATE):
+    """Render text in several styles from a single layout pass"""
+    frame_mask = render_mask(text, template=template)
+    return {style: colorize(frame_mask, style, colors_for(style)) for style in styles}
+
+
+def mask_stats():
+    return mask_cache.stats()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Glyph Atlas
+Rasterizes each (font, size, glyph) once into a cached alpha mask and draws
+text by blitting those masks, keeping FreeType advances and pair kerning.
+draw.text() re-rasterizes every glyph of every line on every call; body text
+uses a small alphabet at one or two sizes, so the atlas hit rate is very high.
+
+Draft previews can ask for an aliased atlas (antialias=False), whose glyphs
+are FreeType's 1-bit renderings. The MAX_ATLASES most recently used atlases
+are kept.
+
+Usage:
+    from glyph_atlas import draw_text
+    draw_text(draw, (80, 240), "Hello", fill=(0, 0, 0), font=body_font)
+"""
+
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFont
+
+from layout import advance_table
+
+MAX_ATLASES = 32
+
+
+class GlyphAtlas:
+    """Cached glyph masks, advances and kerning for one FreeType font"""
+
+    def __init__(self, font, antialias=True):
+        self.font = font
+        self.antialias = antialias
+        self.advances = advance_table(font)
+        self._glyphs = {}
+
+    def glyph(self, ch):
+        """Return (mask, dx, dy, advance) for ch, rasterizing it on first use"""
+        entry = self._glyphs.get(ch)
+        if entry is None:
+            entry = self._rasterize(ch)
+            self._glyphs[ch] = entry
+        return entry
+
+    def _rasterize(self, ch):
+        left, top, right, bottom = self.font.getbbox(ch)
+        advance = self.advances.advance(ch)
+        if right <= left or bottom <= top:
+            # Whitespace and other blank glyphs only advance the pen
+            return None, 0, 0, advance
+        mask = Image.new('L', (right - left, bottom - top), 0)
+        draw = ImageDraw.Draw(mask)
+        if not self.antialias:
+            draw.fontmode = "1"
+        draw.text((-left, -top), ch, fill=255, font=self.font)
+        return mask, left, top, advance
+
+    def draw(self, draw, xy, text, fill):
+        """Blit text onto draw at xy (left/ascender anchor, like draw.text)"""
+        x, y = xy
+        x = float(x)
+        kerning = self.advances.kerning
+        prev = None
+        for ch in text:
+            mask, dx, dy, advance = self.glyph(ch)
+            if prev is not None:
+                x += kerning(prev, ch)
+            if mask is not None:
+                draw.bitmap((round(x + dx), y + dy), mask, fill=fill)
+            x += advance
+            prev = ch
+        return x
+
+    def stats(self):
+        return {"glyphs": len(self._glyphs), "pairs": self.advances.stats()["pairs"]}
+
+
+_atlases = OrderedDict()
+_lock = threading.Lock()
+
+
+def _font_key(font):
+    return (font.path, font.size, font.index, font.layout_engine)
+
+
+def atlas_for(font, antialias=True):
+    """Return the shared atlas for a FreeType font, or None for bitmap fonts"""
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        return None
+    key = _font_key(font) + (antialias,)
+    with _lock:
+        atlas = _atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(font, antialias)
+            _atlases[key] = atlas
+            while len(_atlases) > MAX_ATLASES:
+                _atlases.popitem(last=False)
+        else:
+            _atlases.move_to_end(key)
+    return atlas
+
+
+def draw_text(draw, xy, text, fill, font, antialias=True):
+    """Drop-in replacement for draw.text() for left-anchored body lines"""
+    atlas = atlas_for(font, antialias)
+    if atlas is None:
+        draw.text(xy, text, fill=fill, font=font)
+        return
+    atlas.draw(draw, xy, text, fill)
+
+
+def atlas_stats():
+    with _lock:
+        atlases = list(_atlases.values())
+    return {
+        "fonts": len(atlases),
+        "glyphs": sum(a.stats()["glyphs"] for a in atlases),
+        "pairs": sum(a.stats()["pairs"] for a in atlases),
+    }
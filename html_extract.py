@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Info-Frame HTML Text Extraction
+Extracts the text of an HTML file or upload a chunk at a time. The charset
+is sniffed from the first chunk (byte order mark, then <meta charset>) and
+the rest is decoded incrementally, so multi-megabyte pages are never held
+in memory. script and style contents are dropped.
+
+Pages are parsed with lxml's C parser when it is installed and with the
+standard library's HTMLParser otherwise; both feed the same collector, so
+the output is formatted like convert.py always has: headings as
+"=== HEADING ===", the title as "*** Title ***", blank lines around
+headings and after paragraphs and list items.
+Set INFOFRAME_HTML_PARSER=html.parser to force the pure-Python parser.
+
+Usage:
+    from html_extract import extract_html_text
+    text = extract_html_text("page.html", max_chars=5000)
+    text = extract_html_text(upload_stream)
+"""
+
+import codecs
+import os
+import re
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+from text_budget import CHUNK_SIZE, clip_text, collapse_whitespace
+
+HEADINGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+SKIPPED = ('script', 'style')
+SNIFF_BYTES = 1024
+# Part of the extraction cache key: bump when the extracted text changes
+EXTRACTOR_VERSION = 1
+
+_meta_charset = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+_boms = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+def html_backend():
+    """Name of the parser extract_html_text() uses by default"""
+    forced = os.environ.get("INFOFRAME_HTML_PARSER")
+    if forced:
+        return forced
+    return "lxml" if etree is not None else "html.parser"
+
+
+def extractor_version(backend=None):
+    """Extraction cache key part; the backends differ on sloppy markup"""
+    return f"html-{EXTRACTOR_VERSION}-{backend or html_backend()}"
+
+
+def sniff_encoding(head, default="utf-8"):
+    """Charset of an HTML document from its first bytes"""
+    for bom, encoding in _boms:
+        if head.startswith(bom):
+            return encoding
+    match = _meta_charset.search(head[:SNIFF_BYTES])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return default
+
+
+def iter_html_decoded(stream, chunk_size=CHUNK_SIZE):
+    """Yield the text of an HTML stream a chunk at a time, in its own charset"""
+    head = stream.read(chunk_size)
+    decoder = codecs.getincrementaldecoder(sniff_encoding(head))(errors="replace")
+    data = head
+    while data:
+        text = decoder.decode(data)
+        if text:
+            yield text
+        data = stream.read(chunk_size)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class TextCollector:
+    """Parser target that turns tags and text into formatted lines
+
+    Text between two tags is collected whole, however the parser splits it,
+    and stripped once.
+    """
+
+    def __init__(self, max_chars=None):
+        self.max_chars = max_chars
+        self.lines = []
+        self.length = 0
+        self.pending = []
+        self.in_title = False
+        self.in_heading = False
+        self.skipping = 0
+
+    @property
+    def full(self):
+        return self.max_chars is not None and self.length >= self.max_chars
+
+    def flush(self):
+        if not self.pending:
+            return
+        cleaned = "".join(self.pending).strip()
+        self.pending = []
+        if cleaned:
+            self.length += len(collapse_whitespace(cleaned)) + 1
+            if self.in_heading:
+                self.lines.append('=== ' + cleaned.upper() + ' ===')
+            elif self.in_title:
+                self.lines.append('*** ' + cleaned + ' ***')
+            else:
+                self.lines.append(cleaned)
+
+    def start(self, tag, attrs=None):
+        self.flush()
+        if tag in HEADINGS:
+            self.in_heading = True
+            self.lines.append('')  # Blank line before heading
+        elif tag == 'title':
+            self.in_title = True
+        elif tag == 'br':
+            self.lines.append('')
+        elif tag in SKIPPED:
+            self.skipping += 1
+
+    def end(self, tag):
+        self.flush()
+        if tag in HEADINGS:
+            self.in_heading = False
+            self.lines.append('')  # Blank line after heading
+        elif tag == 'title':
+            self.in_title = False
+            self.lines.append('')
+        elif tag in ('p', 'li'):
+            self.lines.append('')
+        elif tag in SKIPPED:
+            self.skipping = max(self.skipping - 1, 0)
+
+    def data(self, data):
+        if not self.skipping:
+            self.pending.append(data)
+
+    def comment(self, text):
+        self.flush()
+
+    def close(self):
+        self.flush()
+
+    def text(self):
+        """The collected lines with runs of blank lines collapsed to one"""
+        result = []
+        prev_blank = False
+        for line in self.lines:
+            if not line:
+                if not prev_blank:
+                    result.append(line)
+                prev_blank = True
+            else:
+                result.append(line)
+                prev_blank = False
+        return clip_text('\n'.join(result), self.max_chars)
+
+
+class _StdlibParser(HTMLParser):
+    """HTMLParser events forwarded to a TextCollector"""
+
+    def __init__(self, target):
+        super().__init__()
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def handle_comment(self, data):
+        self.target.comment(data)
+
+
+def _parser(backend, collector):
+    if backend == "lxml":
+        if etree is None:
+            raise ImportError("INFOFRAME_HTML_PARSER=lxml requires lxml: pip3 install lxml")
+        return etree.HTMLParser(target=collector)
+    return _StdlibParser(collector)
+
+
+def extract_html_text(html, max_chars=None, backend=None):
+    """Return the formatted text of an HTML document (path or binary stream)
+
+    Parsing stops once max_chars characters are collected.
+    """
+    if not hasattr(html, "read"):
+        with open(html, "rb") as f:
+            return extract_html_text(f, max_chars, backend)
+
+    collector = TextCollector(max_chars)
+    parser = _parser(backend or html_backend(), collector)
+    fed = False
+    for chunk in iter_html_decoded(html):
+        parser.feed(chunk)
+        fed = True
+        if collector.full:
+            break
+    else:
+        if fed:
+            parser.close()
+        collector.close()
+    return collector.text()
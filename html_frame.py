@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Info-Frame HTML Output
+Builds the HTML version of an info-frame as a stream of chunks. The head
+(with the per-style CSS) is formatted once per style and cached; the body is
+escaped and emitted a slice at a time, so a megabyte-sized document is never
+assembled into one string and can go straight to a response or a file.
+
+Usage:
+    from html_frame import iter_html
+    with open("frame.html", "w", encoding="utf-8") as f:
+        f.writelines(iter_html(text, "modern", colors))
+"""
+
+import html
+import threading
+from collections import OrderedDict
+from string import Template
+
+CHUNK_SIZE = 1 << 16
+
+HEAD_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Info Frame - $title</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Helvetica', Arial, sans-serif;
+            background: $bg;
+            color: $text;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 100vh;
+            padding: 20px;
+        }
+        .container {
+            max-width: 1200px;
+            width: 100%;
+            background: $bg;
+            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+        }
+        .header {
+            background: $accent;
+            padding: 50px;
+            text-align: center;
+        }
+        .header h1 {
+            color: $bg;
+            font-size: 3.5em;
+            font-weight: bold;
+            letter-spacing: 2px;
+        }
+        .accent-line {
+            height: 5px;
+            background: $secondary;
+            margin: 30px 50px;
+        }
+        .content {
+            padding: 40px 80px;
+            font-size: 1.3em;
+            line-height: 1.8;
+        }
+        .content p {
+            margin-bottom: 15px;
+        }
+        .footer-line {
+            height: 5px;
+            background: $secondary;
+            margin: 30px 50px 50px 50px;
+        }
+        @media print {
+            body {
+                padding: 0;
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>INFO FRAME</h1>
+        </div>
+        <div class="accent-line"></div>
+        <div class="content">
+""")
+
+TAIL = """
+        </div>
+        <div class="footer-line"></div>
+    </div>
+</body>
+</html>"""
+
+
+def _hex(rgb):
+    return '#{:02x}{:02x}{:02x}'.format(*rgb)
+
+
+class HeadCache:
+    """Bounded LRU of formatted HTML heads, keyed by style and colors"""
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self._heads = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, style, colors):
+        key = (style, tuple(sorted(colors.items())))
+        with self._lock:
+            head = self._heads.get(key)
+            if head is not None:
+                self._heads.move_to_end(key)
+                self.hits += 1
+                return head
+            self.misses += 1
+
+        head = HEAD_TEMPLATE.substitute(
+            title=html.escape(style.capitalize()),
+            **{role: _hex(colors[role]) for role in ("bg", "accent", "text", "secondary")},
+        )
+
+        with self._lock:
+            self._heads[key] = head
+            while len(self._heads) > self.maxsize:
+                self._heads.popitem(last=False)
+        return head
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cached": len(self._heads), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._heads.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+head_cache = HeadCache()
+
+
+def iter_body(text, chunk_size=CHUNK_SIZE):
+    """Yield the escaped body markup, about chunk_size characters of text at a time
+
+    Each line becomes <p>line</p>, and a blank line becomes <br>.
+    """
+    start = 0
+    while start <= len(text):
+        # Slices end on a line break, so no line is split between chunks
+        end = text.find("\n", start + chunk_size)
+        if end == -1:
+            end = len(text)
+        lines = html.escape(text[start:end], quote=False).split("\n")
+        yield "".join(f"<p>{line}</p>\n" if line.strip() else "<br>\n" for line in lines)
+        start = end + 1
+
+
+def iter_html(text, style, colors, chunk_size=CHUNK_SIZE):
+    """Yield the HTML info-frame for text as string chunks"""
+    yield head_cache.get(style, colors)
+    yield from iter_body(text, chunk_size)
+    yield TAIL
+
+
+def create_html(text, style, colors):
+    """Return the whole HTML info-frame as one string"""
+    return "".join(iter_html(text, style, colors))
+
+
+def warm_up_html(colors_for, styles):
+    """Format the head of every style at startup"""
+    for style in styles:
+        head_cache.get(style, colors_for(style))
+
+
+def html_stats():
+    return head_cache.stats()
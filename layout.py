@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Text Layout
+Breaks lines by measured pixel width instead of character count and places
+them into a body box using the font's real line metrics.
+
+Glyph advances and pair kerning are memoized per font, so measuring a line
+is a handful of dict lookups per character with no repeated getlength calls.
+
+Wrapped paragraphs are kept in an LRU keyed by (paragraph, font, box width),
+so re-rendering edited text only re-wraps the paragraphs that changed.
+
+paginate() keeps placing the overflow of one page into the next box, so a
+long document becomes a sequence of pages instead of being cut off.
+
+Usage:
+    from layout import layout_text
+    result = layout_text(text, body_font, (80, 240, 1120, 1540))
+    for line in result.lines:
+        draw_text(draw, (line.x, line.y), line.text, fill, body_font)
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from PIL import ImageFont
+
+LINE_SPACING = 1.4
+
+LineBox = namedtuple("LineBox", "text x y width height")
+
+
+class TextLayout:
+    """Placed lines plus the lines that did not fit in the box"""
+
+    def __init__(self, lines, overflow, line_height):
+        self.lines = lines          # [LineBox] that fit in the box
+        self.overflow = overflow    # [(text, width)] left over, in order
+        self.line_height = line_height
+
+    @property
+    def truncated(self):
+        return bool(self.overflow)
+
+
+class AdvanceTable:
+    """Memoized glyph advances, pair kerning and word widths for one font"""
+
+    def __init__(self, font):
+        self.font = font
+        self._advances = {}
+        self._kerning = {}
+        self._words = {}
+        self.measure_calls = 0
+
+    def advance(self, ch):
+        value = self._advances.get(ch)
+        if value is None:
+            self.measure_calls += 1
+            value = self.font.getlength(ch)
+            self._advances[ch] = value
+        return value
+
+    def kerning(self, prev, ch):
+        pair = prev + ch
+        value = self._kerning.get(pair)
+        if value is None:
+            self.measure_calls += 1
+            value = self.font.getlength(pair) - self.advance(prev) - self.advance(ch)
+            self._kerning[pair] = value
+        return value
+
+    def width(self, text):
+        """Return the advance width of text, including kerning"""
+        value = self._words.get(text)
+        if value is not None:
+            return value
+        value = 0.0
+        prev = None
+        for ch in text:
+            if prev is not None:
+                value += self.kerning(prev, ch)
+            value += self.advance(ch)
+            prev = ch
+        if len(self._words) < 50000:
+            self._words[text] = value
+        return value
+
+    def stats(self):
+        return {
+            "glyphs": len(self._advances),
+            "pairs": len(self._kerning),
+            "words": len(self._words),
+            "measure_calls": self.measure_calls,
+        }
+
+
+_tables = {}
+_lock = threading.Lock()
+
+
+def _font_key(font):
+    if isinstance(font, ImageFont.FreeTypeFont):
+        return (font.path, font.size, font.index, font.layout_engine)
+    return id(font)
+
+
+def advance_table(font):
+    """Return the shared advance table for a font"""
+    key = _font_key(font)
+    table = _tables.get(key)
+    if table is None:
+        with _lock:
+            table = _tables.get(key)
+            if table is None:
+                table = AdvanceTable(font)
+                _tables[key] = table
+    return table
+
+
+def measure_calls():
+    """Return the font measurements made so far across every advance table"""
+    with _lock:
+        tables = list(_tables.values())
+    return sum(table.measure_calls for table in tables)
+
+
+def ink_height(font):
+    """Return ascent + descent, the height one line of glyphs can cover"""
+    if hasattr(font, "getmetrics"):
+        ascent, descent = font.getmetrics()
+        return ascent + descent
+    # Bitmap fonts have no metrics table
+    return font.getbbox("Ag")[3]
+
+
+def line_height_for(font, spacing=LINE_SPACING):
+    """Return the line pitch for a font (45px for the 32px body font)"""
+    size = getattr(font, "size", None)
+    if size:
+        return round(size * spacing)
+    return round(ink_height(font) * spacing)
+
+
+def _break_word(word, max_width, table):
+    """Split a word wider than the box at character boundaries"""
+    pieces = []
+    current = ""
+    current_width = 0.0
+    for ch in word:
+        step = table.advance(ch)
+        if current:
+            step += table.kerning(current[-1], ch)
+        if current and current_width + step > max_width:
+            pieces.append(current)
+            current, current_width = ch, table.advance(ch)
+        else:
+            current += ch
+            current_width += step
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def wrap_paragraph(paragraph, max_width, table):
+    """Greedy line breaking by pixel width; returns [(text, width)]"""
+    space = table.advance(" ")
+    lines = []
+    current = []
+    current_width = 0.0
+
+    for word in paragraph.split():
+        word_width = table.width(word)
+        if word_width > max_width:
+            if current:
+                lines.append((" ".join(current), current_width))
+                current, current_width = [], 0.0
+            pieces = _break_word(word, max_width, table)
+            for piece in pieces[:-1]:
+                lines.append((piece, table.width(piece)))
+            word = pieces[-1]
+            word_width = table.width(word)
+
+        if not current:
+            current, current_width = [word], word_width
+        elif current_width + space + word_width <= max_width:
+            current.append(word)
+            current_width += space + word_width
+        else:
+            lines.append((" ".join(current), current_width))
+            current, current_width = [word], word_width
+
+    if current:
+        lines.append((" ".join(current), current_width))
+    return lines
+
+
+class ParagraphCache:
+    """LRU of wrapped paragraphs keyed by (paragraph, font, box width)"""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._paragraphs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def wrap(self, paragraph, max_width, table):
+        """Return the wrapped lines of one paragraph as a tuple"""
+        key = (paragraph, _font_key(table.font), max_width)
+        with self._lock:
+            lines = self._paragraphs.get(key)
+            if lines is not None:
+                self._paragraphs.move_to_end(key)
+                self.hits += 1
+                return lines
+            self.misses += 1
+
+        lines = tuple(wrap_paragraph(paragraph, max_width, table))
+
+        with self._lock:
+            self._paragraphs[key] = lines
+            while len(self._paragraphs) > self.maxsize:
+                self._paragraphs.popitem(last=False)
+        return lines
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": len(self._paragraphs),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._paragraphs.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+paragraph_cache = ParagraphCache()
+
+
+def wrap_text(text, font, max_width):
+    """Wrap every paragraph of text; blank lines are kept as ("", 0)"""
+    table = advance_table(font)
+    lines = []
+    for paragraph in text.split('\n'):
+        if paragraph.strip():
+            lines.extend(paragraph_cache.wrap(paragraph, max_width, table))
+        else:
+            lines.append(("", 0.0))
+    return lines
+
+
+def place_lines(lines, font, box, line_height=None):
+    """Place wrapped lines top-down in box until the next one would not fit"""
+    left, top, right, bottom = box
+    if line_height is None:
+        line_height = line_height_for(font)
+    height = ink_height(font)
+
+    placed = []
+    y = top
+    for index, (text, width) in enumerate(lines):
+        if y + height > bottom:
+            return TextLayout(placed, lines[index:], line_height)
+        placed.append(LineBox(text, left, y, width, height))
+        y += line_height
+    return TextLayout(placed, [], line_height)
+
+
+def layout_text(text, font, box, line_height=None):
+    """Wrap text to the box width and place as many lines as fit"""
+    left, top, right, bottom = box
+    return place_lines(wrap_text(text, font, right - left), font, box, line_height)
+
+
+def paginate(text, font, box, line_height=None):
+    """Yield one TextLayout per page until every wrapped line is placed
+
+    Pages are placed lazily, so stopping early skips the rest of the work.
+    Blank lines at the top of a continuation page are dropped.
+    """
+    left, top, right, bottom = box
+    lines = wrap_text(text, font, right - left)
+    while True:
+        page = place_lines(lines, font, box, line_height)
+        yield page
+        if not page.overflow:
+            return
+        if not page.lines:
+            raise ValueError("Body box is too small to fit a single line")
+        lines = page.overflow
+        start = 0
+        while start < len(lines) and not lines[start][0]:
+            start += 1
+        if start == len(lines):
+            return
+        lines = lines[start:]
+
+
+def layout_stats():
+    return paragraph_cache.stats()
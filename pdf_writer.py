@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Info-Frame PDF Writer
+A minimal PDF writer that emits each page as soon as it is added, so a long
+document never has more than one page image in memory. Pillow's PDF plugin
+needs every page up front (save_all + append_images).
+
+Objects are written in the order they are produced; the page tree, catalog
+and cross-reference table follow the last page.
+
+Usage:
+    from pdf_writer import PdfWriter
+    with PdfWriter("out.pdf") as pdf:
+        for page in pages:
+            pdf.add_image_page(page)
+"""
+
+import io
+import os
+
+PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+
+
+class PdfWriter:
+    """Write a PDF page by page to a path or binary file object"""
+
+    def __init__(self, fp, resolution=100.0, jpeg=None):
+        self._owns_file = isinstance(fp, (str, bytes)) or hasattr(fp, "__fspath__")
+        self._path = fp if self._owns_file else None
+        self._fp = open(fp, "wb") if self._owns_file else fp
+        self.resolution = resolution
+        self.jpeg = jpeg or {"quality": 75}
+        self._offsets = {}
+        self._next_id = 1
+        self._position = 0
+        self._pages = []
+        self._catalog = self.reserve()
+        self._page_tree = self.reserve()
+        self._write(PDF_HEADER)
+
+    @property
+    def size(self):
+        """Bytes written so far"""
+        return self._position
+
+    @property
+    def page_count(self):
+        return len(self._pages)
+
+    def _write(self, data):
+        self._fp.write(data)
+        self._position += len(data)
+
+    def reserve(self):
+        """Return a fresh object number to be written later"""
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def write_object(self, obj_id, body, stream=None):
+        """Write object obj_id; body is the dictionary (or value) as bytes"""
+        self._offsets[obj_id] = self._position
+        self._write(b"%d 0 obj\n" % obj_id)
+        if stream is None:
+            self._write(body + b"\nendobj\n")
+            return
+        self._write(body[:-2] + b" /Length %d >>\nstream\n" % len(stream))
+        self._write(stream)
+        self._write(b"\nendstream\nendobj\n")
+
+    def add_object(self, body, stream=None):
+        obj_id = self.reserve()
+        self.write_object(obj_id, body, stream)
+        return obj_id
+
+    def add_page(self, width, height, content, resources, compressed=False):
+        """Write one page with its content stream; sizes are in points"""
+        contents = self.add_object(b"<< /Filter /FlateDecode >>" if compressed else b"<< >>", content)
+        page = self.add_object(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s] /Resources %s /Contents %d 0 R >>"
+            % (self._page_tree, _number(width), _number(height), resources, contents)
+        )
+        self._pages.append(page)
+        return page
+
+    def add_image_page(self, img):
+        """Add img as a full-page JPEG image"""
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, "JPEG", **self.jpeg)
+        image = self.add_object(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d "
+            b"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode >>"
+            % img.size,
+            buffer.getvalue(),
+        )
+        width = img.width * 72.0 / self.resolution
+        height = img.height * 72.0 / self.resolution
+        content = b"q %s 0 0 %s 0 0 cm /Im0 Do Q\n" % (_number(width), _number(height))
+        resources = b"<< /ProcSet [/PDF /ImageC] /XObject << /Im0 %d 0 R >> >>" % image
+        return self.add_page(width, height, content, resources)
+
+    def close(self):
+        """Write the page tree, catalog and cross-reference table"""
+        if self._fp is None:
+            return
+        kids = b" ".join(b"%d 0 R" % page for page in self._pages)
+        self.write_object(self._page_tree, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._pages)))
+        self.write_object(self._catalog, b"<< /Type /Catalog /Pages %d 0 R >>" % self._page_tree)
+
+        xref = self._position
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % self._next_id)
+        for obj_id in range(1, self._next_id):
+            self._write(b"%010d 00000 n \n" % self._offsets[obj_id])
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (self._next_id, self._catalog, xref)
+        )
+        if self._owns_file:
+            self._fp.close()
+        self._fp = None
+
+    def abort(self):
+        """Stop without a trailer, removing the file if the writer created it"""
+        if self._fp is None:
+            return
+        if self._owns_file:
+            self._fp.close()
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+        self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # On an error, reserved objects may be unwritten: no trailer, and the
+        # original exception propagates
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def _number(value):
+    """Format a PDF number without trailing zeros"""
+    return (b"%.2f" % value).rstrip(b"0").rstrip(b".")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Streaming PNG Encoder
+Encodes an image delivered as horizontal strips, emitting PNG chunks as soon
+as enough compressed data has built up. Only the current strip and the last
+row of the previous one are held in memory, however tall the image is.
+
+Rows use the PNG "Up" filter, computed per strip with one Pillow
+subtract_modulo call; flat backgrounds and horizontal bars become runs of
+zeros, which zlib compresses very well.
+
+Usage:
+    from png_stream import iter_png
+    with open("tall.png", "wb") as f:
+        for chunk in iter_png(strips, 1200, 50000):
+            f.write(chunk)
+"""
+
+import struct
+import zlib
+from PIL import Image, ImageChops
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+FILTER_UP = b"\x02"
+IDAT_SIZE = 1 << 16
+
+
+def _chunk(tag, data):
+    return struct.pack(">L", len(data)) + tag + data + struct.pack(">L", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def _up_filtered(strip, previous_row):
+    """Return the strip's rows Up-filtered, each prefixed with its filter byte"""
+    width, height = strip.size
+    above = Image.new("RGB", (width, height))
+    if previous_row is not None:
+        above.paste(previous_row, (0, 0))
+    if height > 1:
+        above.paste(strip.crop((0, 0, width, height - 1)), (0, 1))
+    raw = ImageChops.subtract_modulo(strip, above).tobytes()
+    stride = width * 3
+    return b"".join(FILTER_UP + raw[i:i + stride] for i in range(0, len(raw), stride))
+
+
+def iter_png(strips, width, height, compress_level=6):
+    """Yield the bytes of an RGB PNG whose rows arrive as strip images
+
+    The strips must be RGB, width pixels wide, and add up to height rows.
+    """
+    yield PNG_SIGNATURE + _chunk(b"IHDR", struct.pack(">LLBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    compressor = zlib.compressobj(compress_level)
+    pending = []
+    pending_size = 0
+    rows = 0
+    previous_row = None
+    for strip in strips:
+        if strip.mode != "RGB" or strip.width != width:
+            raise ValueError(f"Strips must be RGB and {width} pixels wide")
+        data = compressor.compress(_up_filtered(strip, previous_row))
+        previous_row = strip.crop((0, strip.height - 1, width, strip.height))
+        rows += strip.height
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size >= IDAT_SIZE:
+            yield _chunk(b"IDAT", b"".join(pending))
+            pending, pending_size = [], 0
+
+    if rows != height:
+        raise ValueError(f"Strips cover {rows} rows, expected {height}")
+    pending.append(compressor.flush())
+    yield _chunk(b"IDAT", b"".join(pending))
+    yield _chunk(b"IEND", b"")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Draft Previews
+Renders the first page of a frame directly at preview size instead of
+rendering 1200x1600 and shrinking it. Lines are broken at 1x (from the
+paragraph cache) and the text, bars and title are drawn natively at the
+preview scale, so a preview costs a small canvas and a small encode with
+the fastest preset.
+Draft mode also draws 1-bit glyphs, which are cheaper to rasterize and
+leave fewer colors for the PNG encoder.
+
+Usage:
+    from preview import render_preview
+    img = render_preview(text, "modern", colors)            # 400x533
+    img = render_preview(text, "modern", colors, draft=True)
+"""
+
+import time
+
+from frame_mask import layout_body, mask_from_layout, colorize
+from templates import get_plan, FRAME_WIDTH, FRAME_HEIGHT, DEFAULT_TEMPLATE
+from encoders import encode
+from canvas_pool import release_canvas
+
+PREVIEW_WIDTH = 400
+MIN_PREVIEW_WIDTH = 100
+PREVIEW_PRESET = "fastest"
+
+
+def preview_width(value):
+    """Parse a preview width, raising ValueError if out of range"""
+    try:
+        width = int(value) if value else PREVIEW_WIDTH
+    except ValueError:
+        raise ValueError(f"Invalid preview width: {value}")
+    if not MIN_PREVIEW_WIDTH <= width <= FRAME_WIDTH:
+        raise ValueError(f"Preview width must be {MIN_PREVIEW_WIDTH}-{FRAME_WIDTH} px")
+    return width
+
+
+def preview_mask(text, width=PREVIEW_WIDTH, template=DEFAULT_TEMPLATE, draft=False):
+    """Return the first page's coverage mask drawn at width pixels wide"""
+    scale = width / FRAME_WIDTH
+    font = get_plan(template).body_font_at(scale)
+    return mask_from_layout(layout_body(text, template=template), font, FRAME_WIDTH, FRAME_HEIGHT, scale,
+                            template, antialias=not draft)
+
+
+def render_preview(text, style, colors, width=PREVIEW_WIDTH, template=DEFAULT_TEMPLATE, draft=False):
+    """Return the first page at preview size as a pooled RGB image"""
+    return colorize(preview_mask(text, width, template, draft), style, colors)
+
+
+def encode_preview(text, style, colors, fp=None, fmt="png", width=PREVIEW_WIDTH, template=DEFAULT_TEMPLATE,
+                   draft=False):
+    """Render and encode a preview; returns (EncodeResult, render seconds)"""
+    start = time.perf_counter()
+    img = render_preview(text, style, colors, width, template, draft)
+    seconds = time.perf_counter() - start
+    try:
+        return encode(img, fmt, PREVIEW_PRESET, fp), seconds
+    finally:
+        release_canvas(img)
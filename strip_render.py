@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Strip Renderer
+Renders "long scroll" frames, where the whole document is one tall image,
+as fixed-height horizontal strips instead of one giant canvas. A 1200x50000
+RGB image is about 230 MB in Pillow; rendered as 256-row strips, peak memory
+is a couple of strips plus the compressor state.
+
+The tall frame keeps the normal header and footer rows from the chrome cache
+and the body flows between them with the usual layout. Bars that run the
+full height (a template's sidebar) are drawn onto every strip.
+
+Usage:
+    from strip_render import write_scroll
+    write_scroll(text, "modern", get_colors("modern"), "tall.png")
+"""
+
+import io
+import time
+from PIL import Image, ImageDraw
+
+from glyph_atlas import draw_text
+from layout import wrap_text, place_lines, ink_height
+from chrome import chrome_rows, FRAME_WIDTH, FRAME_HEIGHT
+from frame_mask import blend_luts
+from templates import get_plan, DEFAULT_TEMPLATE
+from canvas_pool import acquire_canvas, release_canvas
+from png_stream import iter_png
+from encoders import encode, get_preset, normalize_format, EncodeResult, DEFAULT_PRESET
+
+STRIP_HEIGHT = 256
+SCROLL_FORMATS = {"png", "jpeg"}
+
+# JPEG cannot address more rows than this
+JPEG_MAX_HEIGHT = 65535
+
+
+class ScrollLayout:
+    """Every body line of a document placed on one tall canvas"""
+
+    def __init__(self, lines, width, height, template=DEFAULT_TEMPLATE):
+        self.lines = lines
+        self.width = width
+        self.height = height
+        self.template = template
+
+
+def scroll_layout(text, width=FRAME_WIDTH, template=DEFAULT_TEMPLATE):
+    """Place all of text in one column; the frame grows to fit it"""
+    plan = get_plan(template)
+    left, top, right, _ = plan.body_box(width)
+    lines = wrap_text(text, plan.body_font, right - left)
+    layout = place_lines(lines, plan.body_font, (left, top, right, float("inf")), plan.line_height)
+    bottom = layout.lines[-1].y + ink_height(plan.body_font) if layout.lines else top
+    height = max(FRAME_HEIGHT, bottom + plan.body_bottom())
+    return ScrollLayout(layout.lines, width, height, template)
+
+
+def iter_strips(layout, style, colors, strip_height=STRIP_HEIGHT):
+    """Yield the frame as RGB strips from top to bottom
+
+    Strips share one pooled canvas, so each is only valid until the next
+    one is requested.
+    """
+    width, height = layout.width, layout.height
+    plan = get_plan(layout.template)
+    body_font = plan.body_font
+    luts = blend_luts(tuple(colors["bg"]), tuple(colors["text"]))
+    header_bottom = plan.body_top
+    header = chrome_rows(style, colors, 0, header_bottom, width, template=layout.template)
+    footer_top = height - plan.body_bottom()
+    footer = chrome_rows(style, colors, FRAME_HEIGHT - plan.body_bottom(), FRAME_HEIGHT, width,
+                         template=layout.template)
+    # Bars reaching into the body region, placed on the full tall frame
+    bars = [(role, box) for role, box in plan.bars(width, height)
+            if box[3] > header_bottom and box[1] < footer_top]
+
+    canvas = acquire_canvas("RGB", (width, strip_height))
+    mask_canvas = acquire_canvas("L", (width, strip_height))
+    lines = layout.lines
+    first = 0
+    try:
+        for top in range(0, height, strip_height):
+            rows = min(strip_height, height - top)
+            strip = canvas if rows == strip_height else Image.new("RGB", (width, rows))
+            mask = mask_canvas if rows == strip_height else Image.new("L", (width, rows))
+            strip.paste(colors["bg"], (0, 0, width, rows))
+            for role, (left, bar_top, right, bar_bottom) in bars:
+                if bar_top < top + rows and bar_bottom > top:
+                    strip.paste(colors[role], (left, max(bar_top - top, 0), right, min(bar_bottom - top, rows)))
+            if top < header_bottom:
+                strip.paste(header, (0, -top))
+            if top + rows > footer_top:
+                strip.paste(footer, (0, footer_top - top))
+
+            # Lines that overlap this strip; a line on a boundary is drawn in both
+            while first < len(lines) and lines[first].y + lines[first].height <= top:
+                first += 1
+            mask.paste(0, (0, 0, width, rows))
+            draw = ImageDraw.Draw(mask)
+            inked = False
+            for line in lines[first:]:
+                if line.y >= top + rows:
+                    break
+                if line.text:
+                    draw_text(draw, (line.x, line.y - top), line.text, fill=255, font=body_font)
+                    inked = True
+
+            if inked:
+                box = mask.getbbox()
+                if box is not None:
+                    coverage = mask.crop(box)
+                    strip.paste(Image.merge("RGB", [coverage.point(lut) for lut in luts]), box[:2])
+            yield strip
+    finally:
+        release_canvas(canvas)
+        release_canvas(mask_canvas)
+
+
+def render_scroll(text, style, colors, width=FRAME_WIDTH, template=DEFAULT_TEMPLATE):
+    """Assemble the whole tall frame in memory (for encoders without strips)"""
+    layout = scroll_layout(text, width, template)
+    img = Image.new("RGB", (layout.width, layout.height))
+    top = 0
+    for strip in iter_strips(layout, style, colors):
+        img.paste(strip, (0, top))
+        top += strip.height
+    return img
+
+
+def iter_scroll(text, style, colors, fmt="png", preset=DEFAULT_PRESET, width=FRAME_WIDTH,
+                template=DEFAULT_TEMPLATE):
+    """Return an iterator over the encoded bytes of a tall frame
+
+    Bad options raise ValueError here, before any output is produced. PNG
+    is encoded strip by strip as the iterator is consumed. Pillow has no
+    strip interface for JPEG, so JPEG output is assembled in memory and
+    limited to 65535 rows.
+    """
+    fmt = normalize_format(fmt)
+    if fmt not in SCROLL_FORMATS:
+        raise ValueError(f"Scroll output supports png and jpg, not {fmt}")
+    settings = get_preset(preset)
+    layout = scroll_layout(text, width, template)
+    if fmt == "png":
+        strips = iter_strips(layout, style, colors)
+        return iter_png(strips, layout.width, layout.height, settings["png"].get("compress_level", 6))
+
+    if layout.height > JPEG_MAX_HEIGHT:
+        raise ValueError(f"JPEG is limited to {JPEG_MAX_HEIGHT} rows; this frame needs {layout.height} (use png)")
+    return iter([encode(render_scroll(text, style, colors, width, template), fmt, preset).data])
+
+
+def write_scroll(text, style, colors, fp=None, fmt="png", preset=DEFAULT_PRESET, width=FRAME_WIDTH,
+                 template=DEFAULT_TEMPLATE):
+    """Write a tall frame to fp (path or file object), or return its bytes"""
+    start = time.perf_counter()
+    chunks = iter_scroll(text, style, colors, fmt, preset, width, template)
+    owns_file = isinstance(fp, str) or hasattr(fp, "__fspath__")
+    out = io.BytesIO() if fp is None else open(fp, "wb") if owns_file else fp
+    size = 0
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            size += len(chunk)
+    finally:
+        if owns_file:
+            out.close()
+    seconds = time.perf_counter() - start
+    data = out.getvalue() if fp is None else None
+    return EncodeResult(normalize_format(fmt), preset, size, seconds, data)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Layout Templates
+A template describes where everything on a frame goes: the colored bars,
+the title and the body text box, with font sizes and line spacing. Templates
+are plain data (the built-ins below, or JSON files in the directory named by
+INFOFRAME_TEMPLATES) and are compiled once into a LayoutPlan with resolved
+fonts and precomputed geometry, so rendering only fills in the text.
+
+Coordinates are 1x pixels of the 1200x1600 frame. A negative value is
+measured from the right or bottom edge, and a right or bottom of 0 is the
+edge itself, so the same template works for any frame height. Colors are
+style roles: bg, accent, text and secondary.
+
+"name@size" is the template with its body font at another size (line
+spacing scales with it); auto-fit (see autofit.py) renders through these.
+They are internal: names from users go through user_plan(), which refuses
+them, and only the most recently used MAX_SIZED_PLANS stay compiled.
+
+    {
+        "title": {"text": "INFO FRAME", "size": 60, "y": 75, "color": "bg"},
+        "bars": [{"color": "accent", "box": [0, 0, 0, 150]}],
+        "body": {"box": [80, 240, -80, -80], "size": 32, "line_spacing": 1.4}
+    }
+
+Usage:
+    from templates import get_plan
+    plan = get_plan("compact")
+    layout = layout_text(text, plan.body_font, plan.body_box(), plan.line_height)
+
+    python3 templates.py          # List templates and their body boxes
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from fonts import get_font, DEFAULT_FACE
+from layout import line_height_for, LINE_SPACING
+
+FRAME_WIDTH, FRAME_HEIGHT = 1200, 1600
+DEFAULT_TEMPLATE = "standard"
+MAX_SIZED_PLANS = 128
+COLOR_ROLES = ("bg", "accent", "text", "secondary")
+
+TEMPLATES = {
+    "standard": {
+        "title": {"text": "INFO FRAME", "size": 60, "y": 75, "color": "bg"},
+        "bars": [
+            {"color": "accent", "box": [0, 0, 0, 150]},
+            {"color": "secondary", "box": [50, 180, -50, 185]},
+            {"color": "secondary", "box": [50, -50, -50, -45]},
+        ],
+        "body": {"box": [80, 240, -80, -80], "size": 32, "line_spacing": LINE_SPACING},
+    },
+    "compact": {
+        "title": {"text": "INFO FRAME", "size": 44, "y": 50, "color": "bg"},
+        "bars": [
+            {"color": "accent", "box": [0, 0, 0, 100]},
+            {"color": "secondary", "box": [40, 124, -40, 128]},
+            {"color": "secondary", "box": [40, -36, -40, -32]},
+        ],
+        "body": {"box": [60, 164, -60, -60], "size": 26, "line_spacing": 1.35},
+    },
+    "large": {
+        "title": {"text": "INFO FRAME", "size": 84, "y": 100, "color": "bg"},
+        "bars": [
+            {"color": "accent", "box": [0, 0, 0, 200]},
+            {"color": "secondary", "box": [60, 236, -60, 244]},
+            {"color": "secondary", "box": [60, -60, -60, -52]},
+        ],
+        "body": {"box": [100, 300, -100, -100], "size": 40, "line_spacing": 1.5},
+    },
+    "sidebar": {
+        "title": {"text": "INFO FRAME", "size": 56, "y": 80, "color": "bg"},
+        "bars": [
+            {"color": "accent", "box": [0, 0, 0, 160]},
+            {"color": "secondary", "box": [0, 160, 24, 0]},
+            {"color": "secondary", "box": [80, -50, -50, -45]},
+        ],
+        "body": {"box": [100, 220, -80, -80], "size": 32, "line_spacing": LINE_SPACING},
+    },
+}
+
+
+def _edge(value, size):
+    """Resolve a template coordinate against a frame dimension"""
+    return size + value if value < 0 else value
+
+
+def _box(box, width, height):
+    left, top, right, bottom = box
+    # 0 on the right/bottom is the far edge itself
+    right = width if right == 0 else _edge(right, width)
+    bottom = height if bottom == 0 else _edge(bottom, height)
+    return (_edge(left, width), _edge(top, height), right, bottom)
+
+
+class LayoutPlan:
+    """A compiled template: resolved fonts plus geometry for each frame size"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.base = name.split("@")[0]   # Sized variants share the base chrome
+        title = spec.get("title", {})
+        body = spec["body"]
+        self.title = title.get("text", "")
+        self.title_size = title.get("size", 60)
+        self.title_y = title.get("y", 75)
+        self.title_color = title.get("color", "bg")
+        self.face = spec.get("face", DEFAULT_FACE)
+        self.bar_specs = [(bar["color"], tuple(bar["box"])) for bar in spec.get("bars", [])]
+        self.body_spec = tuple(body["box"])
+        self.body_size = body.get("size", 32)
+        self.line_spacing = body.get("line_spacing", LINE_SPACING)
+
+        for role in [self.title_color] + [role for role, _ in self.bar_specs]:
+            if role not in COLOR_ROLES:
+                raise ValueError(f"Template {name}: unknown color {role!r} (use {', '.join(COLOR_ROLES)})")
+        left, top, right, bottom = self.body_box()
+        if right - left < self.body_size or bottom - top < self.body_size:
+            raise ValueError(f"Template {name}: body box is too small")
+
+        self.body_font = get_font(self.face, self.body_size)
+        self.title_font = get_font(self.face, self.title_size)
+        self.line_height = line_height_for(self.body_font, self.line_spacing)
+        self.body_top = self.body_spec[1]
+        self._geometry = {}
+        self._lock = threading.Lock()
+
+    def body_box(self, width=FRAME_WIDTH, height=FRAME_HEIGHT):
+        """The (left, top, right, bottom) box the body text flows into"""
+        return _box(self.body_spec, width, height)
+
+    def body_bottom(self, height=FRAME_HEIGHT):
+        """Distance from the canvas bottom to the end of the body box"""
+        return height - self.body_box(FRAME_WIDTH, height)[3]
+
+    def bars(self, width=FRAME_WIDTH, height=FRAME_HEIGHT, scale=1.0):
+        """Return the bars as (color role, box) pairs for a canvas size
+
+        Offsets are 1x pixels multiplied by scale; width and height are the
+        actual (already scaled) canvas size.
+        """
+        key = (width, height, scale)
+        geometry = self._geometry.get(key)
+        if geometry is None:
+            geometry = []
+            for role, spec in self.bar_specs:
+                scaled = tuple(round(value * scale) for value in spec)
+                geometry.append((role, _box(scaled, width, height)))
+            with self._lock:
+                self._geometry[key] = geometry
+        return geometry
+
+    # Scaled sizes are rounded to whole pixels, so arbitrary preview and
+    # variant widths share a few fonts and glyph atlases
+    def body_font_at(self, scale):
+        return self.body_font if scale == 1 else get_font(self.face, max(round(self.body_size * scale), 1))
+
+    def title_font_at(self, scale):
+        return self.title_font if scale == 1 else get_font(self.face, max(round(self.title_size * scale), 1))
+
+
+_specs = dict(TEMPLATES)
+_plans = {}
+_sized_plans = OrderedDict()
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_templates(directory):
+    """Register every *.json template in directory under its file name"""
+    for path in sorted(Path(directory).expanduser().glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            register_template(path.stem, json.load(f))
+
+
+def register_template(name, spec):
+    """Add or replace a template; it is compiled on first use"""
+    with _lock:
+        _specs[name.lower()] = spec
+        _plans.pop(name.lower(), None)
+        for key in [key for key in _sized_plans if key.split("@")[0] == name.lower()]:
+            del _sized_plans[key]
+
+
+def _load_env_templates():
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    directory = os.environ.get("INFOFRAME_TEMPLATES")
+    if directory:
+        load_templates(directory)
+
+
+def sized_template(name, body_size):
+    """Return the name of template name with its body font at body_size"""
+    return f"{name.split('@')[0]}@{body_size}"
+
+
+def template_names():
+    _load_env_templates()
+    return list(_specs)
+
+
+def get_plan(name=None):
+    """Return the compiled plan for a template, raising ValueError if unknown"""
+    key = (name or DEFAULT_TEMPLATE).lower()
+    plan = _plans.get(key)
+    if plan is not None:
+        return plan
+    if "@" in key:
+        with _lock:
+            plan = _sized_plans.get(key)
+            if plan is not None:
+                _sized_plans.move_to_end(key)
+                return plan
+    _load_env_templates()
+    base, _, body_size = key.partition("@")
+    spec = _specs.get(base)
+    if spec is None:
+        raise ValueError(f"Unknown template: {name} (use {', '.join(_specs)})")
+    if body_size:
+        if not body_size.isdigit() or int(body_size) < 1:
+            raise ValueError(f"Invalid body size in template name: {name}")
+        spec = dict(spec, body=dict(spec["body"], size=int(body_size)))
+    try:
+        plan = LayoutPlan(key, spec)
+    except (KeyError, TypeError, IndexError) as e:
+        raise ValueError(f"Template {key} is malformed: {e}")
+    with _lock:
+        if body_size:
+            _sized_plans[key] = plan
+            while len(_sized_plans) > MAX_SIZED_PLANS:
+                _sized_plans.popitem(last=False)
+        else:
+            _plans[key] = plan
+    return plan
+
+
+def user_plan(name=None):
+    """get_plan() for a name from a form or the command line
+
+    Sized names are auto-fit's own; accepting them from users would let
+    every request compile and keep another font size.
+    """
+    if name and "@" in name:
+        raise ValueError(f"Unknown template: {name} (use {', '.join(template_names())})")
+    return get_plan(name)
+
+
+def warm_up_templates(names=None):
+    """Compile every template at startup so the first render skips it"""
+    return [get_plan(name) for name in (names or template_names())]
+
+
+def template_stats():
+    return {"templates": template_names(), "compiled": sorted(_plans) + list(_sized_plans)}
+
+
+def main():
+    print("\n📐 LAYOUT TEMPLATES")
+    print("=" * 50)
+    for plan in warm_up_templates():
+        default = " (default)" if plan.name == DEFAULT_TEMPLATE else ""
+        print(f"  {plan.name:10s} body {plan.body_box()}  {plan.body_size}px / {plan.line_height}px lines"
+              f"  title {plan.title_size}px{default}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
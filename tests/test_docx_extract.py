@@ -0,0 +1,33 @@
+import io
+import zipfile
+
+from docx_extract import iter_docx_paragraphs, DOCUMENT_XML
+
+NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def make_docx(body):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(DOCUMENT_XML, f"<w:document {NS}><w:body>{body}</w:body></w:document>")
+    buffer.seek(0)
+    return buffer
+
+
+def paragraph(text, outline=None):
+    properties = f'<w:pPr><w:outlineLvl w:val="{outline}"/></w:pPr>' if outline is not None else ""
+    return f"<w:p>{properties}<w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def test_outline_levels():
+    body = paragraph("top", 0) + paragraph("deepest", 8) + paragraph("body", 9) + paragraph("plain")
+    assert list(iter_docx_paragraphs(make_docx(body))) == [("top", 1), ("deepest", 9), ("body", 0), ("plain", 0)]
+
+
+def test_body_does_not_grow():
+    body = paragraph("first") + "<w:tbl><w:tr><w:tc>" + paragraph("cell") + "</w:tc></w:tr></w:tbl>" + paragraph("last")
+    paragraphs = iter_docx_paragraphs(make_docx(body * 200))
+    texts = [next(paragraphs)[0] for _ in range(600)]
+    # Everything is parsed by now; only the block being yielded is left
+    assert len(paragraphs.gi_frame.f_locals["body"]) <= 1
+    assert texts[-3:] == ["first", "cell", "last"]
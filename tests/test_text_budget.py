@@ -0,0 +1,23 @@
+import io
+
+from layout import layout_text
+from templates import get_plan
+from text_budget import page_budget, read_text_stream, TextBudget
+
+
+def first_page(text, template="standard"):
+    plan = get_plan(template)
+    return [line.text for line in layout_text(text, plan.body_font, plan.body_box()).lines]
+
+
+def test_whitespace_heavy_budget_keeps_first_page():
+    text = ("alpha" + " " * 12) * 3000
+    budget = TextBudget(page_budget(1))
+    budget.add(text)
+    assert first_page(budget.text()) == first_page(text)
+
+
+def test_whitespace_heavy_stream_keeps_first_page():
+    text = ("alpha" + " \t" * 8) * 20000
+    budgeted = read_text_stream(io.BytesIO(text.encode()), page_budget(1))
+    assert first_page(budgeted) == first_page(text)
@@ -0,0 +1,15 @@
+import fonts
+from convert import get_colors
+from templates import register_template, TEMPLATES
+from vector_pdf import write_pdf
+
+
+def test_default_font_falls_back_to_raster_pdf(monkeypatch):
+    # No system TrueType font: the registry hands out Pillow's built-in font
+    monkeypatch.setattr(fonts.registry, "_locate", lambda face: (None, 0))
+    register_template("builtin-font", dict(TEMPLATES["standard"], face="builtin-font"))
+
+    result = write_pdf("Hello from the built-in font", "classic", get_colors("classic"),
+                       template="builtin-font")
+    assert result.data.startswith(b"%PDF")
+    assert result.pages == 1
@@ -0,0 +1,20 @@
+import pytest
+
+import webapp
+import webapp_infoframe
+
+
+@pytest.mark.parametrize("module", [webapp, webapp_infoframe])
+def test_lossless_avif_is_a_bad_request(module):
+    client = module.app.test_client()
+    response = client.post("/generate", data={"text": "hi", "format": "avif", "lossless": "1"})
+    assert response.status_code == 400
+    assert "lossless" in response.get_json()["error"].lower()
+
+
+@pytest.mark.parametrize("module", [webapp, webapp_infoframe])
+def test_lossless_webp(module):
+    client = module.app.test_client()
+    response = client.post("/generate", data={"text": "hi", "format": "webp", "lossless": "1"})
+    assert response.status_code == 200
+    assert response.mimetype == "image/webp"
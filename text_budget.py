@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Reading Budgets
+Readers stop as soon as they have the text the output can show, instead of
+extracting a whole document and dropping most of it.
+
+page_budget() turns a page count into a character budget: an upper bound on
+the text that many pages of a template can hold (every line filled with the
+narrowest glyph), plus a margin. Budgets count text the way layout sees it,
+with runs of spaces and tabs collapsed to one space, so whitespace-heavy
+input cannot use up a budget; budgeted text comes back collapsed the same
+way. The pages rendered from the budgeted text are the same as from the
+whole document. Readers collect pieces in a
+TextBudget, which joins them once at the end, and text files and uploads are
+decoded incrementally a chunk at a time.
+
+Usage:
+    from text_budget import page_budget, TextBudget
+    budget = TextBudget(page_budget(1, "standard"))
+    for page in reader.pages:
+        if budget.add(page.extract_text()):
+            break
+    text = budget.text()
+"""
+
+import codecs
+import math
+import string
+
+from layout import advance_table
+from templates import get_plan, sized_template, DEFAULT_TEMPLATE
+from autofit import MIN_FIT_SIZE
+
+BUDGET_MARGIN = 1.25
+CHUNK_SIZE = 1 << 16
+
+_page_chars = {}
+
+
+def _chars_per_page(template):
+    per_page = _page_chars.get(template)
+    if per_page is None:
+        plan = get_plan(template)
+        left, top, right, bottom = plan.body_box()
+        lines = (bottom - top) // plan.line_height + 1
+        table = advance_table(plan.body_font)
+        narrowest = min(table.advance(ch) for ch in string.ascii_letters + string.digits + string.punctuation + " ")
+        # A line can also hold the space it broke at and its newline
+        per_page = lines * (int((right - left) / narrowest) + 2)
+        _page_chars[template] = per_page
+    return per_page
+
+
+def page_budget(pages, template=DEFAULT_TEMPLATE, fit=False):
+    """Characters needed to fill pages pages of template (None = no limit)
+
+    With fit=True the budget is for the smallest auto-fit size, the most
+    text a fitted frame can show.
+    """
+    if pages is None:
+        return None
+    if fit:
+        template = sized_template(template, MIN_FIT_SIZE)
+    return math.ceil(pages * _chars_per_page(template) * BUDGET_MARGIN)
+
+
+def collapse_whitespace(text):
+    """Text as layout wraps it: each line's whitespace runs as single spaces"""
+    return "\n".join(" ".join(line.split()) for line in text.split("\n"))
+
+
+def clip_text(text, max_chars):
+    """The first max_chars characters of text with its whitespace collapsed"""
+    if max_chars is None:
+        return text
+    # A prefix collapses to a prefix of the collapsed whole, so only as much
+    # text as the budget needs is collapsed
+    end = max(max_chars, 1)
+    while True:
+        clipped = collapse_whitespace(text[:end])
+        if len(clipped) >= max_chars or end >= len(text):
+            return clipped[:max_chars]
+        end *= 2
+
+
+class TextBudget:
+    """Collects extracted pieces until max_chars collapsed characters are reached"""
+
+    def __init__(self, max_chars=None, separator="\n"):
+        self.max_chars = max_chars
+        self.separator = separator
+        self.parts = []
+        self.length = 0
+
+    @property
+    def full(self):
+        return self.max_chars is not None and self.length >= self.max_chars
+
+    def add(self, piece):
+        """Append piece; returns True once the budget is met"""
+        self.parts.append(piece)
+        self.length += len(collapse_whitespace(piece)) + len(self.separator)
+        return self.full
+
+    def text(self):
+        return clip_text(self.separator.join(self.parts), self.max_chars)
+
+
+def iter_decoded(stream, encoding="utf-8", chunk_size=CHUNK_SIZE):
+    """Yield text from a binary stream, decoding one chunk at a time"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def read_text_stream(stream, max_chars=None, encoding="utf-8"):
+    """Decode a binary stream, stopping once max_chars characters are read"""
+    budget = TextBudget(max_chars, separator="")
+    for text in iter_decoded(stream, encoding):
+        if budget.add(text):
+            break
+    return budget.text()
+
+
+def read_text_file(path, max_chars=None, encoding="utf-8"):
+    with open(path, "rb") as f:
+        return read_text_stream(f, max_chars, encoding)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Variants
+Renders 1x / 2x / thumbnail versions of a frame, or the frame in every
+style, from a single layout pass. Line breaks are computed once in 1x
+pixels; every variant is then rasterized natively (fonts, bars and title at
+the scaled size), never resized, so a 2x frame is sharp and a thumbnail
+keeps legible hinting.
+
+Sizes are given as a comma-separated list:
+    1x, 2x, 0.5x   scale relative to the 1200x1600 frame
+    600, 600w      target width in pixels
+    thumb          300 px wide (0.25x)
+
+Usage:
+    from variants import parse_sizes, render_variants
+    for label, img in render_variants(text, "modern", colors, parse_sizes("1x,2x,thumb")):
+        img.save(f"frame_{label}.png")
+
+    # Every style side by side on one half-scale contact sheet
+    sheet = contact_sheet(text, STYLE_NAMES, get_colors)
+"""
+
+from PIL import Image
+
+from chrome import FRAME_WIDTH, FRAME_HEIGHT
+from frame_mask import layout_body, mask_from_layout, render_mask, colorize
+from templates import get_plan, DEFAULT_TEMPLATE
+from canvas_pool import release_canvas
+
+SIZE_ALIASES = {"thumb": 0.25, "thumbnail": 0.25}
+MIN_SCALE = 0.1
+MAX_SCALE = 4.0
+MAX_SIZES = 6
+
+ALL_STYLES = "all"
+SHEET_SCALE = 0.5
+SHEET_COLUMNS = 2
+SHEET_GUTTER = 20
+SHEET_BACKGROUND = (128, 128, 128)
+
+
+def parse_sizes(spec):
+    """Parse "1x,2x,thumb,600w" into [(label, scale)], raising ValueError"""
+    sizes = []
+    for token in (spec or "").split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        try:
+            if token in SIZE_ALIASES:
+                scale = SIZE_ALIASES[token]
+            elif token.endswith("x"):
+                scale = float(token[:-1])
+            else:
+                scale = int(token.rstrip("w")) / FRAME_WIDTH
+        except ValueError:
+            raise ValueError(f"Invalid size: {token} (use e.g. 1x, 2x, thumb or 600w)")
+        if not MIN_SCALE <= scale <= MAX_SCALE:
+            raise ValueError(f"Size {token} is out of range ({MIN_SCALE}x-{MAX_SCALE:g}x)")
+        if token not in [label for label, _ in sizes]:
+            sizes.append((token, scale))
+    if not sizes:
+        raise ValueError("No sizes given (use e.g. 1x,2x,thumb)")
+    if len(sizes) > MAX_SIZES:
+        raise ValueError(f"At most {MAX_SIZES} sizes per request")
+    return sizes
+
+
+def _scaled_mask(layout, scale, template):
+    font = get_plan(template).body_font_at(scale)
+    return mask_from_layout(layout, font, FRAME_WIDTH, FRAME_HEIGHT, scale, template)
+
+
+def render_variants(text, style, colors, sizes, template=DEFAULT_TEMPLATE):
+    """Yield (label, image) for each size from one layout pass
+
+    Images are pooled canvases; each is released when the next is requested,
+    so copy() any variant that has to outlive the loop.
+    """
+    layout = layout_body(text, template=template)
+    for label, scale in sizes:
+        img = colorize(_scaled_mask(layout, scale, template), style, colors)
+        yield label, img
+        release_canvas(img)
+
+
+def render_style_set(text, styles, colors_for, template=DEFAULT_TEMPLATE):
+    """Yield (style, image) for each style from one (cached) layout pass
+
+    Images are pooled canvases, released when the next one is requested.
+    """
+    frame_mask = render_mask(text, template=template)
+    for style in styles:
+        img = colorize(frame_mask, style, colors_for(style))
+        yield style, img
+        release_canvas(img)
+
+
+def contact_sheet(text, styles, colors_for, scale=SHEET_SCALE, columns=SHEET_COLUMNS, template=DEFAULT_TEMPLATE):
+    """Return one image with the frame in every style, drawn natively at scale"""
+    frame_mask = _scaled_mask(layout_body(text, template=template), scale, template)
+    width, height = frame_mask.size
+    rows = -(-len(styles) // columns)
+    sheet = Image.new("RGB", (
+        columns * width + (columns + 1) * SHEET_GUTTER,
+        rows * height + (rows + 1) * SHEET_GUTTER,
+    ), SHEET_BACKGROUND)
+    for index, style in enumerate(styles):
+        img = colorize(frame_mask, style, colors_for(style))
+        row, column = divmod(index, columns)
+        sheet.paste(img, (SHEET_GUTTER + column * (width + SHEET_GUTTER), SHEET_GUTTER + row * (height + SHEET_GUTTER)))
+        release_canvas(img)
+    return sheet
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Info-Frame Vector PDF
+Writes info-frames as real PDF content instead of a bitmap inside a PDF:
+the header, accent and footer bars are filled rectangles and the title and
+body are text in an embedded, subsetted copy of the frame font. Pages use
+the same chrome geometry and the same paginated layout as the PNG renderer,
+so line breaks match the raster output exactly.
+
+Drawing happens in canvas pixels: each page starts with a transform that
+maps the 1200x1600 canvas onto an 864x1152 pt page (100 dpi, y down).
+
+Usage:
+    from vector_pdf import write_pdf
+    result = write_pdf(text, "modern", get_colors("modern"), "frame.pdf")
+"""
+
+import io
+import time
+import zlib
+
+from chrome import FRAME_WIDTH, FRAME_HEIGHT
+from frame_mask import render_pages, paginate_body
+from templates import get_plan, DEFAULT_TEMPLATE
+from layout import advance_table
+from pdf_writer import PdfWriter
+from pdf_fonts import EmbeddedFont, FontError
+from encoders import encode_pages, EncodeResult, DEFAULT_PRESET
+
+RESOLUTION = 100.0
+
+
+def _color(rgb):
+    return b"%s %s %s" % tuple(_number(channel / 255) for channel in rgb)
+
+
+def _number(value):
+    return (b"%.3f" % value).rstrip(b"0").rstrip(b".") or b"0"
+
+
+def _show(embedded, text, table, size):
+    """TJ operand placing each glyph where the raster renderer puts it
+
+    Glyphs advance by their /W widths; the raster layout's kerning and any
+    hinting differences are carried as TJ adjustments.
+    """
+    parts = []
+    run = ""
+    shift = 0.0
+    prev = None
+    for ch in text:
+        if prev is not None:
+            shift += table.kerning(prev, ch)
+        # TJ adjustments are in thousandths of the font size, positive = left
+        adjust = -shift * 1000 / size
+        if run and abs(adjust) >= 0.5:
+            parts.append(embedded.encode(run))
+            parts.append(_number(adjust))
+            run = ""
+            shift = 0.0
+        run += ch
+        measured = table.advance(ch)
+        shift += measured - embedded.advance(ch, size, measured)
+        prev = ch
+    if run:
+        parts.append(embedded.encode(run))
+    return b"[" + b" ".join(parts) + b"]"
+
+
+class VectorPage:
+    """Builds the content stream of one page in canvas pixel coordinates"""
+
+    def __init__(self, width, height, colors):
+        scale = 72.0 / RESOLUTION
+        self.ops = [b"%s 0 0 %s 0 %s cm" % (_number(scale), _number(-scale), _number(height * scale))]
+        self.colors = colors
+        self.rect((0, 0, width, height), colors["bg"])
+
+    def rect(self, box, rgb):
+        left, top, right, bottom = box
+        self.ops.append(b"%s rg %d %d %d %d re f" % (_color(rgb), left, top, right - left, bottom - top))
+
+    def text(self, x, baseline, shown, size, rgb):
+        # The text matrix flips y back so glyphs are upright in the y-down space
+        self.ops.append(
+            b"BT %s rg /F1 %d Tf 1 0 0 -1 %s %s Tm %s TJ ET"
+            % (_color(rgb), size, _number(x), _number(baseline), shown)
+        )
+
+    def content(self):
+        return zlib.compress(b"\n".join(self.ops), 6)
+
+
+def write_pdf(text, style, colors, fp=None, max_pages=None, title=None,
+              width=FRAME_WIDTH, height=FRAME_HEIGHT, preset=DEFAULT_PRESET, template=DEFAULT_TEMPLATE):
+    """Write text as a vector PDF to fp (path or file object), or return bytes
+
+    Falls back to the raster page writer when the frame font is a bitmap or
+    PostScript-outline font that cannot be embedded, or Pillow's built-in
+    font (no system TrueType font found), which has no file to embed.
+    """
+    plan = get_plan(template)
+    body_font, title_font = plan.body_font, plan.title_font
+    title = plan.title if title is None else title
+    try:
+        embedded = EmbeddedFont(body_font.path, body_font.index, "-".join(body_font.getname()))
+    except (AttributeError, TypeError, OSError, FontError):
+        pages = render_pages(text, style, colors, max_pages, width, height, template)
+        return encode_pages(pages, "pdf", preset, fp)
+
+    buffer = io.BytesIO() if fp is None else None
+    start = time.perf_counter()
+    body_table = advance_table(body_font)
+    title_table = advance_table(title_font)
+    body_ascent = body_font.getmetrics()[0]
+    title_ascent, title_descent = title_font.getmetrics()
+
+    with PdfWriter(buffer if fp is None else fp) as pdf:
+        font_id = pdf.reserve()
+        resources = b"<< /ProcSet [/PDF /Text] /Font << /F1 %d 0 R >> >>" % font_id
+        layouts = paginate_body(text, width, height, template)
+        for number, layout in enumerate(layouts, 1):
+            page = VectorPage(width, height, colors)
+            for role, box in plan.bars(width, height):
+                page.rect(box, colors[role])
+
+            # Body first, so glyph widths are taken from the body size
+            for line in layout.lines:
+                if line.text:
+                    page.text(line.x, line.y + body_ascent, _show(embedded, line.text, body_table, plan.body_size),
+                              plan.body_size, colors["text"])
+
+            # Same placement as draw.text(..., anchor="mm") in chrome.draw_chrome
+            if title:
+                title_width = title_table.width(title)
+                page.text(width / 2 - title_width / 2, plan.title_y + (title_ascent - title_descent) / 2,
+                          _show(embedded, title, title_table, plan.title_size), plan.title_size,
+                          colors[plan.title_color])
+
+            scale = 72.0 / RESOLUTION
+            pdf.add_page(width * scale, height * scale, page.content(), resources, compressed=True)
+            if max_pages is not None and number >= max_pages:
+                break
+        embedded.write(pdf, font_id)
+
+    seconds = time.perf_counter() - start
+    data = buffer.getvalue() if buffer is not None else None
+    return EncodeResult("pdf", "vector", pdf.size, seconds, data, pdf.page_count)
@@ -4,9 +4,7 @@ Info-Frame Web App - Simple & Fast
 Run this and open http://localhost:8000
 """
 
-from flask import Flask, render_template_string, request, send_file, jsonify
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
+from flask import Flask, render_template_string, request, send_file, jsonify, Response, stream_with_context
 import io
 from pathlib import Path
 import subprocess
@@ -20,49 +18,55 @@ BASE_DIR = Path(__file__).parent
 NODE_CONVERTER = BASE_DIR / "render.js"
 sys.path.insert(0, str(BASE_DIR))
 
-def read_file_content(file):
-    """Read uploaded file content"""
+from fonts import font_stats
+from chrome import chrome_stats, warm_up, STYLE_NAMES
+from frame_mask import render_mask, colorize, render_pages, count_pages, mask_stats
+from layout import layout_stats
+from canvas_pool import release_canvas, pool_stats, memory_usage, tune_allocator
+from vector_pdf import write_pdf
+from strip_render import iter_scroll
+from templates import user_plan, template_names, warm_up_templates, template_stats, DEFAULT_TEMPLATE
+from autofit import fit_template, fit_stats
+from preview import encode_preview, preview_width
+from text_budget import page_budget, read_text_stream
+from extract_cache import extract_cache, extract_stats
+from variants import parse_sizes, render_variants, render_style_set, contact_sheet, ALL_STYLES
+from encoders import (
+    encode, encode_zip, extension_for, normalize_format,
+    options_from_form, max_pages_from_form, IMAGE_FORMATS, MIMETYPES
+)
+
+def read_file_content(file, max_chars=None):
+    """Read uploaded file content, stopping once max_chars characters are read"""
     filename = file.filename.lower()
 
     try:
         if filename.endswith('.pdf'):
-            import PyPDF2
-            reader = PyPDF2.PdfReader(file)
-            text = []
-            for page in reader.pages:
-                text.append(page.extract_text())
-            return '\n'.join(text)
+            from pdf_extract import extract_pdf_text, EXTRACTOR_VERSION
+            return extract_cache.text(file, EXTRACTOR_VERSION, lambda: extract_pdf_text(file, max_chars), max_chars)
 
         elif filename.endswith(('.html', '.htm')):
-            from html.parser import HTMLParser
-            class TextExtractor(HTMLParser):
-                def __init__(self):
-                    super().__init__()
-                    self.text = []
-                def handle_data(self, data):
-                    if data.strip():
-                        self.text.append(data.strip())
-
-            content = file.read().decode('utf-8')
-            parser = TextExtractor()
-            parser.feed(content)
-            return '\n'.join(parser.text)
+            from html_extract import extract_html_text, extractor_version
+            return extract_cache.text(file, extractor_version(),
+                                      lambda: extract_html_text(file, max_chars), max_chars)
 
         elif filename.endswith('.docx'):
-            import docx
-            doc = docx.Document(file)
-            text = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    text.append(para.text)
-            return '\n'.join(text)
+            from docx_extract import extract_docx_text, EXTRACTOR_VERSION
+            return extract_cache.text(file, EXTRACTOR_VERSION,
+                                      lambda: extract_docx_text(file, max_chars), max_chars)
 
         else:  # Plain text
-            return file.read().decode('utf-8')
+            return read_text_stream(file, max_chars)
 
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
+def request_text(max_chars=None):
+    """Return the uploaded file's text or the text field (None if neither)"""
+    if 'file' in request.files:
+        return read_file_content(request.files['file'], max_chars)
+    return request.form.get('text')
+
 def get_colors(style):
     """Get color scheme"""
     styles = {
@@ -73,45 +77,13 @@ def get_colors(style):
     }
     return styles.get(style.lower(), styles["modern"])
 
-def create_image(text, style):
+def create_image(text, style, template=DEFAULT_TEMPLATE):
     """Create info-frame image"""
     colors = get_colors(style)
 
-    width, height = 1200, 1600
-    img = Image.new('RGB', (width, height), color=colors["bg"])
-    draw = ImageDraw.Draw(img)
-
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32)
-    except:
-        title_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-
-    # Header
-    draw.rectangle([0, 0, width, 150], fill=colors["accent"])
-    draw.text((width//2, 75), "INFO FRAME", fill=colors["bg"], font=title_font, anchor="mm")
-
-    # Accent line
-    draw.rectangle([50, 180, width-50, 185], fill=colors["secondary"])
-
-    # Content
-    lines = []
-    for line in text.split('\n'):
-        if line.strip():
-            lines.extend(textwrap.wrap(line, width=40))
-        else:
-            lines.append('')
-
-    y = 240
-    for line in lines[:25]:
-        if y > height - 100:
-            break
-        draw.text((80, y), line, fill=colors["text"], font=body_font)
-        y += 45
-
-    # Footer
-    draw.rectangle([50, height-50, width-50, height-45], fill=colors["secondary"])
+    # Layout is style-independent; only the colorize step depends on style
+    mask = render_mask(text, template=template)
+    img = colorize(mask, style, colors)
 
     return img
 
@@ -268,13 +240,14 @@ HTML = """
             <h3>Your Info-Frame:</h3>
             <img id="img" src="">
             <br>
-            <a id="download" class="download" download="infoframe.png">⬇️ Download PNG</a>
+            <a id="download" class="download" download="infoframe.png" onclick="downloadFull(event)">⬇️ Download PNG</a>
         </div>
     </div>
 
     <script>
         let selectedStyle = 'modern';
         let currentTab = 'upload';
+        let lastForm = null;
 
         function switchTab(tab) {
             currentTab = tab;
@@ -317,23 +290,44 @@ HTML = """
             }
 
             try {
-                const response = await fetch('/generate', {
+                // Show a preview drawn at display size; the full frame is
+                // only rendered when it is downloaded
+                lastForm = formData;
+                const previewForm = new FormData();
+                formData.forEach((value, key) => previewForm.append(key, value));
+                previewForm.append('width', '600');
+                const response = await fetch('/preview', {
                     method: 'POST',
-                    body: formData
+                    body: previewForm
                 });
 
                 if (!response.ok) throw new Error('Generation failed');
 
                 const blob = await response.blob();
-                const url = URL.createObjectURL(blob);
-
-                document.getElementById('img').src = url;
-                document.getElementById('download').href = url;
+                document.getElementById('img').src = URL.createObjectURL(blob);
+                document.getElementById('download').removeAttribute('href');
                 document.getElementById('preview').style.display = 'block';
             } catch (err) {
                 alert('Error: ' + err.message);
             }
         }
+
+        async function downloadFull(event) {
+            const link = document.getElementById('download');
+            if (link.getAttribute('href')) return;
+            event.preventDefault();
+            try {
+                const response = await fetch('/generate', {
+                    method: 'POST',
+                    body: lastForm
+                });
+                if (!response.ok) throw new Error('Generation failed');
+                link.href = URL.createObjectURL(await response.blob());
+                link.click();
+            } catch (err) {
+                alert('Error: ' + err.message);
+            }
+        }
     </script>
 </body>
 </html>
@@ -526,36 +520,163 @@ def setup_page():
 def generate():
     try:
         style = request.form.get('style', 'modern')
-
-        # Get content
-        if 'file' in request.files:
-            file = request.files['file']
-            text = read_file_content(file)
-        elif 'text' in request.form:
-            text = request.form.get('text')
+        output_format = normalize_format(request.form.get('format', 'png'))
+        if output_format != 'pdf' and output_format not in IMAGE_FORMATS:
+            return jsonify({'error': f'Unknown format: {output_format}'}), 400
+        try:
+            preset, lossless, effort = options_from_form(request.form, output_format)
+            max_pages = max_pages_from_form(request.form, output_format)
+            sizes = parse_sizes(request.form['sizes']) if request.form.get('sizes') else None
+            template = user_plan(request.form.get('template') or DEFAULT_TEMPLATE).name
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if sizes and output_format == 'pdf':
+            return jsonify({'error': 'sizes= needs an image format'}), 400
+        sheet = request.form.get('sheet', '').lower() in ('1', 'true', 'yes', 'on')
+        if style == ALL_STYLES and output_format == 'pdf' and not sheet:
+            return jsonify({'error': 'style=all needs an image format, or pdf with sheet=1'}), 400
+
+        scroll = style != ALL_STYLES and request.form.get('scroll', '').lower() in ('1', 'true', 'yes', 'on')
+        fitting = request.form.get('fit', '').lower() in ('1', 'true', 'yes', 'on')
+
+        # Get content; only as much as the pages being sent can show
+        if scroll:
+            budget_pages = None
+        elif sizes or style == ALL_STYLES:
+            budget_pages = 1
         else:
+            budget_pages = max_pages
+        text = request_text(page_budget(budget_pages, template, fitting))
+        if text is None:
             return jsonify({'error': 'No input provided'}), 400
 
         if not text or not text.strip():
             return jsonify({'error': 'No content'}), 400
 
-        # Trim
-        if len(text) > 2000:
-            text = text[:2000] + "..."
+        # Auto-fit picks the body size; everything below renders through it
+        fit = None
+        if fitting:
+            fit = fit_template(text, template)
+            template = fit.template
 
-        # Generate
-        img = create_image(text, style)
+        download_name = f'infoframe_{style}.{extension_for(output_format)}'
+        if scroll:
+            # One tall image, sent as its strips are encoded
+            try:
+                chunks = iter_scroll(text, style, get_colors(style), output_format, preset, template=template)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            response = Response(stream_with_context(chunks), mimetype=MIMETYPES[output_format])
+            response.headers['Content-Disposition'] = f'inline; filename={download_name}'
+            return response
 
-        # Return
         img_io = io.BytesIO()
-        img.save(img_io, 'PNG')
+        if style == ALL_STYLES and sheet:
+            # Every style side by side, laid out once and drawn at half scale
+            img = contact_sheet(text, STYLE_NAMES, get_colors, template=template)
+            result = encode(img, output_format, preset, img_io, lossless=lossless, effort=effort)
+        elif style == ALL_STYLES:
+            # Every style from one layout pass, sent as one zip
+            styled = render_style_set(text, STYLE_NAMES, get_colors, template)
+            named = ((f'infoframe_{name}', img) for name, img in styled)
+            result = encode_zip(named, output_format, preset, img_io, lossless=lossless, effort=effort)
+            download_name = 'infoframe_all.zip'
+        elif sizes:
+            # Every resolution from one layout pass, sent as one zip
+            variants = render_variants(text, style, get_colors(style), sizes, template)
+            named = ((f'infoframe_{style}_{label}', img) for label, img in variants)
+            result = encode_zip(named, output_format, preset, img_io, lossless=lossless, effort=effort)
+            download_name = f'infoframe_{style}.zip'
+        elif output_format == 'pdf':
+            # Vector text; long text flows onto further pages
+            result = write_pdf(text, style, get_colors(style), img_io, max_pages, preset=preset, template=template)
+        elif max_pages > 1 and count_pages(text, template=template) > 1:
+            # Several page images go back as one zip
+            pages = render_pages(text, style, get_colors(style), max_pages, template=template)
+            named = ((f'infoframe_{style}_p{number}', img) for number, img in enumerate(pages, 1))
+            result = encode_zip(named, output_format, preset, img_io, lossless=lossless, effort=effort)
+            download_name = f'infoframe_{style}.zip'
+        else:
+            img = create_image(text, style, template)
+            try:
+                result = encode(img, output_format, preset, img_io, lossless=lossless, effort=effort)
+            finally:
+                # The encoded bytes are all we keep; the canvas goes back to the pool
+                release_canvas(img)
         img_io.seek(0)
 
-        return send_file(img_io, mimetype='image/png', download_name=f'infoframe_{style}.png')
+        response = send_file(
+            img_io,
+            mimetype=MIMETYPES['zip'] if download_name.endswith('.zip') else result.mimetype,
+            download_name=download_name
+        )
+        response.headers['X-Encode-Time-Ms'] = f'{result.seconds * 1000:.1f}'
+        response.headers['X-Encoded-Bytes'] = str(result.size)
+        response.headers['X-Pages'] = str(result.pages)
+        if fit is not None:
+            response.headers['X-Fit-Size'] = str(fit.size)
+            response.headers['X-Fit-Layout-Passes'] = str(fit.probes)
+            response.headers['X-Fit-Measure-Calls'] = str(fit.measure_calls)
+        return response
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/preview', methods=['POST'])
+def preview():
+    """First page drawn natively at preview size (draft=1 for 1-bit glyphs)"""
+    try:
+        style = request.form.get('style', 'modern')
+        output_format = normalize_format(request.form.get('format', 'png'))
+        if output_format not in IMAGE_FORMATS:
+            return jsonify({'error': 'Previews are png, jpg, webp or avif'}), 400
+        if style == ALL_STYLES:
+            return jsonify({'error': 'Previews need a single style'}), 400
+        try:
+            width = preview_width(request.form.get('width'))
+            template = user_plan(request.form.get('template') or DEFAULT_TEMPLATE).name
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        draft = request.form.get('draft', '').lower() in ('1', 'true', 'yes', 'on')
+        fitting = request.form.get('fit', '').lower() in ('1', 'true', 'yes', 'on')
+
+        # A preview is the first page, so a page's worth of text is enough
+        text = request_text(page_budget(1, template, fitting))
+        if text is None:
+            return jsonify({'error': 'No input provided'}), 400
+        if not text.strip():
+            return jsonify({'error': 'No content'}), 400
+        if fitting:
+            template = fit_template(text, template).template
+
+        img_io = io.BytesIO()
+        result, render_seconds = encode_preview(text, style, get_colors(style), img_io, output_format, width,
+                                                template, draft)
+        img_io.seek(0)
+        response = send_file(img_io, mimetype=result.mimetype,
+                             download_name=f'preview_{style}.{extension_for(output_format)}')
+        response.headers['X-Render-Time-Ms'] = f'{render_seconds * 1000:.1f}'
+        response.headers['X-Encode-Time-Ms'] = f'{result.seconds * 1000:.1f}'
+        response.headers['X-Encoded-Bytes'] = str(result.size)
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/stats')
+def stats():
+    return jsonify({
+        'fonts': font_stats(),
+        'chrome': chrome_stats(),
+        'masks': mask_stats(),
+        'layout': layout_stats(),
+        'templates': template_stats(),
+        'fit': fit_stats(),
+        'extract': extract_stats(),
+        'pool': pool_stats(),
+        'memory': memory_usage(),
+    })
+
 @app.route('/convert_html', methods=['POST'])
 def convert_html_to_png():
     if not NODE_CONVERTER.exists():
@@ -618,4 +739,7 @@ if __name__ == '__main__':
     print("🌐 Open: http://localhost:8000")
     print("📱 Or from phone: http://YOUR_IP:8000")
     print("\n⌨️  Press Ctrl+C to stop\n")
+    tune_allocator()
+    warm_up_templates()
+    warm_up(get_colors, templates=template_names())
     app.run(host='0.0.0.0', port=8000, debug=False)
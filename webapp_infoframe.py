@@ -5,48 +5,60 @@ Run with: python3 webapp_infoframe.py
 Then open: http://localhost:5001
 """
 
-from flask import Flask, render_template_string, request, send_file, jsonify
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
+from flask import Flask, render_template_string, request, send_file, jsonify, Response, stream_with_context
 import io
 import base64
 from pathlib import Path
-import PyPDF2
+
+from fonts import font_stats
+from chrome import chrome_stats, warm_up, STYLE_NAMES
+from frame_mask import render_mask, colorize, render_pages, count_pages, mask_stats
+from layout import layout_stats
+from canvas_pool import release_canvas, pool_stats, memory_usage, tune_allocator
+from vector_pdf import write_pdf
+from strip_render import iter_scroll
+from html_frame import iter_html, warm_up_html, html_stats
+from templates import user_plan, template_names, warm_up_templates, template_stats, DEFAULT_TEMPLATE
+from autofit import fit_template, fit_stats
+from preview import encode_preview, preview_width
+from text_budget import page_budget, read_text_stream
+from pdf_extract import extract_pdf_text, EXTRACTOR_VERSION as PDF_EXTRACTOR
+from html_extract import extract_html_text, extractor_version
+from extract_cache import extract_cache, extract_stats
+from variants import parse_sizes, render_variants, render_style_set, contact_sheet, ALL_STYLES
+from encoders import (
+    encode, encode_zip, extension_for, normalize_format,
+    options_from_form, max_pages_from_form, DEFAULT_PRESET, IMAGE_FORMATS, MIMETYPES
+)
 
 app = Flask(__name__)
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from uploaded PDF file"""
+def extract_text_from_pdf(pdf_file, max_chars=None):
+    """Extract text from uploaded PDF file, stopping once max_chars are read"""
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return extract_cache.text(pdf_file, PDF_EXTRACTOR, lambda: extract_pdf_text(pdf_file, max_chars), max_chars)
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
-def extract_text_from_html(html_file):
-    """Extract text content from HTML file"""
+def extract_text_from_html(html_file, max_chars=None):
+    """Extract text content from HTML file, stopping once max_chars are read"""
     try:
-        from html.parser import HTMLParser
-
-        class HTMLTextExtractor(HTMLParser):
-            def __init__(self):
-                super().__init__()
-                self.text = []
-
-            def handle_data(self, data):
-                if data.strip():
-                    self.text.append(data.strip())
-
-        html_content = html_file.read().decode('utf-8')
-        parser = HTMLTextExtractor()
-        parser.feed(html_content)
-        return '\n'.join(parser.text)
+        return extract_cache.text(html_file, extractor_version(),
+                                  lambda: extract_html_text(html_file, max_chars), max_chars)
     except Exception as e:
         return f"Error reading HTML: {str(e)}"
 
+def request_text(max_chars=None):
+    """Return the uploaded file's text or the text field (None if neither)"""
+    if 'file' in request.files:
+        file = request.files['file']
+        if file.filename.endswith('.pdf'):
+            return extract_text_from_pdf(file, max_chars)
+        if file.filename.endswith(('.html', '.htm')):
+            return extract_text_from_html(file, max_chars)
+        return read_text_stream(file, max_chars)
+    return request.form.get('text')
+
 def get_style_colors(style):
     styles = {
         "modern": {
@@ -76,68 +88,64 @@ def get_style_colors(style):
     }
     return styles.get(style, styles["modern"])
 
-def create_infoframe(text, style):
-    """Create info-frame image and return as bytes"""
-    colors = get_style_colors(style)
-
-    width, height = 1200, 1600
-    img = Image.new('RGB', (width, height), color=colors["bg"])
-    draw = ImageDraw.Draw(img)
-
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32)
-    except:
-        title_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-
-    # Header
-    draw.rectangle([0, 0, width, 150], fill=colors["accent"])
-    draw.text(
-        (width // 2, 75),
-        "INFO FRAME",
-        fill=colors["bg"],
-        font=title_font,
-        anchor="mm"
-    )
-
-    # Accent line
-    draw.rectangle([50, 180, width - 50, 185], fill=colors["secondary"])
-
-    # Content
-    margin = 80
-    lines = text.split('\n')
-    wrapped_lines = []
-    for line in lines:
-        if line.strip():
-            wrapped = textwrap.wrap(line, width=40)
-            wrapped_lines.extend(wrapped)
+def create_infoframe(text, style, preset=DEFAULT_PRESET, output_format='png', lossless=False, effort=None,
+                     max_pages=1, sizes=None, sheet=False, template=DEFAULT_TEMPLATE):
+    """Create info-frame image; returns (BytesIO, EncodeResult)
+
+    PDF output holds up to max_pages pages; for image formats more than one
+    page, or a list of parse_sizes() sizes, comes back as a zip of images.
+    style="all" returns a zip with every style, or with sheet=True a single
+    contact sheet image. template names the layout template.
+    """
+    if style == ALL_STYLES:
+        img_io = io.BytesIO()
+        if sheet:
+            sheet_img = contact_sheet(text, STYLE_NAMES, get_style_colors, template=template)
+            result = encode(sheet_img, output_format, preset, img_io, lossless=lossless, effort=effort)
         else:
-            wrapped_lines.append('')
-
-    y_position = 240
-    line_height = 45
-
-    for line in wrapped_lines[:25]:
-        if y_position > height - 100:
-            break
-        draw.text(
-            (margin, y_position),
-            line,
-            fill=colors["text"],
-            font=body_font
-        )
-        y_position += line_height
+            styled = render_style_set(text, STYLE_NAMES, get_style_colors, template)
+            named = ((f'infoframe_{name}', img) for name, img in styled)
+            result = encode_zip(named, output_format, preset, img_io, lossless=lossless, effort=effort)
+        img_io.seek(0)
+        return img_io, result
+
+    colors = get_style_colors(style)
 
-    # Footer decoration
-    draw.rectangle([50, height - 50, width - 50, height - 45], fill=colors["secondary"])
+    if sizes:
+        img_io = io.BytesIO()
+        variants = render_variants(text, style, colors, sizes, template)
+        named = ((f'infoframe_{style}_{label}', img) for label, img in variants)
+        result = encode_zip(named, output_format, preset, img_io, lossless=lossless, effort=effort)
+        img_io.seek(0)
+        return img_io, result
+
+    if output_format == 'pdf':
+        img_io = io.BytesIO()
+        result = write_pdf(text, style, colors, img_io, max_pages, preset=preset, template=template)
+        img_io.seek(0)
+        return img_io, result
+
+    if max_pages > 1:
+        img_io = io.BytesIO()
+        pages = render_pages(text, style, colors, max_pages, template=template)
+        named = ((f'infoframe_{style}_p{number}', img) for number, img in enumerate(pages, 1))
+        result = encode_zip(named, output_format, preset, img_io, lossless=lossless, effort=effort)
+        img_io.seek(0)
+        return img_io, result
+
+    # Layout is style-independent; only the colorize step depends on style
+    mask = render_mask(text, template=template)
+    img = colorize(mask, style, colors)
 
     # Convert to bytes
     img_io = io.BytesIO()
-    img.save(img_io, 'PNG')
+    try:
+        result = encode(img, output_format, preset, img_io, lossless=lossless, effort=effort)
+    finally:
+        release_canvas(img)
     img_io.seek(0)
 
-    return img_io
+    return img_io, result
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -386,7 +394,7 @@ HTML_TEMPLATE = """
             <h3 style="color: #333; margin-bottom: 15px;">Your Info-Frame:</h3>
             <img id="previewImg" src="" alt="Preview">
             <br>
-            <a id="downloadBtn" class="download-btn" download="infoframe.png">
+            <a id="downloadBtn" class="download-btn" download="infoframe.png" onclick="downloadFull(event)">
                 ⬇️ Download PNG
             </a>
         </div>
@@ -395,6 +403,7 @@ HTML_TEMPLATE = """
     <script>
         let selectedStyle = 'modern';
         let currentTab = 'upload';
+        let lastForm = null;
 
         function switchTab(tab) {
             currentTab = tab;
@@ -486,9 +495,15 @@ HTML_TEMPLATE = """
                     formData.append('text', text);
                 }
 
-                const response = await fetch('/generate', {
+                // Show a preview drawn at display size; the full frame is
+                // only rendered when it is downloaded
+                lastForm = formData;
+                const previewForm = new FormData();
+                formData.forEach((value, key) => previewForm.append(key, value));
+                previewForm.append('width', '600');
+                const response = await fetch('/preview', {
                     method: 'POST',
-                    body: formData
+                    body: previewForm
                 });
 
                 if (!response.ok) {
@@ -497,10 +512,8 @@ HTML_TEMPLATE = """
                 }
 
                 const blob = await response.blob();
-                const url = URL.createObjectURL(blob);
-
-                document.getElementById('previewImg').src = url;
-                document.getElementById('downloadBtn').href = url;
+                document.getElementById('previewImg').src = URL.createObjectURL(blob);
+                document.getElementById('downloadBtn').removeAttribute('href');
 
                 loading.style.display = 'none';
                 preview.style.display = 'block';
@@ -512,6 +525,28 @@ HTML_TEMPLATE = """
             }
         }
 
+        async function downloadFull(event) {
+            const link = document.getElementById('downloadBtn');
+            if (link.getAttribute('href')) return;
+            event.preventDefault();
+            try {
+                const response = await fetch('/generate', {
+                    method: 'POST',
+                    body: lastForm
+                });
+                if (!response.ok) {
+                    const data = await response.json();
+                    throw new Error(data.error || 'Generation failed');
+                }
+                link.href = URL.createObjectURL(await response.blob());
+                link.click();
+            } catch (err) {
+                const error = document.getElementById('error');
+                error.textContent = err.message;
+                error.style.display = 'block';
+            }
+        }
+
         async function generateHTML() {
             const loading = document.getElementById('loading');
             const error = document.getElementById('error');
@@ -580,156 +615,156 @@ HTML_TEMPLATE = """
 def index():
     return render_template_string(HTML_TEMPLATE)
 
-def create_html(text, style):
-    """Create HTML version of info-frame"""
-    colors = get_style_colors(style)
-
-    # Convert RGB tuples to hex
-    bg_hex = '#{:02x}{:02x}{:02x}'.format(*colors["bg"])
-    accent_hex = '#{:02x}{:02x}{:02x}'.format(*colors["accent"])
-    text_hex = '#{:02x}{:02x}{:02x}'.format(*colors["text"])
-    secondary_hex = '#{:02x}{:02x}{:02x}'.format(*colors["secondary"])
-
-    # Process text
-    lines = text.split('\n')
-    content_html = ""
-    for line in lines:
-        if line.strip():
-            content_html += f"<p>{line}</p>\n"
-        else:
-            content_html += "<br>\n"
-
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Info Frame - {style.capitalize()}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Helvetica', Arial, sans-serif;
-            background: {bg_hex};
-            color: {text_hex};
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        .container {{
-            max-width: 1200px;
-            width: 100%;
-            background: {bg_hex};
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-        }}
-        .header {{
-            background: {accent_hex};
-            padding: 50px;
-            text-align: center;
-        }}
-        .header h1 {{
-            color: {bg_hex};
-            font-size: 3.5em;
-            font-weight: bold;
-            letter-spacing: 2px;
-        }}
-        .accent-line {{
-            height: 5px;
-            background: {secondary_hex};
-            margin: 30px 50px;
-        }}
-        .content {{
-            padding: 40px 80px;
-            font-size: 1.3em;
-            line-height: 1.8;
-        }}
-        .content p {{
-            margin-bottom: 15px;
-        }}
-        .footer-line {{
-            height: 5px;
-            background: {secondary_hex};
-            margin: 30px 50px 50px 50px;
-        }}
-        @media print {{
-            body {{
-                padding: 0;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>INFO FRAME</h1>
-        </div>
-        <div class="accent-line"></div>
-        <div class="content">
-{content_html}
-        </div>
-        <div class="footer-line"></div>
-    </div>
-</body>
-</html>"""
-    return html
-
 @app.route('/generate', methods=['POST'])
 def generate():
     try:
         style = request.form.get('style', 'modern')
-        output_format = request.form.get('format', 'png')
-
-        # Check if file or text was provided
-        if 'file' in request.files:
-            file = request.files['file']
-            if file.filename.endswith('.pdf'):
-                text = extract_text_from_pdf(file)
-            elif file.filename.endswith(('.html', '.htm')):
-                text = extract_text_from_html(file)
-            else:
-                text = file.read().decode('utf-8')
-        elif 'text' in request.form:
-            text = request.form.get('text')
+        output_format = normalize_format(request.form.get('format', 'png'))
+        if output_format not in ('html', 'pdf') and output_format not in IMAGE_FORMATS:
+            return jsonify({'error': f'Unknown format: {output_format}'}), 400
+        try:
+            preset, lossless, effort = options_from_form(request.form, output_format)
+            max_pages = max_pages_from_form(request.form, output_format)
+            sizes = parse_sizes(request.form['sizes']) if request.form.get('sizes') else None
+            template = user_plan(request.form.get('template') or DEFAULT_TEMPLATE).name
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if sizes and output_format in ('html', 'pdf'):
+            return jsonify({'error': 'sizes= needs an image format'}), 400
+        sheet = request.form.get('sheet', '').lower() in ('1', 'true', 'yes', 'on')
+        if style == ALL_STYLES and (output_format == 'html' or (output_format == 'pdf' and not sheet)):
+            return jsonify({'error': 'style=all needs an image format, or pdf with sheet=1'}), 400
+
+        scroll = style != ALL_STYLES and request.form.get('scroll', '').lower() in ('1', 'true', 'yes', 'on')
+        fitting = request.form.get('fit', '').lower() in ('1', 'true', 'yes', 'on')
+
+        # Check if file or text was provided; read only what the output shows
+        if output_format == 'html' or scroll:
+            budget_pages = None
+        elif sizes or style == ALL_STYLES:
+            budget_pages = 1
         else:
+            budget_pages = max_pages
+        text = request_text(page_budget(budget_pages, template, fitting))
+        if text is None:
             return jsonify({'error': 'No file or text provided'}), 400
 
         if not text or not text.strip():
             return jsonify({'error': 'No content to convert'}), 400
 
-        # Limit text length
-        if len(text) > 2000:
-            text = text[:2000] + "..."
-
-        # Generate HTML if requested
+        # Generate HTML if requested; the escaped body is streamed in chunks
         if output_format == 'html':
-            html_content = create_html(text, style)
-            html_io = io.BytesIO(html_content.encode('utf-8'))
-            html_io.seek(0)
-            return send_file(
-                html_io,
-                mimetype='text/html',
-                as_attachment=True,
-                download_name=f'infoframe_{style}.html'
+            chunks = iter_html(text, style, get_style_colors(style))
+            response = Response(stream_with_context(chunks), mimetype='text/html')
+            response.headers['Content-Disposition'] = f'attachment; filename=infoframe_{style}.html'
+            return response
+
+        # Auto-fit picks the body size; everything below renders through it
+        fit = None
+        if fitting:
+            fit = fit_template(text, template)
+            template = fit.template
+
+        if scroll:
+            # One tall image, sent as its strips are encoded
+            try:
+                chunks = iter_scroll(text, style, get_style_colors(style), output_format, preset, template=template)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            response = Response(stream_with_context(chunks), mimetype=MIMETYPES[output_format])
+            response.headers['Content-Disposition'] = (
+                f'inline; filename=infoframe_{style}.{extension_for(output_format)}'
             )
+            return response
 
-        # Generate image
-        img_io = create_infoframe(text, style)
+        # Generate image; long text flows onto further pages
+        if output_format != 'pdf' and max_pages > 1 and count_pages(text, template=template) < 2:
+            max_pages = 1
+        img_io, result = create_infoframe(text, style, preset, output_format, lossless, effort, max_pages, sizes,
+                                          sheet, template)
 
-        return send_file(
+        if style == ALL_STYLES:
+            zipped = not sheet
+        else:
+            zipped = bool(sizes) or (output_format != 'pdf' and max_pages > 1)
+        if zipped:
+            mimetype, extension = MIMETYPES['zip'], 'zip'
+        else:
+            mimetype, extension = MIMETYPES[output_format], extension_for(output_format)
+        response = send_file(
             img_io,
-            mimetype='image/png',
+            mimetype=mimetype,
             as_attachment=False,
-            download_name=f'infoframe_{style}.png'
+            download_name=f'infoframe_{style}.{extension}'
         )
+        response.headers['X-Encode-Time-Ms'] = f'{result.seconds * 1000:.1f}'
+        response.headers['X-Encoded-Bytes'] = str(result.size)
+        response.headers['X-Pages'] = str(result.pages)
+        if fit is not None:
+            response.headers['X-Fit-Size'] = str(fit.size)
+            response.headers['X-Fit-Layout-Passes'] = str(fit.probes)
+            response.headers['X-Fit-Measure-Calls'] = str(fit.measure_calls)
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/preview', methods=['POST'])
+def preview():
+    """First page drawn natively at preview size (draft=1 for 1-bit glyphs)"""
+    try:
+        style = request.form.get('style', 'modern')
+        output_format = normalize_format(request.form.get('format', 'png'))
+        if output_format not in IMAGE_FORMATS:
+            return jsonify({'error': 'Previews are png, jpg, webp or avif'}), 400
+        if style == ALL_STYLES:
+            return jsonify({'error': 'Previews need a single style'}), 400
+        try:
+            width = preview_width(request.form.get('width'))
+            template = user_plan(request.form.get('template') or DEFAULT_TEMPLATE).name
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        draft = request.form.get('draft', '').lower() in ('1', 'true', 'yes', 'on')
+        fitting = request.form.get('fit', '').lower() in ('1', 'true', 'yes', 'on')
+
+        # A preview is the first page, so a page's worth of text is enough
+        text = request_text(page_budget(1, template, fitting))
+        if text is None:
+            return jsonify({'error': 'No file or text provided'}), 400
+        if not text.strip():
+            return jsonify({'error': 'No content to convert'}), 400
+        if fitting:
+            template = fit_template(text, template).template
+
+        img_io = io.BytesIO()
+        result, render_seconds = encode_preview(text, style, get_style_colors(style), img_io, output_format, width,
+                                                template, draft)
+        img_io.seek(0)
+        response = send_file(img_io, mimetype=result.mimetype,
+                             download_name=f'preview_{style}.{extension_for(output_format)}')
+        response.headers['X-Render-Time-Ms'] = f'{render_seconds * 1000:.1f}'
+        response.headers['X-Encode-Time-Ms'] = f'{result.seconds * 1000:.1f}'
+        response.headers['X-Encoded-Bytes'] = str(result.size)
+        return response
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/stats')
+def stats():
+    return jsonify({
+        'fonts': font_stats(),
+        'chrome': chrome_stats(),
+        'masks': mask_stats(),
+        'layout': layout_stats(),
+        'templates': template_stats(),
+        'fit': fit_stats(),
+        'html': html_stats(),
+        'extract': extract_stats(),
+        'pool': pool_stats(),
+        'memory': memory_usage(),
+    })
+
 if __name__ == '__main__':
     print("\n" + "=" * 60)
     print("🎨 INFO-FRAME WEB APP")
@@ -738,4 +773,8 @@ if __name__ == '__main__':
     print("🌐 Open your browser and go to: http://localhost:5001")
     print("📱 Or from another device: http://YOUR_IP:5001")
     print("\n⌨️  Press Ctrl+C to stop the server\n")
+    tune_allocator()
+    warm_up_templates()
+    warm_up(get_style_colors, templates=template_names())
+    warm_up_html(get_style_colors, STYLE_NAMES)
     app.run(debug=True, host='0.0.0.0', port=5001)